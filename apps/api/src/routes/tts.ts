@@ -12,6 +12,8 @@ const TTS_SERVICE_URL = process.env.TTS_SERVICE_URL || 'http://localhost:8001';
 interface TTSRequestBody {
     text: string;
     language?: 'bcl' | 'fil' | 'eng';
+    format?: 'wav' | 'ogg' | 'mp3';
+    sample_rate?: number;
 }
 
 /**
@@ -20,7 +22,7 @@ interface TTSRequestBody {
  */
 ttsRouter.post('/', async (req: Request<object, object, TTSRequestBody>, res: Response) => {
     try {
-        const { text, language = 'bcl' } = req.body;
+        const { text, language = 'bcl', format, sample_rate } = req.body;
 
         if (!text || typeof text !== 'string') {
             res.status(400).json({ error: 'Text is required' });
@@ -34,15 +36,32 @@ ttsRouter.post('/', async (req: Request<object, object, TTSRequestBody>, res: Re
 
         console.log(`[TTS] Synthesizing: lang=${language}, text="${text.substring(0, 50)}..."`);
 
-        // Forward request to Python TTS service
+        // Forward request to Python TTS service (pass through ETag revalidation
+        // and Accept-based audio format negotiation)
+        const ifNoneMatch = req.get('If-None-Match');
+        const accept = req.get('Accept');
         const response = await fetch(`${TTS_SERVICE_URL}/tts`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                ...(ifNoneMatch ? { 'If-None-Match': ifNoneMatch } : {}),
+                ...(accept ? { Accept: accept } : {}),
             },
-            body: JSON.stringify({ text, language }),
+            body: JSON.stringify({ text, language, format, sample_rate }),
         });
 
+        const etag = response.headers.get('etag');
+        const cacheControl = response.headers.get('cache-control');
+        const cacheHeaders: Record<string, string> = {
+            ...(etag ? { ETag: etag } : {}),
+            ...(cacheControl ? { 'Cache-Control': cacheControl } : {}),
+        };
+
+        if (response.status === 304) {
+            res.set(cacheHeaders).status(304).end();
+            return;
+        }
+
         if (!response.ok) {
             const error = await response.text();
             console.error(`[TTS] Python service error: ${error}`);
@@ -57,10 +76,15 @@ ttsRouter.post('/', async (req: Request<object, object, TTSRequestBody>, res: Re
         const audioBuffer = await response.arrayBuffer();
 
         // Send audio response
+        const contentType = response.headers.get('content-type') || 'audio/wav';
+        const contentDisposition =
+            response.headers.get('content-disposition') || 'attachment; filename="speech.wav"';
         res.set({
-            'Content-Type': 'audio/wav',
+            'Content-Type': contentType,
             'Content-Length': audioBuffer.byteLength.toString(),
-            'Content-Disposition': 'attachment; filename="speech.wav"',
+            'Content-Disposition': contentDisposition,
+            Vary: 'Accept',
+            ...cacheHeaders,
         });
 
         res.send(Buffer.from(audioBuffer));
@@ -11,6 +11,8 @@ export async function POST(req: NextRequest) {
         const formData = await req.formData();
         const audioFile = formData.get('audio') as File | null;
         const language = (formData.get('language') as string) || 'bcl';
+        // 'pcm_s16le' for raw 16 kHz mono PCM (skips decoding on the AI service)
+        const encoding = formData.get('encoding') as string | null;
 
         if (!audioFile) {
             return NextResponse.json(
@@ -25,6 +27,9 @@ export async function POST(req: NextRequest) {
         const aiFormData = new FormData();
         aiFormData.append('audio', audioFile);
         aiFormData.append('language', language);
+        if (encoding) {
+            aiFormData.append('encoding', encoding);
+        }
 
         const response = await fetch(`${AI_SERVICE_URL}/stt`, {
             method: 'POST',
@@ -0,0 +1,108 @@
+"""
+STT Audio Decode Benchmark
+==========================
+
+Times turning an upload into 16 kHz mono float32 samples, per format and
+input rate:
+- legacy: write a temp file, librosa.load(path, sr=16000)
+- new:    audio_decoding.load_audio (in-memory soundfile decode + cached polyphase resampler)
+- raw 16 kHz PCM via the pcm_s16le fast path
+
+Test clips are a synthetic speech-band signal encoded with soundfile.
+
+Run with:
+    cd packages/ai
+    python benchmarks/bench_audio_decode.py --seconds 5 --repeat 20
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from audio_decoding import load_audio, warm_resampler  # noqa: E402
+from audio_encoding import resample  # noqa: E402
+
+# (label, soundfile format, subtype)
+FORMATS = [
+    ("wav", "WAV", "PCM_16"),
+    ("flac", "FLAC", "PCM_16"),
+    ("ogg/vorbis", "OGG", "VORBIS"),
+    ("ogg/opus", "OGG", "OPUS"),
+    ("mp3", "MP3", "MPEG_LAYER_III"),
+]
+
+RATES = (8000, 16000, 44100, 48000)
+
+
+def test_signal(seconds: float, rate: int) -> np.ndarray:
+    """A few harmonics with a syllable-rate envelope, roughly speech-like in spectrum."""
+    t = np.arange(int(seconds * rate)) / rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    tone = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((180, 360, 720, 1400, 2800)))
+    return (0.2 * envelope * tone).astype(np.float32)
+
+
+def legacy_load(data: bytes) -> np.ndarray:
+    import librosa
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as tmp:
+        tmp.write(data)
+        tmp.flush()
+        audio, _ = librosa.load(tmp.name, sr=16000)
+    return audio
+
+
+def timed_ms(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark STT upload decode + resample")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    warm_resampler()
+
+    print("=" * 60)
+    print(f"Decode + resample to 16 kHz, {args.seconds:g}s clips, avg of {args.repeat}")
+    print("=" * 60)
+    print(f"{'format':<12} {'rate':>6} {'size KB':>8} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}")
+
+    for label, sf_format, subtype in FORMATS:
+        for rate in RATES:
+            if subtype == "OPUS" and rate == 44100:
+                continue  # libopus has no 44.1 kHz mode
+            buffer = io.BytesIO()
+            sf.write(buffer, test_signal(args.seconds, rate), rate, format=sf_format, subtype=subtype)
+            data = buffer.getvalue()
+
+            legacy_ms = timed_ms(lambda: legacy_load(data), args.repeat)
+            new_ms = timed_ms(lambda: load_audio(data), args.repeat)
+            print(f"{label:<12} {rate:>6} {len(data) / 1024:>8.0f} {legacy_ms:>10.2f} {new_ms:>8.2f} {legacy_ms / new_ms:>7.1f}x")
+
+    pcm = (test_signal(args.seconds, 16000) * 32767).astype("<i2").tobytes()
+    pcm_ms = timed_ms(lambda: load_audio(pcm, encoding="pcm_s16le"), args.repeat)
+    print(f"{'raw pcm':<12} {16000:>6} {len(pcm) / 1024:>8.0f} {'-':>10} {pcm_ms:>8.2f}")
+
+    print()
+    print("Resampler only (float32 -> 16 kHz):")
+    for rate in (8000, 22050, 44100, 48000):
+        signal = test_signal(args.seconds, rate)
+        print(f"  {rate:>6} Hz  {timed_ms(lambda: resample(signal, rate, 16000), args.repeat):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+TTS Output Format Benchmark
+===========================
+
+Reports payload size and encode time for every /tts output format and a few
+output sample rates, against the legacy float32 WAV written by scipy.
+
+Run with:
+    cd packages/ai
+    python benchmarks/bench_audio_formats.py --language bcl
+    python benchmarks/bench_audio_formats.py --synthetic 5   # 5 s test tone, no model needed
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import scipy.io.wavfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from audio_encoding import AUDIO_FORMATS, OPUS_SAMPLE_RATES, encode_audio  # noqa: E402
+
+SAMPLE_TEXT = (
+    "Maray na aga! An Naga City General Hospital bukas beinte-kwatro oras. "
+    "Kun igwa kamo nin kalintura, uminom nin tubig asin magpahingalo."
+)
+
+
+def legacy_float32_wav(waveform: np.ndarray, sampling_rate: int) -> bytes:
+    """The pre-change encoding: float32 WAV via scipy, then a BytesIO read-out."""
+    buffer = io.BytesIO()
+    scipy.io.wavfile.write(buffer, rate=sampling_rate, data=waveform)
+    buffer.seek(0)
+    return buffer.read()
+
+
+def time_call(fn, repeat: int) -> tuple[float, int]:
+    """Best-of-N wall time in ms and the output size in bytes."""
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+        size = len(out)
+    return best * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TTS output formats")
+    parser.add_argument("--language", default="bcl")
+    parser.add_argument("--text", default=SAMPLE_TEXT)
+    parser.add_argument("--synthetic", type=float, default=0.0,
+                        help="Use an N-second synthetic waveform instead of running the model")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.synthetic > 0:
+        sampling_rate = 16000
+        t = np.arange(int(args.synthetic * sampling_rate)) / sampling_rate
+        waveform = (0.3 * np.sin(2 * np.pi * 220 * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))).astype(np.float32)
+    else:
+        import ai_service
+
+        waveform, sampling_rate = ai_service.synthesize_waveform(
+            ai_service.normalize_text(args.text, args.language), args.language
+        )
+
+    duration = len(waveform) / sampling_rate
+    print("=" * 60)
+    print(f"Audio: {duration:.2f}s @ {sampling_rate} Hz")
+    print("=" * 60)
+    print(f"{'format':<10}{'rate':>8}{'bytes':>12}{'vs legacy':>12}{'encode ms':>12}")
+
+    legacy_ms, legacy_size = time_call(lambda: legacy_float32_wav(waveform, sampling_rate), args.repeat)
+    print(f"{'f32 wav':<10}{sampling_rate:>8}{legacy_size:>12}{'1.00x':>12}{legacy_ms:>12.2f}")
+
+    for audio_format in AUDIO_FORMATS:
+        for rate in sorted({sampling_rate, 8000}, reverse=True):
+            if audio_format == "ogg" and rate not in OPUS_SAMPLE_RATES:
+                continue
+            ms, size = time_call(
+                lambda: encode_audio(waveform, sampling_rate, audio_format, rate), args.repeat
+            )
+            ratio = f"{legacy_size / size:.2f}x"
+            print(f"{audio_format:<10}{rate:>8}{size:>12}{ratio:>12}{ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
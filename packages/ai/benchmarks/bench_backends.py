@@ -0,0 +1,141 @@
+"""
+Inference Backend Benchmark
+===========================
+
+Times the same inputs on every inference backend (eager, torchscript, onnx)
+for each model family and reports latency and speedup vs eager:
+- tts:       VITS forward per sample text
+- stt:       CTC forward on 3 s of audio
+- translate: NLLB encoder forward, and the full generate() with that encoder
+
+Only backends whose graphs exist in MODEL_EXPORT_DIR are timed (export them
+with scripts/export_models.py first).
+
+Run with:
+    cd packages/ai
+    python benchmarks/bench_backends.py --families tts stt translate --language bcl --repeat 10
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import torch  # noqa: E402
+
+import ai_service  # noqa: E402
+from inference_backends import BACKENDS, GraphRunner, export_path  # noqa: E402
+
+TTS_SAMPLES = [
+    "Maray na aga!",
+    "Saen an pinakaharaning ospital?",
+    "Inumon an bulong tolong beses sa saro kaaldawan.",
+]
+
+TRANSLATION_SAMPLES = [
+    "Where is the nearest hospital?",
+    "Take this medicine three times a day.",
+]
+
+
+def timed_ms(fn, repeat: int) -> float:
+    """Average ms over `repeat` runs after one warm-up run."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def available_backends(name: str) -> list[str]:
+    return [b for b in BACKENDS if b == "eager" or os.path.exists(export_path(ai_service.MODEL_EXPORT_DIR, name, b))]
+
+
+def bench_tts(language: str, repeat: int) -> dict:
+    results = {}
+    for backend in available_backends(f"tts-{language}"):
+        runner, tokenizer = ai_service._load_tts_voice(language, backend)
+        inputs = [dict(tokenizer(text, return_tensors="pt")) for text in TTS_SAMPLES]
+        results[backend] = np.mean([timed_ms(lambda: runner(**x), repeat) for x in inputs])
+    return results
+
+
+def bench_stt(language: str, repeat: int) -> dict:
+    audio = (np.random.default_rng(0).standard_normal(16000 * 3) * 0.1).astype(np.float32)
+    results = {}
+    for backend in available_backends(f"stt-{language}"):
+        if backend == "eager":
+            runner, processor = ai_service._select_stt_adapter(ai_service._load_stt_weights(), language)
+        else:
+            runner, processor = ai_service._load_stt_graph(language, backend)
+        features = processor(audio, sampling_rate=16000, return_tensors="pt", return_attention_mask=True)
+        inputs = {"input_values": features["input_values"], "attention_mask": features["attention_mask"]}
+        results[backend] = timed_ms(lambda: runner(**inputs), repeat)
+    return results
+
+
+def bench_translate(repeat: int) -> tuple[dict, dict]:
+    from transformers.modeling_outputs import BaseModelOutput
+
+    model, tokenizer = ai_service._load_translation_weights()
+    tokenizer.src_lang = ai_service.NLLB_LANGUAGE_CODES["english"]
+    target = tokenizer.convert_tokens_to_ids(ai_service.NLLB_LANGUAGE_CODES["bikol"])
+    inputs = [dict(tokenizer(text, return_tensors="pt")) for text in TRANSLATION_SAMPLES]
+
+    encoder_ms, generate_ms = {}, {}
+    for backend in available_backends("translate-encoder"):
+        if backend == "eager":
+            encoder = GraphRunner.eager("translate", model)
+        else:
+            encoder = ai_service._load_translation_encoder(backend)
+
+        def generate(x: dict):
+            hidden_state, = encoder(**x)
+            with torch.no_grad():
+                return model.generate(
+                    **x, encoder_outputs=BaseModelOutput(last_hidden_state=hidden_state),
+                    forced_bos_token_id=target, max_length=128,
+                )
+
+        encoder_ms[backend] = np.mean([timed_ms(lambda: encoder(**x), repeat) for x in inputs])
+        generate_ms[backend] = np.mean([timed_ms(lambda: generate(x), repeat) for x in inputs])
+    return encoder_ms, generate_ms
+
+
+def report(label: str, results: dict) -> None:
+    eager_ms = results.get("eager")
+    for backend, ms in results.items():
+        speedup = f"{eager_ms / ms:.2f}x" if eager_ms else "-"
+        print(f"{label:<22} {backend:<12} {ms:9.1f} ms   {speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark eager vs TorchScript vs ONNX inference")
+    parser.add_argument("--families", nargs="+", default=["tts", "stt", "translate"], choices=["tts", "stt", "translate"])
+    parser.add_argument("--language", default="bcl", choices=list(ai_service.TTS_MODELS))
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 = torch default)")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    print("=" * 60)
+    print(f"Backends from {ai_service.MODEL_EXPORT_DIR}, {torch.get_num_threads()} torch thread(s), repeat {args.repeat}")
+    print("=" * 60)
+    if "tts" in args.families:
+        report(f"tts ({args.language})", bench_tts(args.language, args.repeat))
+    if "stt" in args.families:
+        report(f"stt ({args.language}, 3 s)", bench_stt(args.language, args.repeat))
+    if "translate" in args.families:
+        encoder_ms, generate_ms = bench_translate(args.repeat)
+        report("translate encoder", encoder_ms)
+        report("translate generate", generate_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Model Precision Report
+======================
+
+Loads each model family (TTS, STT, NLLB translation) in every precision mode
+(fp32, int8, bf16), runs the same fixed sample inputs, and reports size,
+latency and agreement with the fp32 output:
+- TTS: duration ratio and SNR of the waveform vs fp32 (VITS noise disabled)
+- STT: character error rate of the transcript vs fp32 (input audio is the fp32 TTS output)
+- Translation: exact match rate and character similarity vs fp32
+
+Use it to pick TTS_PRECISION / STT_PRECISION / TRANSLATE_PRECISION.
+
+Run with:
+    cd packages/ai
+    python benchmarks/bench_precision.py --families tts stt translate --output precision_report.md
+"""
+
+import os
+import sys
+import gc
+import time
+import difflib
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import torch  # noqa: E402
+
+import ai_service  # noqa: E402
+from model_precision import PRECISION_MODES, match_model_dtype  # noqa: E402
+from model_registry import estimate_model_bytes  # noqa: E402
+
+TTS_SAMPLES = [
+    "Maray na aga!",
+    "Saen an pinakaharaning ospital?",
+    "Inumon an bulong tolong beses sa saro kaaldawan.",
+]
+
+TRANSLATION_SAMPLES = [
+    ("english", "bikol", "Where is the nearest hospital?"),
+    ("english", "bikol", "Take this medicine three times a day."),
+    ("bikol", "english", "Maray na aga, kumusta ka?"),
+]
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Character-level Levenshtein distance."""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def snr_db(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Signal-to-noise ratio of candidate vs reference over their common length."""
+    n = min(len(reference), len(candidate))
+    if n == 0:
+        return float("nan")
+    noise = np.sum((reference[:n] - candidate[:n]) ** 2)
+    signal = np.sum(reference[:n] ** 2)
+    return float("inf") if noise == 0 else float(10 * np.log10(signal / noise))
+
+
+def timed(fn, repeat: int):
+    """Run fn once to warm up, then `repeat` times; return (last result, avg ms)."""
+    result = fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+# ============================================
+# Per-family runners: return (size bytes, avg ms per sample, outputs)
+# ============================================
+
+def run_tts(mode: str, language: str, repeat: int):
+    model, tokenizer = ai_service._load_tts_weights(language, precision=mode)
+    model.noise_scale = 0.0
+    model.noise_scale_duration = 0.0
+
+    def synthesize(text: str) -> np.ndarray:
+        inputs = tokenizer(text, return_tensors="pt")
+        with torch.no_grad():
+            return model(**inputs).waveform.squeeze().float().numpy()
+
+    outputs, total_ms = [], 0.0
+    for text in TTS_SAMPLES:
+        waveform, ms = timed(lambda: synthesize(text), repeat)
+        outputs.append(waveform)
+        total_ms += ms
+    return estimate_model_bytes(model), total_ms / len(TTS_SAMPLES), outputs, model.config.sampling_rate
+
+
+def run_stt(mode: str, language: str, audio: list[np.ndarray], repeat: int):
+    bundle = ai_service._load_stt_weights(precision=mode)
+    runner, processor = ai_service._select_stt_adapter(bundle, language)
+
+    def transcribe(samples: np.ndarray) -> str:
+        inputs = processor(samples, sampling_rate=16000, return_tensors="pt")
+        inputs = match_model_dtype(dict(inputs), runner)
+        logits, = runner(**inputs)
+        return processor.decode(torch.argmax(logits, dim=-1)[0])
+
+    outputs, total_ms = [], 0.0
+    for samples in audio:
+        text, ms = timed(lambda: transcribe(samples), repeat)
+        outputs.append(text)
+        total_ms += ms
+    return estimate_model_bytes(bundle.model), total_ms / len(audio), outputs
+
+
+def run_translate(mode: str, repeat: int):
+    model, tokenizer = ai_service._load_translation_weights(precision=mode)
+
+    def translate(source: str, target: str, text: str) -> str:
+        tokenizer.src_lang = ai_service.NLLB_LANGUAGE_CODES[source]
+        inputs = tokenizer(text, return_tensors="pt")
+        with torch.no_grad():
+            tokens = model.generate(
+                **inputs,
+                forced_bos_token_id=tokenizer.convert_tokens_to_ids(ai_service.NLLB_LANGUAGE_CODES[target]),
+                max_length=128,
+            )
+        return tokenizer.batch_decode(tokens, skip_special_tokens=True)[0]
+
+    outputs, total_ms = [], 0.0
+    for source, target, text in TRANSLATION_SAMPLES:
+        translation, ms = timed(lambda: translate(source, target, text), repeat)
+        outputs.append(translation)
+        total_ms += ms
+    return estimate_model_bytes(model), total_ms / len(TRANSLATION_SAMPLES), outputs
+
+
+# ============================================
+# Report
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fp32 / int8 / bf16 model precision")
+    parser.add_argument("--families", nargs="+", default=["tts", "stt", "translate"], choices=["tts", "stt", "translate"])
+    parser.add_argument("--modes", nargs="+", default=list(PRECISION_MODES), choices=list(PRECISION_MODES))
+    parser.add_argument("--language", default="bcl")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 = torch default)")
+    parser.add_argument("--output", help="Also write the report as markdown to this file")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    modes = ["fp32"] + [m for m in args.modes if m != "fp32"]
+
+    rows = []  # (family, mode, size MB, ms, quality description)
+
+    # The fp32 TTS audio is also the fixed STT input, so always produce it first
+    tts_reference = None
+    if "tts" in args.families or "stt" in args.families:
+        for mode in modes if "tts" in args.families else ["fp32"]:
+            size, ms, waveforms, sampling_rate = run_tts(mode, args.language, args.repeat)
+            gc.collect()
+            if tts_reference is None:
+                tts_reference = (waveforms, sampling_rate)
+                quality = "reference"
+            else:
+                ref = tts_reference[0]
+                ratio = np.mean([len(w) / len(r) for w, r in zip(waveforms, ref)])
+                snr = np.mean([snr_db(r, w) for r, w in zip(ref, waveforms)])
+                quality = f"duration x{ratio:.3f}, SNR {snr:.1f} dB"
+            if "tts" in args.families:
+                rows.append(("tts", mode, size, ms, quality))
+
+    if "stt" in args.families:
+        from audio_encoding import resample
+
+        waveforms, sampling_rate = tts_reference
+        audio = [resample(w, sampling_rate, 16000) for w in waveforms]
+        reference = None
+        for mode in modes:
+            size, ms, transcripts = run_stt(mode, args.language, audio, args.repeat)
+            gc.collect()
+            if reference is None:
+                reference = transcripts
+                quality = "reference: " + " | ".join(transcripts)
+            else:
+                errors = sum(edit_distance(r, t) for r, t in zip(reference, transcripts))
+                cer = errors / max(sum(len(r) for r in reference), 1)
+                quality = f"CER vs fp32 {cer:.3f}"
+            rows.append(("stt", mode, size, ms, quality))
+
+    if "translate" in args.families:
+        reference = None
+        for mode in modes:
+            size, ms, translations = run_translate(mode, args.repeat)
+            gc.collect()
+            if reference is None:
+                reference = translations
+                quality = "reference"
+            else:
+                exact = sum(r == t for r, t in zip(reference, translations)) / len(reference)
+                similarity = np.mean([difflib.SequenceMatcher(None, r, t).ratio() for r, t in zip(reference, translations)])
+                quality = f"exact {exact:.0%}, char similarity {similarity:.3f}"
+            rows.append(("translate", mode, size, ms, quality))
+
+    lines = [
+        f"# Model precision report (lang={args.language}, torch threads={torch.get_num_threads()})",
+        "",
+        "| family | mode | size MB | avg ms/sample | vs fp32 |",
+        "|---|---|---:|---:|---|",
+    ]
+    for family, mode, size, ms, quality in rows:
+        lines.append(f"| {family} | {mode} | {size / (1024 * 1024):.0f} | {ms:.1f} | {quality} |")
+
+    print("=" * 60)
+    print("\n".join(lines))
+    print("=" * 60)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Pre-fork Serving Benchmark
+==========================
+
+Sends concurrent /tts requests (unique texts, so the audio cache never hits)
+to a running AI service and reports throughput, plus the memory of the
+service's process tree: summed RSS (counts shared weight pages once per
+process) vs summed PSS (shared pages split between processes, i.e. real usage).
+
+Run the service with 1 and then N workers and compare:
+    AI_SERVICE_WORKERS=4 python src/ai_service.py &
+    python benchmarks/bench_prefork.py --url http://localhost:8001 --pid $! --requests 64 --concurrency 8
+"""
+
+import os
+import json
+import time
+import argparse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+TEXTS = [
+    "Maray na aga!",
+    "Saen an pinakaharaning ospital?",
+    "Inumon an bulong tolong beses sa saro kaaldawan.",
+    "Bukas an health center sa aga.",
+]
+
+
+def post_tts(url: str, text: str, language: str) -> float:
+    body = json.dumps({"text": text, "language": language}).encode()
+    request = urllib.request.Request(f"{url}/tts", data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=300) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def process_tree(pid: int) -> list[int]:
+    """pid plus all of its descendants (Linux /proc)."""
+    pids = [pid]
+    for child_pid in pids:
+        try:
+            with open(f"/proc/{child_pid}/task/{child_pid}/children") as f:
+                pids.extend(int(p) for p in f.read().split())
+        except FileNotFoundError:
+            pass
+    return pids
+
+
+def memory_kb(pid: int) -> tuple[int, int]:
+    """(RSS, PSS) in kB from /proc/<pid>/smaps_rollup."""
+    rss = pss = 0
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Rss:"):
+                rss = int(line.split()[1])
+            elif line.startswith("Pss:"):
+                pss = int(line.split()[1])
+    return rss, pss
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pre-fork multi-worker serving")
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--language", default="bcl")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pid", type=int, help="Service (parent) pid, to report process-tree memory")
+    args = parser.parse_args()
+
+    # Warm up every worker's first-request paths
+    post_tts(args.url, "warm up", args.language)
+
+    texts = [f"{TEXTS[i % len(TEXTS)]} {i}" for i in range(args.requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        latencies = sorted(executor.map(lambda t: post_tts(args.url, t, args.language), texts))
+    elapsed = time.perf_counter() - start
+
+    print("=" * 60)
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {os.cpu_count()} cores on this host")
+    print("=" * 60)
+    print(f"Throughput: {args.requests / elapsed:.2f} req/s")
+    print(f"Latency p50: {latencies[len(latencies) // 2] * 1000:.0f} ms, p95: {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms")
+
+    if args.pid:
+        pids = process_tree(args.pid)
+        totals = [memory_kb(pid) for pid in pids]
+        rss = sum(r for r, _ in totals) / 1024
+        pss = sum(p for _, p in totals) / 1024
+        print(f"Processes: {len(pids)}  summed RSS: {rss:.0f} MB  summed PSS: {pss:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
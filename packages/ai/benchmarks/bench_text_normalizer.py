@@ -0,0 +1,92 @@
+"""
+TTS Text Normalizer Benchmark
+=============================
+
+Compares the legacy convert_numbers_to_words() (regexes compiled per call,
+English only) with text_normalizer.normalize_text() and normalize_batch()
+on typical health-facility sentences.
+
+Run with:
+    cd packages/ai
+    python benchmarks/bench_text_normalizer.py --language bcl --iterations 20000
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from text_normalizer import digits_to_words, normalize_batch, normalize_text, number_to_words  # noqa: E402
+
+SAMPLE_TEXTS = [
+    "Bukas an health center 8:00 AM sagkod 5:00 PM.",
+    "Tawagan an hotline (054) 472-3000 o 0917-123-4567.",
+    "Inumon an 500mg na paracetamol tolong beses sa saro kaaldawan.",
+    "An konsulta ₱350.00 sana.",
+    "Bakuna sa 2024-12-25, 120 na aki an nakarehistro.",
+    "Maray na aga!",
+]
+
+
+def legacy_convert_numbers_to_words(text: str) -> str:
+    """The previous ai_service implementation, kept here as the baseline."""
+    def is_phone_number(s: str) -> bool:
+        return bool(re.search(r'[-()]', s)) or (s.isdigit() and len(s) >= 7)
+
+    def replace_number(match):
+        num_str = match.group(0)
+        if is_phone_number(num_str):
+            return digits_to_words(''.join(c for c in num_str if c.isdigit()), "eng")
+        try:
+            return number_to_words(int(num_str), "eng")
+        except ValueError:
+            return num_str
+
+    result = re.sub(r'\(?\d{2,4}\)?[\s-]?\d{2,4}[\s-]?\d{2,4}', replace_number, text)
+    return re.sub(r'\b\d+\b', replace_number, result)
+
+
+def time_per_text(fn, texts: list[str], iterations: int) -> float:
+    """Average microseconds per text."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(texts[i % len(texts)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TTS text normalization")
+    parser.add_argument("--language", default="bcl")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Warm up the per-language tables
+    normalize_text("1", args.language)
+
+    legacy_us = time_per_text(legacy_convert_numbers_to_words, SAMPLE_TEXTS, args.iterations)
+    single_us = time_per_text(lambda t: normalize_text(t, args.language), SAMPLE_TEXTS, args.iterations)
+
+    rounds = max(args.iterations // len(SAMPLE_TEXTS), 1)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        normalize_batch(SAMPLE_TEXTS, args.language)
+    batch_us = (time.perf_counter() - start) / (rounds * len(SAMPLE_TEXTS)) * 1e6
+
+    print("=" * 60)
+    print(f"Text normalization ({args.iterations} texts, lang={args.language})")
+    print("=" * 60)
+    print(f"legacy convert_numbers_to_words: {legacy_us:8.2f} us/text  (English only)")
+    print(f"normalize_text:                  {single_us:8.2f} us/text  ({legacy_us / single_us:.2f}x)")
+    print(f"normalize_batch:                 {batch_us:8.2f} us/text  ({legacy_us / batch_us:.2f}x)")
+    print()
+    for text in SAMPLE_TEXTS[:3]:
+        print(f"  {text}")
+        print(f"    legacy: {legacy_convert_numbers_to_words(text)}")
+        print(f"    new:    {normalize_text(text, args.language)}")
+
+
+if __name__ == "__main__":
+    main()
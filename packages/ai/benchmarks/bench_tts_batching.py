@@ -0,0 +1,93 @@
+"""
+TTS Micro-Batching Benchmark
+============================
+
+Compares throughput of the per-request path (one VITS forward per request)
+against the TTSBatcher path for N concurrent short requests.
+
+Run with:
+    cd packages/ai
+    python benchmarks/bench_tts_batching.py --language bcl --requests 32 --window-ms 10 --batch-size 8
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import ai_service  # noqa: E402
+from tts_batcher import TTSBatcher  # noqa: E402
+
+SAMPLE_TEXTS = [
+    "Maray na aga!",
+    "Saen an pinakaharaning ospital?",
+    "Kumusta ka?",
+    "Mabalos po.",
+    "Igwa ako nin kalintura.",
+    "Inumon an bulong tolong beses sa saro kaaldawan.",
+    "Bukas an health center sa aga.",
+    "Tawagan an hotline kun emergency.",
+]
+
+
+async def run_per_request(texts: list[str], language: str) -> float:
+    """Each request runs its own batch-of-one forward pass on the default executor."""
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        loop.run_in_executor(None, ai_service.synthesize_waveform, text, language)
+        for text in texts
+    ))
+    return time.perf_counter() - start
+
+
+async def run_batched(texts: list[str], language: str, window_ms: float, batch_size: int, batch_tokens: int) -> tuple[float, dict]:
+    """All requests go through a fresh TTSBatcher."""
+    batcher = TTSBatcher(
+        run_batch=ai_service.synthesize_waveforms,
+        window_ms=window_ms,
+        max_batch_size=batch_size,
+        max_batch_tokens=batch_tokens,
+    )
+    start = time.perf_counter()
+    await asyncio.gather(*(batcher.submit(text, language) for text in texts))
+    return time.perf_counter() - start, batcher.snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TTS micro-batching")
+    parser.add_argument("--language", default="bcl", choices=list(ai_service.TTS_MODELS.keys()))
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--window-ms", type=float, default=10.0)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--batch-tokens", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(args.requests)]
+
+    # Load and warm up the model so neither path pays for it
+    ai_service.load_tts_model(args.language)
+    ai_service.synthesize_waveform(texts[0], args.language)
+
+    print("=" * 60)
+    print(f"TTS batching benchmark: lang={args.language}, requests={args.requests}")
+    print("=" * 60)
+
+    for run in range(1, args.repeat + 1):
+        per_request = asyncio.run(run_per_request(texts, args.language))
+        batched, stats = asyncio.run(run_batched(
+            texts, args.language, args.window_ms, args.batch_size, args.batch_tokens
+        ))
+        print(f"\n[RUN {run}]")
+        print(f"  per-request: {per_request:.3f}s  ({args.requests / per_request:.1f} req/s)")
+        print(f"  batched:     {batched:.3f}s  ({args.requests / batched:.1f} req/s), "
+              f"{stats['batches']} batches, avg size {stats['avg_batch_size']}")
+        print(f"  speedup:     {per_request / batched:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
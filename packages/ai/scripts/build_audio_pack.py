@@ -0,0 +1,102 @@
+"""
+Build the Pre-rendered TTS Audio Pack
+=====================================
+
+Synthesizes every phrase in data/knowledge-base/bikol-phrases/*.json and
+every facility name/address through the normal TTS pipeline (normalize ->
+VITS -> encode), and writes an indexed audio pack (see src/audio_pack.py).
+Clips already present in the previous pack (same key) are reused, so a
+rebuild after adding phrases only synthesizes the new ones.
+
+Run with:
+    cd packages/ai
+    # Server pack (what /tts serves: 16-bit WAV at the model rate)
+    python scripts/build_audio_pack.py
+
+    # Mobile export: Opus at 16 kHz, bundled as a Flutter asset
+    python scripts/build_audio_pack.py --format ogg --sample-rate 16000 \\
+        --output ../../apps/mobile/assets/tts-pack/tts_pack
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import ai_service  # noqa: E402
+from audio_encoding import AUDIO_FORMATS, media_type  # noqa: E402
+from audio_pack import AudioPack, AudioPackWriter, collect_pack_phrases  # noqa: E402
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+DEFAULT_KNOWLEDGE_BASE = os.path.join(REPO_ROOT, "data", "knowledge-base")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render TTS audio for the phrase corpus and facility names")
+    parser.add_argument("--knowledge-base", default=DEFAULT_KNOWLEDGE_BASE)
+    parser.add_argument("--output", default=ai_service.TTS_AUDIO_PACK, help="Pack base path (writes <path>.bin and <path>.index.json)")
+    parser.add_argument("--format", default="wav", choices=list(AUDIO_FORMATS))
+    parser.add_argument("--sample-rate", type=int, default=None)
+    parser.add_argument("--languages", nargs="+", default=list(ai_service.TTS_MODELS), choices=list(ai_service.TTS_MODELS))
+    parser.add_argument("--full", action="store_true", help="Re-synthesize everything instead of reusing clips from the existing pack")
+    parser.add_argument("--limit", type=int, default=0, help="Only render the first N phrases (for trying it out)")
+    args = parser.parse_args()
+
+    phrases = collect_pack_phrases(args.knowledge_base, tuple(args.languages))
+    if args.limit:
+        phrases = phrases[:args.limit]
+
+    previous = None if args.full else AudioPack.open_if_exists(args.output)
+    writer = AudioPackWriter(
+        args.output,
+        audio_format=args.format,
+        media_type=media_type(args.format),
+        sample_rate=args.sample_rate,
+        metadata={
+            "models": {lang: ai_service.TTS_MODELS[lang] for lang in args.languages},
+            "revision": ai_service.TTS_MODEL_REVISION,
+            # Keys include it too: a pack built with another backend/precision never matches
+            "engine": ai_service.TTS_ENGINE,
+        },
+    )
+
+    print("=" * 60)
+    print(f"Building audio pack: {len(phrases)} phrases, format={args.format}, rate={args.sample_rate or 'native'}, engine={ai_service.TTS_ENGINE}")
+    print("=" * 60)
+
+    reused = synthesized = failed = 0
+    start = time.perf_counter()
+    try:
+        for i, (text, language) in enumerate(phrases, 1):
+            key = ai_service.tts_cache_key(text, language, args.format, args.sample_rate)
+            if key in writer:
+                continue
+            audio = previous.get(key) if previous is not None else None
+            if audio is not None:
+                reused += 1
+            else:
+                try:
+                    audio = ai_service.text_to_speech(text, language, args.format, args.sample_rate)
+                    synthesized += 1
+                except Exception as e:
+                    print(f"  skipped ({language}) {text!r}: {e}")
+                    failed += 1
+                    continue
+            writer.add(key, text, language, bytes(audio))
+            if i % 50 == 0:
+                print(f"  {i}/{len(phrases)}")
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+
+    total_bytes = sum(entry["length"] for entry in writer.entries)
+    print(f"Clips: {len(writer.entries)} (synthesized {synthesized}, reused {reused}, failed {failed})")
+    print(f"Size: {total_bytes / (1024 * 1024):.1f} MB in {time.perf_counter() - start:.1f}s")
+    print(f"Wrote {writer.blob_path} and {writer.index_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Export Models for the TorchScript / ONNX Backends
+=================================================
+
+Exports the graphs the non-eager backends load (see src/inference_backends.py)
+and checks each one against the eager transformers model before it is used:
+- tts:       one VITS graph per voice        -> tts-<lang>.pt / .onnx
+- stt:       one MMS graph per language adapter -> stt-<lang>.pt / .onnx
+- translate: the NLLB encoder                -> translate-encoder.pt / .onnx
+
+Parity is the max absolute difference of the graph outputs vs eager on
+inputs of other lengths than the export example (so dynamic shapes are
+exercised too). VITS samples noise, so TTS parity is checked on a
+noise-free export; the served graph keeps the model's noise settings.
+Graphs are exported from the fp32 weights.
+
+Run with:
+    cd packages/ai
+    python scripts/export_models.py --families tts stt translate --backends torchscript onnx
+
+Then serve with e.g. TTS_BACKEND=onnx STT_BACKEND=torchscript python src/ai_service.py
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import ai_service  # noqa: E402
+from inference_backends import EXPORT_SUFFIXES, GraphRunner, export_graph, export_path, max_abs_diff  # noqa: E402
+
+TTS_SAMPLES = ["Maray na aga!", "Inumon an bulong tolong beses sa saro kaaldawan, pagkatapos magkakan."]
+TRANSLATION_SAMPLES = ["Hello", "Take this medicine three times a day after eating."]
+STT_SAMPLE_SECONDS = (1.0, 4.5)
+
+
+def check_parity(family: str, eager: GraphRunner, exported: GraphRunner, samples: list[dict]) -> float:
+    """Worst max-abs-diff of the first output over all samples."""
+    worst = 0.0
+    for inputs in samples:
+        worst = max(worst, max_abs_diff(eager(**inputs)[0], exported(**inputs)[0]))
+    return worst
+
+
+def export_family(family: str, name: str, model, example: dict, samples: list[dict],
+                  backends: list[str], output_dir: str, deterministic=None) -> list[tuple]:
+    """Export one model to every backend; returns (name, backend, path, size MB, max diff) rows."""
+    rows = []
+    eager = GraphRunner.eager(family, model)
+    for backend in backends:
+        path = export_path(output_dir, name, backend)
+        export_graph(family, model, example, backend, path)
+
+        if deterministic is None:
+            diff = check_parity(family, eager, GraphRunner.load(family, path, backend), samples)
+        else:
+            # Parity on a noise-free twin export, compared against the noise-free eager model
+            with deterministic(), tempfile.TemporaryDirectory() as tmp:
+                check_path = export_graph(family, model, example, backend, export_path(tmp, name, backend))
+                diff = check_parity(family, eager, GraphRunner.load(family, check_path, backend), samples)
+
+        rows.append((name, backend, path, os.path.getsize(path) / (1024 * 1024), diff))
+    return rows
+
+
+def export_tts(language: str, backends: list[str], output_dir: str) -> list[tuple]:
+    model, tokenizer = ai_service._load_tts_weights(language, precision="fp32")
+
+    @contextmanager
+    def noise_free():
+        saved = (model.noise_scale, model.noise_scale_duration)
+        model.noise_scale = model.noise_scale_duration = 0.0
+        try:
+            yield
+        finally:
+            model.noise_scale, model.noise_scale_duration = saved
+
+    example = dict(tokenizer("Saen an pinakaharaning ospital?", return_tensors="pt"))
+    samples = [dict(tokenizer(text, return_tensors="pt")) for text in TTS_SAMPLES]
+    samples.append(dict(tokenizer(TTS_SAMPLES, return_tensors="pt", padding=True)))
+    return export_family("tts", f"tts-{language}", model, example, samples, backends, output_dir, noise_free)
+
+
+def export_stt(bundle, language: str, backends: list[str], output_dir: str) -> list[tuple]:
+    _, processor = ai_service._select_stt_adapter(bundle, language)
+    rng = np.random.default_rng(0)
+
+    def features(seconds: float) -> dict:
+        audio = (rng.standard_normal(int(16000 * seconds)) * 0.1).astype(np.float32)
+        inputs = processor(audio, sampling_rate=16000, return_tensors="pt", return_attention_mask=True)
+        return {"input_values": inputs["input_values"], "attention_mask": inputs["attention_mask"]}
+
+    samples = [features(seconds) for seconds in STT_SAMPLE_SECONDS]
+    return export_family("stt", f"stt-{language}", bundle.model, features(2.0), samples, backends, output_dir)
+
+
+def export_translate(backends: list[str], output_dir: str) -> list[tuple]:
+    model, tokenizer = ai_service._load_translation_weights(precision="fp32")
+    tokenizer.src_lang = ai_service.NLLB_LANGUAGE_CODES["english"]
+    example = dict(tokenizer("Where is the nearest hospital?", return_tensors="pt"))
+    samples = [dict(tokenizer(text, return_tensors="pt")) for text in TRANSLATION_SAMPLES]
+    return export_family("translate", "translate-encoder", model, example, samples, backends, output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export TorchScript/ONNX graphs and check parity with eager")
+    parser.add_argument("--families", nargs="+", default=["tts", "stt", "translate"], choices=["tts", "stt", "translate"])
+    parser.add_argument("--languages", nargs="+", default=list(ai_service.TTS_MODELS), choices=list(ai_service.TTS_MODELS))
+    parser.add_argument("--backends", nargs="+", default=list(EXPORT_SUFFIXES), choices=list(EXPORT_SUFFIXES))
+    parser.add_argument("--output-dir", default=ai_service.MODEL_EXPORT_DIR)
+    parser.add_argument("--tolerance", type=float, default=1e-3, help="Max abs diff vs eager to accept")
+    args = parser.parse_args()
+
+    rows = []
+    if "tts" in args.families:
+        for language in args.languages:
+            rows += export_tts(language, args.backends, args.output_dir)
+    if "stt" in args.families:
+        bundle = ai_service._load_stt_weights(precision="fp32")
+        for language in args.languages:
+            rows += export_stt(bundle, language, args.backends, args.output_dir)
+    if "translate" in args.families:
+        rows += export_translate(args.backends, args.output_dir)
+
+    print("=" * 60)
+    print(f"Exported graphs in {args.output_dir} (tolerance {args.tolerance:g})")
+    print("=" * 60)
+    failed = 0
+    for name, backend, path, size_mb, diff in rows:
+        status = "ok" if diff <= args.tolerance else "MISMATCH"
+        failed += status != "ok"
+        print(f"{name:<20} {backend:<12} {size_mb:8.1f} MB   max diff {diff:.2e}  {status}")
+
+    if failed:
+        print(f"{failed} graph(s) differ from eager beyond tolerance; don't serve them")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
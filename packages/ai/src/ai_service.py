@@ -15,25 +15,91 @@ Run with:
 
 API:
     POST /tts - Convert text to speech
+    POST /tts/stream - Convert text to speech, streamed sentence by sentence
     POST /stt - Convert speech to text
+    WS /stt/stream - Streaming speech to text (partial and final transcripts)
+    POST /stt/batch - Transcribe many clips, results streamed per clip (NDJSON)
+    POST /translate - Translate text between Bikol, Tagalog, and English
+    POST /speak - Translate, normalize and synthesize in one call (streamed WAV)
+    POST /translate/batch - Translate many strings in one call (results in input order)
     GET /health - Health check
+    GET /health/liveness - Liveness: the process is up
+    GET /health/readiness - Readiness: startup models loaded and warmed up (503 until then)
+    GET /metrics - Prometheus metrics (stage latency histograms, cache hit ratios, RSS)
+    POST /admin/profile/sample - Sample all stacks for N seconds (collapsed stacks, PROFILING_API_KEY)
+    GET /admin/profiles/{id} - Report of a request sent with X-Profile (PROFILING_API_KEY)
 """
 
-import io
 import os
+import re
+import hmac
+import json
+import time
+import asyncio
 import logging
-import tempfile
-from typing import Optional, Literal
-from contextlib import asynccontextmanager
+from functools import partial
+from urllib.parse import quote
+from typing import Annotated, AsyncIterator, Optional, Literal
+from contextlib import asynccontextmanager, contextmanager
 
 import torch
-import scipy.io.wavfile
 import numpy as np
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Header, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Header, Depends, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel, Field
 
+from tts_cache import TTSAudioCache
+from translation_memory import SEEDED_ENGINE, TranslationMemory, collect_translation_pairs
+from translation_tiers import PhraseTable, TierStats
+from google_translate import CircuitBreaker, CircuitOpenError, GoogleTranslateClient
+from translation_batching import (
+    encode_batch,
+    join_segments,
+    length_sorted_batches,
+    max_new_tokens_for,
+    split_for_translation,
+    token_ids,
+)
+from audio_pack import AudioPack
+from audio_decoding import STT_SAMPLE_RATE, load_audio, pcm16_to_float, warm_resampler
+from stt_segmentation import detect_speech, pack_segments, windowed_ctc
+from stt_streaming import StreamingTranscriber
+from stt_batching import batch_ctc_ids, ctc_frame_lengths, plan_buckets
+from tts_batcher import TTSBatcher
+from inference_pool import InferencePool, PoolFullError
+from stt_adapters import ResidentAdapters
+from stt_scheduler import LanguageAffineScheduler
+from model_registry import ModelRegistry
+from model_warmup import ModelWarmup, WarmupTask
+from request_profiling import ProfileStore, ProfilingMiddleware, SamplerBusyError, StackSampler, current_profile, profiled_call
+from service_metrics import (
+    METRICS_REGISTRY,
+    CallbackCollector,
+    MetricsMiddleware,
+    cache_families,
+    current_language,
+    metric_language,
+    observe_model_load,
+    observe_stage,
+    stage_timer,
+    stats_families,
+)
+from model_precision import apply_precision, match_model_dtype, model_dtype, precision_from_env, resolve_precision
+from inference_backends import GraphRunner, backend_from_env, export_path
+from text_normalizer import normalize_text
+from audio_encoding import (
+    DEFAULT_FORMAT,
+    encode_audio,
+    file_extension,
+    media_type,
+    negotiate_format,
+    pcm16_bytes,
+    resolve_sample_rate,
+    wav_header,
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -53,6 +119,26 @@ def require_ai_key(x_ai_key: Optional[str] = Header(default=None, alias="X-AI-KE
     if not x_ai_key or x_ai_key != AI_SERVICE_API_KEY:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
+
+# Profiling (X-Profile requests and /admin/profile*) is enabled only when this is set;
+# callers send it as X-Profile-Key. Kept apart from AI_SERVICE_API_KEY, which every client has.
+PROFILING_API_KEY = os.environ.get("PROFILING_API_KEY", "")
+
+# Request profiles kept for GET /admin/profiles/{id}
+PROFILING_KEEP = int(os.environ.get("PROFILING_KEEP", "16"))
+
+# Stack sampler: default interval and longest run allowed
+PROFILING_SAMPLE_INTERVAL_MS = float(os.environ.get("PROFILING_SAMPLE_INTERVAL_MS", "5"))
+PROFILING_SAMPLE_MAX_S = float(os.environ.get("PROFILING_SAMPLE_MAX_S", "60"))
+
+
+def require_profiling_key(x_profile_key: Optional[str] = Header(default=None, alias="X-Profile-Key")):
+    """Profiling guard: 404 while profiling is disabled, 401 without the right key."""
+    if not PROFILING_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_profile_key or not hmac.compare_digest(x_profile_key, PROFILING_API_KEY):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
 # ============================================
 # TTS Configuration
 # ============================================
@@ -63,6 +149,38 @@ TTS_MODELS = {
     "eng": "facebook/mms-tts-eng",  # English
 }
 
+# Output rate of every MMS-TTS checkpoint; requested rates are resolved against it
+# before synthesis (and before the cache key), since only downsampling is done
+TTS_SAMPLING_RATE = 16000
+
+# Hub revision of the TTS checkpoints; part of the audio cache key so a model
+# upgrade never serves audio produced by the previous weights.
+TTS_MODEL_REVISION = os.environ.get("TTS_MODEL_REVISION", "main")
+
+# Cache-Control sent with /tts audio so the Node proxy and mobile app can revalidate with ETags
+TTS_CACHE_CONTROL = os.environ.get("TTS_CACHE_CONTROL", "public, max-age=86400")
+
+# Pre-rendered audio pack for the phrase corpus and facility names
+# (build with scripts/build_audio_pack.py); exact matches skip the model.
+TTS_AUDIO_PACK = os.environ.get(
+    "TTS_AUDIO_PACK",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "audio-pack", "tts_pack"),
+)
+
+# Micro-batching of concurrent /tts requests per language.
+# TTS_BATCH_WINDOW_MS=0 disables batching (one forward pass per request).
+TTS_BATCH_WINDOW_MS = float(os.environ.get("TTS_BATCH_WINDOW_MS", "10"))
+TTS_BATCH_MAX_SIZE = int(os.environ.get("TTS_BATCH_MAX_SIZE", "8"))
+TTS_BATCH_MAX_TOKENS = int(os.environ.get("TTS_BATCH_MAX_TOKENS", "2000"))
+
+# Streaming TTS: sentences longer than this are split further on commas/spaces
+# so a single chunk never grows the VITS forward pass unboundedly.
+TTS_STREAM_MAX_CHUNK_CHARS = int(os.environ.get("TTS_STREAM_MAX_CHUNK_CHARS", "200"))
+
+# /speak returns the translation in an X-Translated-Text header (URL-encoded) unless
+# it is longer than this; Node's HTTP client rejects responses with over 16 KB of headers.
+SPEAK_TEXT_HEADER_MAX_BYTES = 4096
+
 # ============================================
 # STT Configuration
 # ============================================
@@ -75,6 +193,42 @@ STT_LANGUAGE_CODES = {
     "eng": "eng",  # English
 }
 
+# All language adapters stay resident and are switched by reference; queued
+# requests are dispatched in same-language runs so switches stay rare.
+# A run ends after STT_AFFINITY_MAX_STREAK requests, or earlier once another
+# language's oldest request has waited STT_AFFINITY_MAX_WAIT_MS.
+STT_AFFINITY_MAX_STREAK = int(os.environ.get("STT_AFFINITY_MAX_STREAK", "8"))
+STT_AFFINITY_MAX_WAIT_MS = float(os.environ.get("STT_AFFINITY_MAX_WAIT_MS", "2000"))
+
+# Long audio: an energy VAD drops silence (STT_VAD=0 disables), then speech runs
+# through MMS in STT_WINDOW_S windows overlapping by STT_WINDOW_OVERLAP_S, with
+# STT_WINDOW_BATCH windows per forward pass. Peak memory is bounded by the window.
+STT_VAD = os.environ.get("STT_VAD", "1") == "1"
+STT_WINDOW_S = float(os.environ.get("STT_WINDOW_S", "20"))
+STT_WINDOW_OVERLAP_S = float(os.environ.get("STT_WINDOW_OVERLAP_S", "2"))
+STT_WINDOW_BATCH = int(os.environ.get("STT_WINDOW_BATCH", "1"))
+
+# Silence left between packed speech segments (keeps words apart for CTC)
+STT_SEGMENT_GAP_S = 0.2
+# Shorter (speech) audio than this is returned as an empty transcript
+STT_MIN_AUDIO_S = 0.1
+
+# Streaming STT (WS /stt/stream): a partial transcript every STT_STREAM_PARTIAL_MS of
+# new speech, a final one after STT_STREAM_ENDPOINT_MS of silence. Audio older than
+# STT_STREAM_COMMIT_S is committed so passes stay short (context: STT_WINDOW_OVERLAP_S).
+STT_STREAM_PARTIAL_MS = float(os.environ.get("STT_STREAM_PARTIAL_MS", "500"))
+STT_STREAM_ENDPOINT_MS = float(os.environ.get("STT_STREAM_ENDPOINT_MS", "600"))
+STT_STREAM_COMMIT_S = float(os.environ.get("STT_STREAM_COMMIT_S", "4"))
+STT_STREAM_MAX_SESSIONS = int(os.environ.get("STT_STREAM_MAX_SESSIONS", "8"))
+
+# Batch STT (POST /stt/batch): clips are grouped per language into length-sorted buckets
+# of at most STT_BATCH_MAX_SIZE clips / STT_BATCH_MAX_SECONDS of padded audio, with the
+# longest clip at most STT_BATCH_MAX_PAD_RATIO x the shortest; one forward pass per bucket.
+STT_BATCH_MAX_SIZE = int(os.environ.get("STT_BATCH_MAX_SIZE", "8"))
+STT_BATCH_MAX_SECONDS = float(os.environ.get("STT_BATCH_MAX_SECONDS", "120"))
+STT_BATCH_MAX_PAD_RATIO = float(os.environ.get("STT_BATCH_MAX_PAD_RATIO", "1.5"))
+STT_BATCH_MAX_CLIPS = int(os.environ.get("STT_BATCH_MAX_CLIPS", "64"))
+
 # ============================================
 # Translation Configuration (NLLB-200)
 # ============================================
@@ -91,6 +245,13 @@ NLLB_LANGUAGE_CODES = {
     "bcl": "bcl_Latn",
 }
 
+# NLLB input is split into sentences (over-long ones at clauses/words, never truncated)
+# and generated in length-sorted batches of TRANSLATE_BATCH_SIZE sentences /
+# TRANSLATE_BATCH_MAX_TOKENS padded tokens, with max_new_tokens sized per batch.
+TRANSLATE_MAX_SEGMENT_CHARS = int(os.environ.get("TRANSLATE_MAX_SEGMENT_CHARS", "400"))
+TRANSLATE_BATCH_SIZE = int(os.environ.get("TRANSLATE_BATCH_SIZE", "16"))
+TRANSLATE_BATCH_MAX_TOKENS = int(os.environ.get("TRANSLATE_BATCH_MAX_TOKENS", "4096"))
+
 # ============================================
 # Google Translate Configuration (for Tagalog)
 # ============================================
@@ -109,298 +270,891 @@ GOOGLE_LANGUAGE_CODES = {
 # Languages that use Google Translate (better quality)
 USE_GOOGLE_TRANSLATE = {"tagalog", "fil"}
 
+GOOGLE_TRANSLATE_URL = os.environ.get("GOOGLE_TRANSLATE_URL", "https://translation.googleapis.com/language/translate/v2")
+# Google calls run on the event loop over up to GOOGLE_TRANSLATE_POOL_SIZE keep-alive
+# connections, each with a GOOGLE_TRANSLATE_TIMEOUT_S deadline. Concurrent calls for the
+# same language pair within GOOGLE_TRANSLATE_BATCH_WINDOW_MS are coalesced and packed
+# into as few requests as possible (repeated q, up to GOOGLE_TRANSLATE_MAX_SEGMENTS
+# strings / GOOGLE_TRANSLATE_MAX_CHARS characters each).
+GOOGLE_TRANSLATE_MAX_SEGMENTS = int(os.environ.get("GOOGLE_TRANSLATE_MAX_SEGMENTS", "128"))
+GOOGLE_TRANSLATE_MAX_CHARS = int(os.environ.get("GOOGLE_TRANSLATE_MAX_CHARS", "5000"))
+GOOGLE_TRANSLATE_POOL_SIZE = int(os.environ.get("GOOGLE_TRANSLATE_POOL_SIZE", "4"))
+GOOGLE_TRANSLATE_TIMEOUT_S = float(os.environ.get("GOOGLE_TRANSLATE_TIMEOUT_S", "10"))
+GOOGLE_TRANSLATE_BATCH_WINDOW_MS = float(os.environ.get("GOOGLE_TRANSLATE_BATCH_WINDOW_MS", "5"))
+
+# After GOOGLE_TRANSLATE_BREAKER_FAILURES consecutive failed requests, Google-routed
+# text goes straight to NLLB for GOOGLE_TRANSLATE_BREAKER_RESET_S before Google is probed again.
+GOOGLE_TRANSLATE_BREAKER_FAILURES = int(os.environ.get("GOOGLE_TRANSLATE_BREAKER_FAILURES", "5"))
+GOOGLE_TRANSLATE_BREAKER_RESET_S = float(os.environ.get("GOOGLE_TRANSLATE_BREAKER_RESET_S", "30"))
+
+# Most strings accepted by one /translate/batch request
+TRANSLATE_BATCH_MAX_TEXTS = int(os.environ.get("TRANSLATE_BATCH_MAX_TEXTS", "256"))
+
+# Language names accepted by /translate -> the bcl/fil/eng codes translations are stored under
+TRANSLATION_LANGUAGE_ALIASES = {"bikol": "bcl", "tagalog": "fil", "english": "eng"}
+
+# Translation memory (memory LRU + SQLite) seeded at startup with the knowledge base's
+# curated phrase translations; set TRANSLATION_MEMORY_SEED=0 to skip.
+TRANSLATION_MEMORY_SEED = os.environ.get("TRANSLATION_MEMORY_SEED", "1") == "1"
+KNOWLEDGE_BASE_DIR = os.environ.get(
+    "KNOWLEDGE_BASE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data", "knowledge-base"),
+)
+
+# Phrase tier between the translation memory and the models: text fully covered by the
+# Bikol phrase tables (BikolTranslator's mappings + the curated corpus) using at most
+# TRANSLATION_PHRASE_MAX_PIECES entries is answered without a model call.
+# Set TRANSLATION_PHRASE_TIER=0 to disable.
+TRANSLATION_PHRASE_TIER = os.environ.get("TRANSLATION_PHRASE_TIER", "1") == "1"
+BIKOL_MAPPINGS_PATH = os.environ.get(
+    "BIKOL_MAPPINGS_PATH", os.path.join(KNOWLEDGE_BASE_DIR, "bikol-phrases", "translation_mappings.json")
+)
+BIKOL_CORPUS_PATH = os.environ.get(
+    "BIKOL_CORPUS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data", "output", "bikol", "bikol_corpus.json"),
+)
+TRANSLATION_PHRASE_MIN_COVERAGE = float(os.environ.get("TRANSLATION_PHRASE_MIN_COVERAGE", "1.0"))
+TRANSLATION_PHRASE_MAX_PIECES = int(os.environ.get("TRANSLATION_PHRASE_MAX_PIECES", "1"))
+
+# ============================================
+# Inference Pool Configuration
+# ============================================
+
+# Each model family runs on its own bounded executor so a slow STT call can't
+# stall TTS, translation or /health. Requests beyond workers + queue get a 503.
+# STT and translation default to one worker. STT workers share one model and only
+# run concurrently within a language; translation workers share one NLLB model.
+TTS_WORKERS = int(os.environ.get("TTS_WORKERS", "2"))
+TTS_MAX_QUEUE = int(os.environ.get("TTS_MAX_QUEUE", "16"))
+STT_WORKERS = int(os.environ.get("STT_WORKERS", "1"))
+STT_MAX_QUEUE = int(os.environ.get("STT_MAX_QUEUE", "4"))
+TRANSLATE_WORKERS = int(os.environ.get("TRANSLATE_WORKERS", "1"))
+TRANSLATE_MAX_QUEUE = int(os.environ.get("TRANSLATE_MAX_QUEUE", "16"))
+
+# ============================================
+# Model Precision Configuration
+# ============================================
+
+# Load-time precision per model family: fp32 (default), int8 (dynamic quantization
+# of Linear layers, CPU only) or bf16. Compare modes with benchmarks/bench_precision.py.
+TTS_PRECISION = precision_from_env("TTS_PRECISION")
+STT_PRECISION = precision_from_env("STT_PRECISION")
+TRANSLATE_PRECISION = precision_from_env("TRANSLATE_PRECISION")
+
+# ============================================
+# Inference Backend Configuration
+# ============================================
+
+# Per model family: eager (transformers PyTorch), torchscript or onnx.
+# Non-eager backends load graphs written by scripts/export_models.py from MODEL_EXPORT_DIR
+# (for translation only the NLLB encoder is exported; decoding stays eager).
+TTS_BACKEND = backend_from_env("TTS_BACKEND")
+STT_BACKEND = backend_from_env("STT_BACKEND")
+TRANSLATE_BACKEND = backend_from_env("TRANSLATE_BACKEND")
+MODEL_EXPORT_DIR = os.environ.get(
+    "MODEL_EXPORT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "exported"),
+)
+# ONNX Runtime intra-op threads per session (0 = ONNX Runtime default)
+ONNX_THREADS = int(os.environ.get("ONNX_THREADS", "0"))
+
+# What TTS audio is produced with, part of the audio cache key (and the audio pack's keys) so
+# switching backend or precision never serves audio from the previous configuration: the
+# backend, plus for eager models the precision this device applies (int8 is CPU-only)
+TTS_ENGINE = TTS_BACKEND if TTS_BACKEND != "eager" else (
+    f"eager-{resolve_precision(TTS_PRECISION, 'cuda' if torch.cuda.is_available() else 'cpu')}"
+)
+
 # ============================================
 # Global caches
 # ============================================
 
 DEFAULT_LANGUAGE = "bcl"
 
-# TTS caches
-tts_models_cache: dict = {}
-tts_tokenizers_cache: dict = {}
+# All loaded models (TTS voices, MMS-1B, NLLB) live in one memory-budgeted registry,
+# keyed by model id. Set MODEL_MEMORY_BUDGET_MB / MODEL_IDLE_TIMEOUT_S to enable eviction.
+model_registry = ModelRegistry.from_env(on_load=observe_model_load)
+
+# Synthesized audio cache (memory LRU + on-disk tier)
+tts_audio_cache = TTSAudioCache.from_env()
+
+# Translations already produced, by (text, languages, engine); survives restarts
+translation_memory = TranslationMemory.from_env()
+
+# Google Translate over pooled keep-alive connections, with deadlines, coalescing and a circuit breaker
+google_translate = GoogleTranslateClient(
+    api_key=GOOGLE_TRANSLATE_API_KEY,
+    url=GOOGLE_TRANSLATE_URL,
+    timeout_s=GOOGLE_TRANSLATE_TIMEOUT_S,
+    max_connections=GOOGLE_TRANSLATE_POOL_SIZE,
+    window_ms=GOOGLE_TRANSLATE_BATCH_WINDOW_MS,
+    max_segments=GOOGLE_TRANSLATE_MAX_SEGMENTS,
+    max_chars=GOOGLE_TRANSLATE_MAX_CHARS,
+    breaker=CircuitBreaker(GOOGLE_TRANSLATE_BREAKER_FAILURES, GOOGLE_TRANSLATE_BREAKER_RESET_S),
+)
+
+# Bikol phrase tables (loaded at startup; None until then or when disabled)
+phrase_table: Optional[PhraseTable] = None
+
+# Texts answered and time spent per translation tier (memory, phrase, google, nllb)
+translation_tier_stats = TierStats()
 
-# STT cache (single model with adapters)
-stt_model = None
-stt_processor = None
-stt_current_lang = None
+# Memory-mapped pre-rendered clips (None if no pack has been built)
+tts_audio_pack = AudioPack.open_if_exists(TTS_AUDIO_PACK)
 
-# Translation cache (NLLB)
-translation_model = None
-translation_tokenizer = None
+# Per-family inference executors with admission control
+# (time waiting for a worker is the queue_wait stage in /metrics; calls of X-Profile requests are profiled)
+pool_hooks = {"on_wait": partial(observe_stage, "queue_wait"), "call_wrapper": profiled_call if PROFILING_API_KEY else None}
+tts_pool = InferencePool("tts", max_workers=TTS_WORKERS, max_queue=TTS_MAX_QUEUE, **pool_hooks)
+stt_pool = InferencePool("stt", max_workers=STT_WORKERS, max_queue=STT_MAX_QUEUE, **pool_hooks)
+stt_scheduler = LanguageAffineScheduler(
+    pool=stt_pool, max_streak=STT_AFFINITY_MAX_STREAK, max_wait_ms=STT_AFFINITY_MAX_WAIT_MS,
+    on_wait=partial(observe_stage, "schedule_wait"),
+)
+translate_pool = InferencePool("translate", max_workers=TRANSLATE_WORKERS, max_queue=TRANSLATE_MAX_QUEUE, **pool_hooks)
+
+# Request profiles and the stack sampler (used only with PROFILING_API_KEY)
+request_profiles = ProfileStore(keep=PROFILING_KEEP)
+stack_sampler = StackSampler(interval_ms=PROFILING_SAMPLE_INTERVAL_MS)
+
+# Open /stt/stream sessions (bounded by STT_STREAM_MAX_SESSIONS instead of the STT queue)
+stt_stream_stats = {"active": 0, "opened": 0, "rejected": 0, "partials": 0, "finals": 0}
+
+# /stt/batch forward passes and how much of each padded batch was real audio
+stt_batch_stats = {"requests": 0, "clips": 0, "passes": 0, "clip_samples": 0, "padded_samples": 0}
+
+# /speak requests and total time per pipeline stage (synthesis only for cache misses)
+speak_stats = {"requests": 0, "cache_hits": 0, "translate_ms": 0.0, "normalize_ms": 0.0, "synthesize_ms": 0.0, "first_audio_ms": 0.0}
+
+# Precision actually applied per loaded model id (a mode can fall back to fp32)
+applied_precision: dict[str, str] = {}
 
 
 # ============================================
 # TTS Functions
 # ============================================
 
+def _load_tts_weights(language: str, precision: str = TTS_PRECISION):
+    """Load TTS model and tokenizer from the hub (called by the model registry)."""
+    model_name = TTS_MODELS[language]
+    logger.info(f"Loading TTS model: {model_name}")
+    
+    from transformers import VitsModel, AutoTokenizer
+    
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=TTS_MODEL_REVISION)
+    model = VitsModel.from_pretrained(model_name, revision=TTS_MODEL_REVISION)
+    
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model, applied_precision[model_name] = apply_precision(model.to(device), precision, device)
+    
+    logger.info(f"TTS model loaded on {device} ({applied_precision[model_name]})")
+    return model, tokenizer
+
+
+def _load_tts_voice(language: str, backend: str = TTS_BACKEND):
+    """Load (GraphRunner, tokenizer) for a voice on the configured backend (called by the model registry)."""
+    if backend == "eager":
+        model, tokenizer = _load_tts_weights(language)
+        return GraphRunner.eager("tts", model), tokenizer
+    
+    from transformers import AutoConfig, AutoTokenizer
+    
+    model_name = TTS_MODELS[language]
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=TTS_MODEL_REVISION)
+    config = AutoConfig.from_pretrained(model_name, revision=TTS_MODEL_REVISION)
+    runner = GraphRunner.load(
+        "tts", export_path(MODEL_EXPORT_DIR, f"tts-{language}", backend), backend, config=config, threads=ONNX_THREADS
+    )
+    logger.info(f"TTS graph loaded: {model_name} ({backend})")
+    return runner, tokenizer
+
+
 def load_tts_model(language: str):
-    """Load TTS model and tokenizer for the specified language."""
+    """Load TTS runner and tokenizer for the specified language."""
     if language not in TTS_MODELS:
         raise ValueError(f"Unsupported TTS language: {language}")
     
-    model_name = TTS_MODELS[language]
+    return model_registry.get(TTS_MODELS[language], lambda: _load_tts_voice(language))
+
+
+@contextmanager
+def tts_model_in_use(language: str):
+    """Hold the TTS runner and tokenizer for a language while running inference."""
+    if language not in TTS_MODELS:
+        raise ValueError(f"Unsupported TTS language: {language}")
     
-    if language not in tts_models_cache:
-        logger.info(f"Loading TTS model: {model_name}")
-        
-        from transformers import VitsModel, AutoTokenizer
-        
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = VitsModel.from_pretrained(model_name)
-        
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        model = model.to(device)
-        
-        tts_tokenizers_cache[language] = tokenizer
-        tts_models_cache[language] = model
-        
-        logger.info(f"TTS model loaded on {device}")
-    
-    return tts_models_cache[language], tts_tokenizers_cache[language]
-
-
-# ============================================
-# Number to Words (for TTS)
-# ============================================
-
-# Number words in different languages
-NUMBER_WORDS = {
-    "eng": {
-        0: "zero", 1: "one", 2: "two", 3: "three", 4: "four",
-        5: "five", 6: "six", 7: "seven", 8: "eight", 9: "nine",
-        10: "ten", 11: "eleven", 12: "twelve", 13: "thirteen", 14: "fourteen",
-        15: "fifteen", 16: "sixteen", 17: "seventeen", 18: "eighteen", 19: "nineteen",
-        20: "twenty", 30: "thirty", 40: "forty", 50: "fifty", 60: "sixty",
-        70: "seventy", 80: "eighty", 90: "ninety",
-        100: "hundred", 1000: "thousand", 1000000: "million",
-    },
-    "fil": {
-        0: "zero", 1: "isa", 2: "dalawa", 3: "tatlo", 4: "apat",
-        5: "lima", 6: "anim", 7: "pito", 8: "walo", 9: "siyam",
-        10: "sampu", 11: "labing-isa", 12: "labindalawa", 13: "labintatlo", 14: "labing-apat",
-        15: "labinlima", 16: "labing-anim", 17: "labimpito", 18: "labing-walo", 19: "labinsiyam",
-        20: "dalawampu", 30: "tatlumpu", 40: "apatnapu", 50: "limampu", 60: "animnapu",
-        70: "pitumpu", 80: "walumpu", 90: "siyamnapu",
-        100: "daan", 1000: "libo", 1000000: "milyon",
-    },
-    "bcl": {
-        0: "zero", 1: "saro", 2: "duwa", 3: "tulo", 4: "apat",
-        5: "lima", 6: "anom", 7: "pito", 8: "walo", 9: "siyam",
-        10: "sampulo", 11: "kagsaro", 12: "kagduwa", 13: "kagtulo", 14: "kag-apat",
-        15: "kaglima", 16: "kag-anom", 17: "kagpito", 18: "kagwalo", 19: "kagsiyam",
-        20: "duwampulo", 30: "tulompulo", 40: "apatnapulo", 50: "limampulo", 60: "anompulo",
-        70: "pitompulo", 80: "walompulo", 90: "siyamnapulo",
-        100: "gatos", 1000: "ribo", 1000000: "milyon",
-    },
-}
+    with model_registry.use(TTS_MODELS[language], lambda: _load_tts_voice(language)) as loaded:
+        yield loaded
 
 
-def number_to_words(num: int, lang: str = "eng") -> str:
-    """Convert a number to words in the specified language."""
-    words = NUMBER_WORDS.get(lang, NUMBER_WORDS["eng"])
-    
-    if num < 0:
-        return f"negative {number_to_words(-num, lang)}"
-    
-    if num in words:
-        return words[num]
-    
-    if num < 100:
-        tens = (num // 10) * 10
-        ones = num % 10
-        if ones == 0:
-            return words[tens]
-        return f"{words[tens]} {words[ones]}"
-    
-    if num < 1000:
-        hundreds = num // 100
-        remainder = num % 100
-        result = f"{words[hundreds]} {words[100]}"
-        if remainder > 0:
-            result += f" {number_to_words(remainder, lang)}"
-        return result
-    
-    if num < 1000000:
-        thousands = num // 1000
-        remainder = num % 1000
-        result = f"{number_to_words(thousands, lang)} {words[1000]}"
-        if remainder > 0:
-            result += f" {number_to_words(remainder, lang)}"
-        return result
-    
-    if num < 1000000000:
-        millions = num // 1000000
-        remainder = num % 1000000
-        result = f"{number_to_words(millions, lang)} {words[1000000]}"
-        if remainder > 0:
-            result += f" {number_to_words(remainder, lang)}"
-        return result
-    
-    # For very large numbers, just return digits
-    return str(num)
-
-
-def digits_to_words(num_str: str) -> str:
-    """Convert each digit in a string to English words (for phone numbers)."""
-    digit_words = {
-        '0': 'zero', '1': 'one', '2': 'two', '3': 'three', '4': 'four',
-        '5': 'five', '6': 'six', '7': 'seven', '8': 'eight', '9': 'nine',
-    }
-    return ' '.join(digit_words.get(d, d) for d in num_str if d.isdigit())
+def synthesize_waveform(text: str, language: str = DEFAULT_LANGUAGE) -> tuple[np.ndarray, int]:
+    """Run VITS on already-normalized text and return (float32 waveform, sampling rate)."""
+    with tts_model_in_use(language) as (runner, tokenizer):
+        with stage_timer("tokenize", language):
+            inputs = tokenizer(text, return_tensors="pt").to(runner.device)
+        
+        with stage_timer("forward", language):
+            output, _ = runner(**inputs)
+        
+        waveform = output.squeeze().float().cpu().numpy()
+        return waveform, runner.config.sampling_rate
+
+
+def synthesize_waveforms(language: str, texts: list[str]) -> list[tuple[np.ndarray, int]]:
+    """
+    Run VITS on a batch of already-normalized texts in one padded forward pass.
+    Returns one (float32 waveform, sampling rate) per text, trimmed to its own length.
+    """
+    with tts_model_in_use(language) as (runner, tokenizer):
+        with stage_timer("tokenize", language):
+            inputs = tokenizer(texts, return_tensors="pt", padding=True).to(runner.device)
+        
+        with stage_timer("forward", language):
+            output, sequence_lengths = runner(**inputs)
+        
+        waveforms = output.float().cpu().numpy()
+        lengths = sequence_lengths.cpu().tolist()
+        sampling_rate = runner.config.sampling_rate
+    
+    return [(waveforms[i, :lengths[i]], sampling_rate) for i in range(len(texts))]
+
+
+def normalize_tts_text(text: str, language: str) -> str:
+    """Spell out numbers, dates, times, pesos and units in the voice's language (the normalize stage)."""
+    if language not in TTS_MODELS:
+        raise ValueError(f"Unsupported TTS language: {language}")
+    with stage_timer("normalize", language):
+        return normalize_text(text, language)
+
+
+def text_to_speech(
+    text: str,
+    language: str = DEFAULT_LANGUAGE,
+    audio_format: str = DEFAULT_FORMAT,
+    sample_rate: Optional[int] = None,
+    normalized: bool = False,
+) -> memoryview:
+    """Convert text to speech audio (16-bit WAV, OGG/Opus or MP3)."""
+    # normalized: the caller already ran normalize_tts_text
+    spoken_text = text if normalized else normalize_tts_text(text, language)
+    logger.info(f"TTS text (normalized): '{spoken_text[:80]}...'")
+    
+    waveform, sampling_rate = synthesize_waveform(spoken_text, language)
+    
+    return encode_waveform(waveform, sampling_rate, audio_format, sample_rate, language)
+
+
+def encode_waveform(
+    waveform: np.ndarray,
+    sampling_rate: int,
+    audio_format: str = DEFAULT_FORMAT,
+    sample_rate: Optional[int] = None,
+    language: Optional[str] = None,
+) -> memoryview:
+    """encode_audio, timed as the encode stage."""
+    with stage_timer("encode", language):
+        return encode_audio(waveform, sampling_rate, audio_format, sample_rate)
+
+
+# Scheduler that merges concurrent /tts requests of the same language into one forward pass
+tts_batcher = TTSBatcher(
+    run_batch=synthesize_waveforms,
+    window_ms=TTS_BATCH_WINDOW_MS,
+    max_batch_size=TTS_BATCH_MAX_SIZE,
+    max_batch_tokens=TTS_BATCH_MAX_TOKENS,
+    pool=tts_pool,
+)
 
 
-def convert_numbers_to_words(text: str, lang: str = "eng") -> str:
-    """Convert all numbers in text to English words for TTS."""
-    import re
+async def text_to_speech_batched(
+    text: str,
+    language: str = DEFAULT_LANGUAGE,
+    audio_format: str = DEFAULT_FORMAT,
+    sample_rate: Optional[int] = None,
+    normalized: bool = False,
+) -> memoryview:
+    """Like text_to_speech(), but shares a forward pass with concurrent requests."""
+    # A profiled request runs on its own, so its forward pass is in its profile
+    if TTS_BATCH_WINDOW_MS <= 0 or current_profile.get() is not None:
+        return await tts_pool.run(text_to_speech, text, language, audio_format, sample_rate, normalized)
     
-    def is_phone_number(s: str) -> bool:
-        """Check if string looks like a phone number."""
-        # Phone numbers have dashes, parentheses, or are 7+ digits
-        return bool(re.search(r'[-()]', s)) or (s.isdigit() and len(s) >= 7)
+    spoken_text = text if normalized else normalize_tts_text(text, language)
+    waveform, sampling_rate = await tts_batcher.submit(spoken_text, language)
+    
+    return await tts_pool.run(encode_waveform, waveform, sampling_rate, audio_format, sample_rate, language)
+
+
+def tts_output_rate(audio_format: str, sample_rate: Optional[int]) -> int:
+    """The rate a TTS request is encoded at; raises ValueError for an unsupported one."""
+    return resolve_sample_rate(TTS_SAMPLING_RATE, sample_rate, audio_format)
+
+
+def tts_cache_key(
+    text: str,
+    language: str,
+    audio_format: str = DEFAULT_FORMAT,
+    sample_rate: Optional[int] = None,
+    normalized: bool = False,
+) -> str:
+    """Audio cache key for a TTS request (normalized text + language + model id + revision + engine + encoding)."""
+    if language not in TTS_MODELS:
+        raise ValueError(f"Unsupported TTS language: {language}")
+    # Keyed on the resolved rate: None, 16000 and 48000 are the same (native) audio
+    rate = tts_output_rate(audio_format, sample_rate)
+    spoken_text = text if normalized else normalize_text(text, language)
+    variant = f"{audio_format}@{'native' if rate == TTS_SAMPLING_RATE else rate}/{TTS_ENGINE}"
+    return TTSAudioCache.make_key(spoken_text, language, TTS_MODELS[language], TTS_MODEL_REVISION, variant)
+
+
+async def cached_tts_audio(key: str) -> Optional[bytes]:
+    """Audio pack or audio cache hit for key, else None. The cache's disk tier is read in a thread."""
+    if tts_audio_pack is not None:
+        packed = tts_audio_pack.get(key)
+        if packed is not None:
+            logger.info(f"TTS audio pack hit: {key[:12]}")
+            return packed
+    
+    audio_bytes = tts_audio_cache.get(key, memory_only=True)
+    if audio_bytes is None and tts_audio_cache.disk_dir:
+        audio_bytes = await asyncio.to_thread(tts_audio_cache.get, key)
+    if audio_bytes is not None:
+        logger.info(f"TTS cache hit: {key[:12]}")
+    return audio_bytes
+
+
+async def cached_text_to_speech(
+    text: str,
+    language: str = DEFAULT_LANGUAGE,
+    audio_format: str = DEFAULT_FORMAT,
+    sample_rate: Optional[int] = None,
+    normalized: bool = False,
+    key: Optional[str] = None,
+) -> tuple[bytes, str]:
+    """
+    Return (encoded audio, cache key): audio pack, then cache, then synthesis (batched).
+    A caller that already normalized the text (normalized=True) and computed its key
+    passes both, so a miss doesn't normalize again.
+    """
+    key = key or tts_cache_key(text, language, audio_format, sample_rate, normalized)
+    audio_bytes = await cached_tts_audio(key)
+    if audio_bytes is None:
+        with tts_pool.admission():
+            audio_bytes = await text_to_speech_batched(text, language, audio_format, sample_rate, normalized)
+        await asyncio.to_thread(tts_audio_cache.put, key, audio_bytes)
+    return audio_bytes, key
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (possibly a list or weak validators) against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip().removeprefix("W/") for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+# ============================================
+# Streaming TTS (sentence-chunked)
+# ============================================
+
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?;:])\s+|\n+')
+CLAUSE_BOUNDARY_PATTERN = re.compile(r'(?<=[,])\s+')
+
+
+def _split_long_chunk(chunk: str, max_chars: int) -> list[str]:
+    """Split an over-long sentence on commas, then on whitespace, to at most max_chars each."""
+    if len(chunk) <= max_chars:
+        return [chunk]
+    
+    pieces: list[str] = []
+    current = ""
+    for part in CLAUSE_BOUNDARY_PATTERN.split(chunk):
+        for word in part.split(" ") if len(part) > max_chars else [part]:
+            candidate = f"{current} {word}" if current else word
+            if len(candidate) <= max_chars or not current:
+                current = candidate
+            else:
+                pieces.append(current)
+                current = word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_sentences(text: str, max_chars: int = TTS_STREAM_MAX_CHUNK_CHARS) -> list[str]:
+    """Split text into sentence-sized chunks suitable for incremental synthesis."""
+    chunks: list[str] = []
+    for sentence in SENTENCE_BOUNDARY_PATTERN.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        chunks.extend(_split_long_chunk(sentence, max_chars))
+    return chunks
+
+
+async def started_stream(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Run stream up to its first chunk now and return the whole stream. Errors before the
+    first chunk (a full pool, a model that won't load) are raised here, where the handler
+    can still answer with a status code instead of a truncated 200.
+    """
+    first = await stream.__anext__()
+    
+    async def resumed() -> AsyncIterator[bytes]:
+        try:
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+    
+    return resumed()
+
+
+async def text_to_speech_stream(text: str, language: str = DEFAULT_LANGUAGE) -> AsyncIterator[bytes]:
+    """
+    Convert text to a 16-bit PCM WAV stream, one sentence at a time.
+    Yields the WAV header first, then the PCM samples of each sentence
+    as soon as it has been synthesized on the TTS pool.
+    """
+    with stage_timer("normalize", language):
+        sentences = split_sentences(normalize_text(text, language))
+    logger.info(f"TTS stream: {len(sentences)} chunk(s), lang={language}")
     
-    def replace_number(match):
-        num_str = match.group(0)
+    # The whole stream holds one admission slot, so concurrent streams are shed too
+    with tts_pool.admission():
+        runner, _ = await tts_pool.run(load_tts_model, language)
+        yield wav_header(runner.config.sampling_rate)
         
-        # For phone numbers, read each digit individually
-        if is_phone_number(num_str):
-            # Remove non-digits and read digit by digit
-            digits_only = ''.join(c for c in num_str if c.isdigit())
-            return digits_to_words(digits_only)
+        for sentence in sentences:
+            waveform, _ = await tts_pool.run(synthesize_waveform, sentence, language)
+            yield pcm16_bytes(waveform)
+
+
+# ============================================
+# Speak Pipeline (translate -> normalize -> synthesize)
+# ============================================
+
+def server_timing(stages: dict[str, float]) -> str:
+    """Server-Timing header value for stage durations in seconds."""
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages.items())
+
+
+def speak_snapshot() -> dict:
+    """Mean milliseconds per /speak stage (synthesize and first_audio over cache misses only)."""
+    requests = speak_stats["requests"]
+    synthesized = requests - speak_stats["cache_hits"]
+    return {
+        "requests": requests,
+        "cache_hits": speak_stats["cache_hits"],
+        "mean_ms": {
+            "translate": round(speak_stats["translate_ms"] / requests, 1) if requests else None,
+            "normalize": round(speak_stats["normalize_ms"] / requests, 1) if requests else None,
+            "synthesize": round(speak_stats["synthesize_ms"] / synthesized, 1) if synthesized else None,
+            "first_audio": round(speak_stats["first_audio_ms"] / synthesized, 1) if synthesized else None,
+        },
+    }
+
+
+def store_speech(cache_key: str, waveforms: list[np.ndarray], sampling_rate: int, language: str) -> None:
+    """Encode a finished /speak stream as WAV and store it under cache_key (on the TTS pool: CPU and disk work)."""
+    tts_audio_cache.put(cache_key, encode_waveform(np.concatenate(waveforms), sampling_rate, "wav", language=language))
+
+
+async def speak_stream(sentences: list[str], language: str, cache_key: str, started: float) -> AsyncIterator[bytes]:
+    """
+    16-bit PCM WAV stream of normalized sentences. The next sentence is synthesized
+    while the current one is sent; the complete audio is stored under cache_key,
+    so repeating the request (or /tts of the same translation) is a cache hit.
+    The whole stream holds one TTS admission slot.
+    """
+    with tts_pool.admission():
+        runner, _ = await tts_pool.run(load_tts_model, language)
+        sampling_rate = runner.config.sampling_rate
+        yield wav_header(sampling_rate)
         
-        # For regular numbers, convert to English words
+        synthesis_started = time.perf_counter()
+        waveforms = []
+        upcoming = asyncio.ensure_future(tts_pool.run(synthesize_waveform, sentences[0], language)) if sentences else None
         try:
-            num = int(num_str)
-            return number_to_words(num, "eng")  # Always use English
-        except:
-            return num_str
+            for i in range(len(sentences)):
+                waveform, _ = await upcoming
+                upcoming = None
+                if i + 1 < len(sentences):
+                    upcoming = asyncio.ensure_future(tts_pool.run(synthesize_waveform, sentences[i + 1], language))
+                if i == 0:
+                    speak_stats["first_audio_ms"] += (time.perf_counter() - started) * 1000
+                waveforms.append(waveform)
+                yield pcm16_bytes(waveform)
+        finally:
+            # Client gone mid-stream: don't leave a synthesis running for nobody
+            if upcoming is not None:
+                upcoming.cancel()
+        
+        speak_stats["synthesize_ms"] += (time.perf_counter() - synthesis_started) * 1000
+        if waveforms:
+            await tts_pool.run(store_speech, cache_key, waveforms, sampling_rate, language)
+
+
+# ============================================
+# STT Functions
+# ============================================
+
+class STTBundle:
+    """MMS-1B model and processor plus every language adapter, resident and switched by reference."""
     
-    # Match phone number formats first: (054) 472-3000, 054-472-3000, etc.
-    result = re.sub(r'\(?\d{2,4}\)?[\s-]?\d{2,4}[\s-]?\d{2,4}', replace_number, text)
-    # Also match standalone numbers
-    result = re.sub(r'\b\d+\b', replace_number, result)
+    def __init__(self, model, processor):
+        self.model = model
+        self.processor = processor
+        self.runner = GraphRunner.eager("stt", model)
+        self.adapters = ResidentAdapters(model, processor, load_adapter=_load_stt_adapter)
     
-    return result
+    @property
+    def current_lang(self) -> Optional[str]:
+        return self.adapters.active
+    
+    @property
+    def estimated_bytes(self) -> int:
+        # Inactive adapters aren't attached to the model; count them for the registry budget
+        return self.adapters.estimated_bytes
 
 
-def text_to_speech(text: str, language: str = DEFAULT_LANGUAGE) -> bytes:
-    """Convert text to speech audio (WAV)."""
-    # Convert numbers to words for better TTS pronunciation (always English)
-    text_with_words = convert_numbers_to_words(text, "eng")
-    logger.info(f"TTS text (numbers converted): '{text_with_words[:80]}...'")
+def _load_stt_weights(precision: str = STT_PRECISION) -> STTBundle:
+    """Load the multilingual STT model from the hub (called by the model registry)."""
+    logger.info(f"Loading STT model: {STT_MODEL} (this may take a while on first run...)")
     
-    model, tokenizer = load_tts_model(language)
-    device = next(model.parameters()).device
+    from transformers import Wav2Vec2ForCTC, AutoProcessor
     
-    inputs = tokenizer(text_with_words, return_tensors="pt").to(device)
+    processor = AutoProcessor.from_pretrained(STT_MODEL)
+    model = Wav2Vec2ForCTC.from_pretrained(STT_MODEL)
     
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    # Adapter layers and the LM head are replaced on every language switch, so they stay float
+    model, applied_precision[STT_MODEL] = apply_precision(
+        model.to(device), precision, device, keep_float=("adapter_layer", "lm_head")
+    )
+    
+    logger.info(f"STT model loaded on {device} ({applied_precision[STT_MODEL]})")
+    bundle = STTBundle(model, processor)
+    bundle.adapters.load_all(STT_LANGUAGE_CODES.values())
+    return bundle
+
+
+def _copy_stt_adapter(model, weights: dict) -> None:
+    """
+    Copy language adapter weights into the model in place. Used instead of
+    model.load_adapter() for int8 models: load_state_dict() can't skip the
+    dynamically quantized layers.
+    """
+    vocab_size = weights["lm_head.weight"].shape[0]
+    if vocab_size != model.config.vocab_size:
+        model.lm_head = torch.nn.Linear(
+            model.config.output_hidden_size, vocab_size,
+            device=model.lm_head.weight.device, dtype=model_dtype(model),
+        )
+        model.config.vocab_size = vocab_size
+    
+    adapters = model._get_adapters()
     with torch.no_grad():
-        output = model(**inputs).waveform
+        for key, value in weights.items():
+            adapters[key].copy_(value)
+
+
+def _load_stt_adapter(model, lang_code: str) -> None:
+    """Load an MMS language adapter (works for fp32, bf16 and int8 models)."""
+    if applied_precision.get(STT_MODEL) != "int8":
+        model.load_adapter(lang_code)
+        return
     
-    waveform = output.squeeze().cpu().numpy()
-    sampling_rate = model.config.sampling_rate
+    from safetensors.torch import load_file
+    from transformers.utils import cached_file
+    from transformers.models.wav2vec2.modeling_wav2vec2 import WAV2VEC2_ADAPTER_SAFE_FILE
     
-    buffer = io.BytesIO()
-    scipy.io.wavfile.write(buffer, rate=sampling_rate, data=waveform)
-    buffer.seek(0)
+    _copy_stt_adapter(model, load_file(cached_file(STT_MODEL, WAV2VEC2_ADAPTER_SAFE_FILE.format(lang_code))))
+    model.target_lang = lang_code
+
+
+def _load_stt_graph(language: str, backend: str = STT_BACKEND):
+    """Load (GraphRunner, processor) for one language's exported graph (adapter baked in)."""
+    from transformers import AutoConfig, AutoProcessor
     
-    return buffer.read()
+    lang_code = STT_LANGUAGE_CODES[language]
+    processor = AutoProcessor.from_pretrained(STT_MODEL)
+    processor.tokenizer.set_target_lang(lang_code)
+    runner = GraphRunner.load(
+        "stt", export_path(MODEL_EXPORT_DIR, f"stt-{language}", backend), backend,
+        config=AutoConfig.from_pretrained(STT_MODEL), threads=ONNX_THREADS,
+    )
+    logger.info(f"STT graph loaded: {lang_code} ({backend})")
+    return runner, processor
 
 
-# ============================================
-# STT Functions
-# ============================================
+def _stt_registry_key(language: str) -> str:
+    """Eager STT shares one model across adapters; exported graphs are one entry per language."""
+    return STT_MODEL if STT_BACKEND == "eager" else f"{STT_MODEL}:{STT_LANGUAGE_CODES[language]}:{STT_BACKEND}"
+
+
+def _select_stt_adapter(bundle: STTBundle, language: str):
+    """Switch the bundle to the language adapter (outside of request handling) and return (runner, processor)."""
+    if language not in STT_LANGUAGE_CODES:
+        raise ValueError(f"Unsupported STT language: {language}")
+    
+    with bundle.adapters.use(STT_LANGUAGE_CODES[language]):
+        return bundle.runner, bundle.processor
+
 
 def load_stt_model(language: str):
-    """Load STT model with the appropriate language adapter."""
-    global stt_model, stt_processor, stt_current_lang
+    """Load STT runner and processor for the language (switching the adapter on eager)."""
+    if language not in STT_LANGUAGE_CODES:
+        raise ValueError(f"Unsupported STT language: {language}")
     
+    if STT_BACKEND != "eager":
+        return model_registry.get(_stt_registry_key(language), lambda: _load_stt_graph(language))
+    return _select_stt_adapter(model_registry.get(STT_MODEL, _load_stt_weights), language)
+
+
+@contextmanager
+def stt_model_in_use(language: str):
+    """Hold the STT runner (switched to the language adapter) and processor while running inference."""
     if language not in STT_LANGUAGE_CODES:
         raise ValueError(f"Unsupported STT language: {language}")
     
-    lang_code = STT_LANGUAGE_CODES[language]
+    if STT_BACKEND != "eager":
+        with model_registry.use(_stt_registry_key(language), lambda: _load_stt_graph(language)) as loaded:
+            yield loaded
+        return
     
-    # Load model if not loaded
-    if stt_model is None:
-        logger.info(f"Loading STT model: {STT_MODEL} (this may take a while on first run...)")
-        
-        from transformers import Wav2Vec2ForCTC, AutoProcessor
-        
-        stt_processor = AutoProcessor.from_pretrained(STT_MODEL)
-        stt_model = Wav2Vec2ForCTC.from_pretrained(STT_MODEL)
-        
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        stt_model = stt_model.to(device)
-        
-        logger.info(f"STT model loaded on {device}")
+    with model_registry.use(STT_MODEL, _load_stt_weights) as bundle:
+        # Holds the adapter: a switch to another language waits until this request is done
+        with bundle.adapters.use(STT_LANGUAGE_CODES[language]):
+            yield bundle.runner, bundle.processor
+
+
+def _stt_logits(runner, processor, clips: list[np.ndarray]) -> torch.Tensor:
+    """CTC logits (batch, frames, vocab) for clips padded to the longest, with an attention mask."""
+    with stage_timer("tokenize"):
+        inputs = processor(
+            clips, sampling_rate=STT_SAMPLE_RATE, padding=True, return_attention_mask=True, return_tensors="pt"
+        )
+        inputs = match_model_dtype({name: inputs[name].to(runner.device) for name in ("input_values", "attention_mask")}, runner)
+    with stage_timer("forward"):
+        logits, = runner(**inputs)
+    return logits.float()
+
+
+def _stt_window_logits(runner, processor, windows: list[np.ndarray]) -> list[np.ndarray]:
+    """CTC logits for a batch of equal-length audio windows."""
+    return list(_stt_logits(runner, processor, windows).cpu().numpy())
+
+
+def prepare_stt_audio(audio_bytes: bytes, encoding: str = "auto") -> np.ndarray:
+    """Decode an upload to 16 kHz mono and, with STT_VAD, keep only its speech."""
+    # Decode in memory and resample to 16kHz mono (required by MMS); raw 16 kHz PCM skips both
+    with stage_timer("decode"):
+        audio = load_audio(audio_bytes, encoding)
+    
+    # Drop silence so it costs no compute
+    if not STT_VAD:
+        return audio
+    
+    with stage_timer("vad"):
+        segments = detect_speech(audio, STT_SAMPLE_RATE)
+        speech = pack_segments(audio, segments, gap=int(STT_SEGMENT_GAP_S * STT_SAMPLE_RATE))
+    logger.info(
+        f"STT VAD: {len(speech) / STT_SAMPLE_RATE:.1f}s of speech in {len(segments)} segment(s) "
+        f"out of {len(audio) / STT_SAMPLE_RATE:.1f}s"
+    )
+    return speech
+
+
+def transcribe_audio(speech: np.ndarray, language: str = DEFAULT_LANGUAGE) -> str:
+    """Transcribe 16 kHz mono samples of any length."""
+    if len(speech) < STT_MIN_AUDIO_S * STT_SAMPLE_RATE:
+        return ""
     
-    # Switch language adapter if needed
-    if stt_current_lang != lang_code:
-        logger.info(f"Switching STT language adapter to: {lang_code}")
-        stt_processor.tokenizer.set_target_lang(lang_code)
-        stt_model.load_adapter(lang_code)
-        stt_current_lang = lang_code
+    with metric_language(language), stt_model_in_use(language) as (runner, processor):
+        # Transcribe in overlapping windows, stitching the CTC frames at the overlap midpoints
+        ids = windowed_ctc(
+            speech,
+            lambda windows: _stt_window_logits(runner, processor, windows),
+            window=int(STT_WINDOW_S * STT_SAMPLE_RATE),
+            overlap=int(STT_WINDOW_OVERLAP_S * STT_SAMPLE_RATE),
+            batch_size=STT_WINDOW_BATCH,
+        )
+        
+        # Decode (CTC collapse of the stitched frames)
+        with stage_timer("detokenize"):
+            transcription = processor.decode(ids)
     
-    return stt_model, stt_processor
+    return transcription
 
 
-def speech_to_text(audio_bytes: bytes, language: str = DEFAULT_LANGUAGE) -> str:
+def speech_to_text(audio_bytes: bytes, language: str = DEFAULT_LANGUAGE, encoding: str = "auto") -> str:
     """Convert speech audio to text."""
-    import librosa
+    with metric_language(language):
+        return transcribe_audio(prepare_stt_audio(audio_bytes, encoding), language)
+
+
+def transcribe_batch(clips: list[np.ndarray], language: str = DEFAULT_LANGUAGE) -> list[str]:
+    """
+    Transcribe a bucket of similar-length clips in one padded forward pass.
+    A clip longer than STT_WINDOW_S (always bucketed alone) takes the windowed path.
+    """
+    if len(clips) == 1 and len(clips[0]) > STT_WINDOW_S * STT_SAMPLE_RATE:
+        return [transcribe_audio(clips[0], language)]
     
-    model, processor = load_stt_model(language)
-    device = next(model.parameters()).device
+    lengths = [len(clip) for clip in clips]
+    with metric_language(language), stt_model_in_use(language) as (runner, processor):
+        logits = _stt_logits(runner, processor, clips)
+        # Argmax over the whole batch; padded frames become blanks so batch_decode drops them
+        with stage_timer("detokenize"):
+            frames = ctc_frame_lengths(lengths, logits.shape[1], runner.config)
+            ids = batch_ctc_ids(logits, frames, processor.tokenizer.pad_token_id)
+            texts = processor.batch_decode(ids.cpu())
     
-    # Load audio from bytes
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as tmp:
-        tmp.write(audio_bytes)
-        tmp.flush()
-        
-        # Load and resample to 16kHz (required by MMS)
-        audio, sr = librosa.load(tmp.name, sr=16000)
+    stt_batch_stats["passes"] += 1
+    stt_batch_stats["clip_samples"] += sum(lengths)
+    stt_batch_stats["padded_samples"] += max(lengths) * len(lengths)
+    return texts
+
+
+def stt_batch_snapshot() -> dict:
+    stats = dict(stt_batch_stats)
+    stats["padding_efficiency"] = round(stats["clip_samples"] / stats["padded_samples"], 3) if stats["padded_samples"] else None
+    return stats
+
+
+def prepare_stt_batch(uploads: list[bytes], encoding: str = "auto") -> list:
+    """prepare_stt_audio for every clip; a clip that can't be decoded gets its ValueError instead."""
+    prepared = []
+    for data in uploads:
+        try:
+            prepared.append(prepare_stt_audio(data, encoding))
+        except ValueError as e:
+            prepared.append(e)
+    return prepared
+
+
+async def speech_to_text_batch(uploads: list[bytes], languages: list[str], encoding: str = "auto") -> AsyncIterator[dict]:
+    """
+    Transcribe many clips, yielding {"index", "language", "text" | "error"} per clip as soon as
+    its bucket finishes (so not in input order). Buckets go through the language-affine scheduler.
+    """
+    with metric_language(languages[0] if len(set(languages)) == 1 else "mixed"):
+        prepared = await stt_pool.run(prepare_stt_batch, uploads, encoding)
+    stt_batch_stats["requests"] += 1
+    stt_batch_stats["clips"] += len(uploads)
     
-    # Process audio
-    inputs = processor(audio, sampling_rate=16000, return_tensors="pt")
-    inputs = {k: v.to(device) for k, v in inputs.items()}
+    window = STT_WINDOW_S * STT_SAMPLE_RATE
+    by_language: dict[str, list[int]] = {}
+    buckets: list[tuple[str, list[int]]] = []
+    for index, (speech, language) in enumerate(zip(prepared, languages)):
+        if isinstance(speech, Exception):
+            yield {"index": index, "language": language, "error": str(speech)}
+        elif len(speech) < STT_MIN_AUDIO_S * STT_SAMPLE_RATE:
+            yield {"index": index, "language": language, "text": ""}
+        elif len(speech) > window:
+            buckets.append((language, [index]))  # windowed, on its own
+        else:
+            by_language.setdefault(language, []).append(index)
     
-    # Transcribe
-    with torch.no_grad():
-        outputs = model(**inputs).logits
+    for language, indices in by_language.items():
+        for bucket in plan_buckets(
+            [len(prepared[i]) for i in indices],
+            max_size=STT_BATCH_MAX_SIZE,
+            max_samples=int(STT_BATCH_MAX_SECONDS * STT_SAMPLE_RATE),
+            max_pad_ratio=STT_BATCH_MAX_PAD_RATIO,
+        ):
+            buckets.append((language, [indices[i] for i in bucket]))
     
-    # Decode
-    ids = torch.argmax(outputs, dim=-1)[0]
-    transcription = processor.decode(ids)
+    async def run_bucket(language: str, indices: list[int]) -> list[dict]:
+        try:
+            texts = await stt_scheduler.submit(language, transcribe_batch, [prepared[i] for i in indices], language)
+            return [{"index": i, "language": language, "text": text} for i, text in zip(indices, texts)]
+        except Exception as e:
+            logger.error(f"STT batch bucket error ({language}, {len(indices)} clips): {e}")
+            return [{"index": i, "language": language, "error": f"STT failed: {str(e)}"} for i in indices]
     
-    return transcription
+    logger.info(f"STT batch: {len(uploads)} clips in {len(buckets)} bucket(s)")
+    for finished in asyncio.as_completed([run_bucket(language, indices) for language, indices in buckets]):
+        for result in await finished:
+            yield result
+
+
+@contextmanager
+def stt_stream_model(language: str):
+    """(run_logits, decode) for one streaming pass, holding the model and language adapter."""
+    with metric_language(language), stt_model_in_use(language) as (runner, processor):
+        yield partial(_stt_window_logits, runner, processor), processor.decode
+
+
+def new_stt_stream(language: str) -> StreamingTranscriber:
+    """Streaming transcriber for one /stt/stream connection."""
+    return StreamingTranscriber(
+        partial(stt_stream_model, language),
+        rate=STT_SAMPLE_RATE,
+        partial_ms=STT_STREAM_PARTIAL_MS,
+        endpoint_ms=STT_STREAM_ENDPOINT_MS,
+        commit_s=STT_STREAM_COMMIT_S,
+        context_s=STT_WINDOW_OVERLAP_S,
+    )
 
 
 # ============================================
 # Translation Functions (NLLB-200)
 # ============================================
 
-def load_translation_model():
-    """Load NLLB translation model and tokenizer."""
-    global translation_model, translation_tokenizer
+def _load_translation_weights(precision: str = TRANSLATE_PRECISION):
+    """Load NLLB model and tokenizer from the hub (called by the model registry)."""
+    logger.info(f"Loading translation model: {NLLB_MODEL}")
     
-    if translation_model is None:
-        logger.info(f"Loading translation model: {NLLB_MODEL}")
-        
-        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
-        
-        translation_tokenizer = AutoTokenizer.from_pretrained(NLLB_MODEL)
-        translation_model = AutoModelForSeq2SeqLM.from_pretrained(NLLB_MODEL)
-        
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        translation_model = translation_model.to(device)
-        
-        logger.info(f"Translation model loaded on {device}")
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
     
-    return translation_model, translation_tokenizer
+    tokenizer = AutoTokenizer.from_pretrained(NLLB_MODEL)
+    model = AutoModelForSeq2SeqLM.from_pretrained(NLLB_MODEL)
+    
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model, applied_precision[NLLB_MODEL] = apply_precision(model.to(device), precision, device)
+    
+    logger.info(f"Translation model loaded on {device} ({applied_precision[NLLB_MODEL]})")
+    return model, tokenizer
 
 
-def translate_with_google(text: str, source_lang: str, target_lang: str) -> str:
-    """Translate using Google Translate API (for Tagalog)."""
-    import requests
-    
+def load_translation_model():
+    """Load NLLB translation model and tokenizer."""
+    return model_registry.get(NLLB_MODEL, _load_translation_weights)
+
+
+@contextmanager
+def translation_model_in_use():
+    """Hold the NLLB model and tokenizer while generating."""
+    with model_registry.use(NLLB_MODEL, _load_translation_weights) as loaded:
+        yield loaded
+
+
+def _load_translation_encoder(backend: str = TRANSLATE_BACKEND) -> GraphRunner:
+    """Load the exported NLLB encoder graph (called by the model registry)."""
+    runner = GraphRunner.load(
+        "translate", export_path(MODEL_EXPORT_DIR, "translate-encoder", backend), backend, threads=ONNX_THREADS
+    )
+    logger.info(f"Translation encoder graph loaded ({backend})")
+    return runner
+
+
+TRANSLATE_ENCODER_KEY = f"{NLLB_MODEL}:encoder:{TRANSLATE_BACKEND}"
+
+
+@contextmanager
+def translation_encoder_in_use():
+    """Hold the exported NLLB encoder, or yield None when translation runs eagerly."""
+    if TRANSLATE_BACKEND == "eager":
+        yield None
+        return
+    with model_registry.use(TRANSLATE_ENCODER_KEY, _load_translation_encoder) as runner:
+        yield runner
+
+
+async def translate_texts_with_google(texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+    """Translate texts using Google Translate API (for Tagalog), on the shared async client."""
     if not GOOGLE_TRANSLATE_API_KEY:
         raise ValueError("GOOGLE_TRANSLATE_API_KEY not set")
     
@@ -410,26 +1164,15 @@ def translate_with_google(text: str, source_lang: str, target_lang: str) -> str:
     if not src_code or not tgt_code:
         raise ValueError(f"Unsupported language for Google: {source_lang} or {target_lang}")
     
-    url = "https://translation.googleapis.com/language/translate/v2"
-    params = {
-        "key": GOOGLE_TRANSLATE_API_KEY,
-        "q": text,
-        "source": src_code,
-        "target": tgt_code,
-        "format": "text",
-    }
-    
-    response = requests.post(url, data=params)
-    response.raise_for_status()
-    
-    result = response.json()
-    translated = result["data"]["translations"][0]["translatedText"]
-    
-    return translated
+    return await google_translate.translate(texts, src_code, tgt_code)
 
 
-def translate_with_nllb(text: str, source_lang: str, target_lang: str) -> str:
-    """Translate using NLLB-200 (for Bikol and fallback)."""
+def translate_texts_with_nllb(texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+    """
+    Translate texts with NLLB-200: every text is split into sentences, the unique
+    sentences are generated in length-sorted batches (each with a max_new_tokens
+    budget from its longest input), and the translations are reassembled in order.
+    """
     
     # Get NLLB language codes
     src_code = NLLB_LANGUAGE_CODES.get(source_lang.lower())
@@ -440,48 +1183,128 @@ def translate_with_nllb(text: str, source_lang: str, target_lang: str) -> str:
     if not tgt_code:
         raise ValueError(f"Unsupported target language: {target_lang}")
     
-    model, tokenizer = load_translation_model()
-    device = next(model.parameters()).device
-    
-    # Set source language
-    tokenizer.src_lang = src_code
+    # Sentences of every text; repeated sentences are translated once
+    splits = [split_for_translation(text, TRANSLATE_MAX_SEGMENT_CHARS) for text in texts]
+    unique = list(dict.fromkeys(segment for segments, _ in splits for segment in segments if segment.strip()))
+    translated: dict[str, str] = {}
     
-    # Tokenize
-    inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
-    inputs = {k: v.to(device) for k, v in inputs.items()}
-    
-    # Generate translation
-    with torch.no_grad():
-        generated_tokens = model.generate(
-            **inputs,
-            forced_bos_token_id=tokenizer.convert_tokens_to_ids(tgt_code),
-            max_length=512,
-        )
-    
-    # Decode
-    translation = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)[0]
+    # Stages are labelled with the target language
+    with metric_language(translation_language(target_lang)), translation_model_in_use() as (model, tokenizer), \
+            translation_encoder_in_use() as encoder:
+        device = next(model.parameters()).device
+        forced_bos_token_id = tokenizer.convert_tokens_to_ids(tgt_code)
+        
+        # Tokenize without special tokens; the source language token is added per batch
+        # (tokenizer.src_lang is shared by concurrent requests and never set)
+        with stage_timer("tokenize"):
+            ids = token_ids(tokenizer, unique) if unique else []
+        
+        for batch in length_sorted_batches([len(row) for row in ids], TRANSLATE_BATCH_SIZE, TRANSLATE_BATCH_MAX_TOKENS):
+            inputs = encode_batch(tokenizer, [ids[i] for i in batch], src_code)
+            inputs = {k: v.to(device) for k, v in inputs.items()}
+            forward_started = time.perf_counter()
+            
+            # Encode on the exported graph if configured; generate() then only runs the decoder
+            if encoder is not None:
+                from transformers.modeling_outputs import BaseModelOutput
+                
+                hidden_state, = encoder(**inputs)
+                inputs["encoder_outputs"] = BaseModelOutput(
+                    last_hidden_state=hidden_state.to(device=device, dtype=model_dtype(model))
+                )
+            
+            # Generate with a budget proportional to the longest input in the batch
+            with torch.no_grad():
+                generated_tokens = model.generate(
+                    **inputs,
+                    forced_bos_token_id=forced_bos_token_id,
+                    max_new_tokens=max_new_tokens_for(inputs["attention_mask"].shape[1]),
+                )
+            observe_stage("forward", time.perf_counter() - forward_started)
+            
+            # Decode
+            with stage_timer("detokenize"):
+                decoded = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+            for i, translation in zip(batch, decoded):
+                translated[unique[i]] = translation
     
-    return translation
+    return [
+        join_segments([translated.get(segment, segment) for segment in segments], separators)
+        for segments, separators in splits
+    ]
+
+
+def translate_with_nllb(text: str, source_lang: str, target_lang: str) -> str:
+    """Translate using NLLB-200 (for Bikol and fallback)."""
+    return translate_texts_with_nllb([text], source_lang, target_lang)[0]
 
 
-def translate_text(text: str, source_lang: str, target_lang: str) -> str:
+def translation_language(lang: str) -> str:
+    """bcl/fil/eng for any language name or code accepted by translate_text."""
+    lang = lang.lower()
+    return TRANSLATION_LANGUAGE_ALIASES.get(lang, lang)
+
+
+async def remembered_lookup(texts: list[str], results: list, pending: list[int], source_lang: str, target_lang: str, engine: str) -> None:
+    """
+    Fill results[i] for every i in pending that has a translation memory entry for this engine.
+    The in-memory tier is read on the event loop; what it misses is looked up in the SQLite
+    store in one query on a thread, so disk I/O and store locks never stall the loop.
+    """
+    source, target = translation_language(source_lang), translation_language(target_lang)
+    lookup = [texts[i] for i in pending]
+    found = translation_memory.get_many(lookup, source, target, engine, memory_only=True)
+    missing = [j for j, translation in enumerate(found) if translation is None]
+    if missing and translation_memory.db_path:
+        stored = await asyncio.to_thread(translation_memory.get_many, [lookup[j] for j in missing], source, target, engine)
+        for j, translation in zip(missing, stored):
+            found[j] = translation
+    for i, translation in zip(pending, found):
+        results[i] = translation
+
+
+async def translate_and_remember(
+    texts: list[str], results: list, pending: list[int], source_lang: str, target_lang: str, engine: str, translate
+) -> None:
     """
-    Hybrid translation:
-    - Google Translate for Tagalog (better quality)
-    - NLLB for Bikol (Google doesn't support it)
+    Fill results[i] for every i in pending with await translate(texts, source_lang, target_lang),
+    called once on the distinct texts, and store the translations in the translation memory
+    (one store transaction per call, on a thread).
+    """
+    source, target = translation_language(source_lang), translation_language(target_lang)
+    unique = list(dict.fromkeys(texts[i] for i in pending))
+    translated = dict(zip(unique, await translate(unique, source_lang, target_lang)))
+    await asyncio.to_thread(translation_memory.put_many, list(translated.items()), source, target, engine)
+    for i in pending:
+        results[i] = translated[texts[i]]
+
+
+async def translate_texts_tiered(texts: list[str], source_lang: str, target_lang: str) -> tuple[list[str], list[str]]:
+    """
+    Hybrid translation of many strings, returned in input order with the tier that produced each:
+    - memory: curated knowledge-base translations, or the engine's earlier translations
+    - phrase: covered by the Bikol phrase tables, no model call
+    - google: Google Translate for Tagalog (better quality), many strings per request
+    - nllb: NLLB for Bikol (Google doesn't support it) or as fallback, in batched generation
+    Same-language requests and blank strings pass through (tier "passthrough").
+    
+    Hot memory and phrase lookups (sub-millisecond per string) and Google calls run on the
+    event loop, translation memory store reads and writes on a thread; only NLLB generation
+    takes a translation worker.
     """
     source_lower = source_lang.lower()
     target_lower = target_lang.lower()
+    passthrough = (list(texts), ["passthrough"] * len(texts))
     
     # Skip if same language
     if source_lower == target_lower:
-        return text
+        return passthrough
     if source_lower in ("eng", "english") and target_lower in ("eng", "english"):
-        return text
+        return passthrough
     if source_lower in ("tagalog", "fil") and target_lower in ("tagalog", "fil"):
-        return text
+        return passthrough
     if source_lower in ("bikol", "bcl") and target_lower in ("bikol", "bcl"):
-        return text
+        return passthrough
     
     # Check if we should use Google Translate (for Tagalog <-> English)
     use_google = (
@@ -491,16 +1314,102 @@ def translate_text(text: str, source_lang: str, target_lang: str) -> str:
         (source_lower in USE_GOOGLE_TRANSLATE or target_lower in USE_GOOGLE_TRANSLATE)
     )
     
-    if use_google:
+    translation_tier_stats.record_request(len(texts))
+    results: list[Optional[str]] = [None if text.strip() else text for text in texts]
+    tiers: list[Optional[str]] = ["passthrough" if result is not None else None for result in results]
+    pending = [i for i, result in enumerate(results) if result is None]
+    
+    def settle(tier: str, started: float) -> list[int]:
+        """Tag and count what the tier just answered; returns the indices still pending."""
+        answered = [i for i in pending if results[i] is not None]
+        for i in answered:
+            tiers[i] = tier
+        translation_tier_stats.record(tier, len(answered), time.perf_counter() - started)
+        return [i for i in pending if results[i] is None]
+    
+    # Tier 1: exact translation memory hits, curated first
+    started = time.perf_counter()
+    for engine in (SEEDED_ENGINE, "google" if use_google else NLLB_MODEL):
+        await remembered_lookup(texts, results, [i for i in pending if results[i] is None], source_lang, target_lang, engine)
+    pending = settle("memory", started)
+    
+    # Tier 2: phrase tables
+    if pending and phrase_table is not None:
+        started = time.perf_counter()
+        source, target = translation_language(source_lang), translation_language(target_lang)
+        for i in pending:
+            results[i] = phrase_table.translate(texts[i], source, target)
+        pending = settle("phrase", started)
+    
+    # Tier 3: machine translation
+    if pending and use_google:
+        started = time.perf_counter()
         try:
-            logger.info(f"Using Google Translate: {source_lang} → {target_lang}")
-            return translate_with_google(text, source_lang, target_lang)
+            logger.info(f"Using Google Translate: {source_lang} → {target_lang} ({len(pending)} strings)")
+            await translate_and_remember(texts, results, pending, source_lang, target_lang, "google", translate_texts_with_google)
+        except CircuitOpenError:
+            logger.info("Google Translate circuit open, using NLLB")
         except Exception as e:
             logger.error(f"Google Translate failed: {e}, falling back to NLLB")
+        pending = settle("google", started)
+        
+        if pending:
+            started = time.perf_counter()
+            await remembered_lookup(texts, results, pending, source_lang, target_lang, NLLB_MODEL)
+            pending = settle("memory", started)
     
     # Use NLLB for Bikol or as fallback
-    logger.info(f"Using NLLB: {source_lang} → {target_lang}")
-    return translate_with_nllb(text, source_lang, target_lang)
+    if pending:
+        started = time.perf_counter()
+        logger.info(f"Using NLLB: {source_lang} → {target_lang} ({len(pending)} strings)")
+        await translate_and_remember(
+            texts, results, pending, source_lang, target_lang, NLLB_MODEL, partial(translate_pool.submit, translate_texts_with_nllb)
+        )
+        settle("nllb", started)
+    
+    return results, tiers
+
+
+async def translate_texts(texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+    """Hybrid translation of many strings, in input order (see translate_texts_tiered)."""
+    return (await translate_texts_tiered(texts, source_lang, target_lang))[0]
+
+
+async def translate_text(text: str, source_lang: str, target_lang: str) -> str:
+    """Hybrid translation of one string (see translate_texts_tiered)."""
+    return (await translate_texts([text], source_lang, target_lang))[0]
+
+
+# Set once the translation memory is seeded; pre-forked workers inherit it from the parent,
+# so the shared store is seeded once rather than by every worker at the same time
+translation_memory_seeded = False
+
+
+def seed_translation_memory() -> int:
+    """Load the knowledge base's curated phrase translations into the translation memory."""
+    global translation_memory_seeded
+    if translation_memory_seeded:
+        logger.info("Translation memory already seeded (pre-fork parent)")
+        return 0
+    if not os.path.isdir(os.path.join(KNOWLEDGE_BASE_DIR, "bikol-phrases")):
+        logger.info(f"No knowledge base at {KNOWLEDGE_BASE_DIR}; translation memory not seeded")
+        return 0
+    seeded = translation_memory.seed(collect_translation_pairs(KNOWLEDGE_BASE_DIR))
+    purged = translation_memory.purge_expired()
+    translation_memory_seeded = True
+    logger.info(f"Translation memory seeded with {seeded} curated pairs ({purged} expired entries purged)")
+    return seeded
+
+
+def load_phrase_table() -> None:
+    """Build the phrase tier's tables from the Bikol mappings and corpus."""
+    global phrase_table
+    phrase_table = PhraseTable.from_files(
+        BIKOL_MAPPINGS_PATH,
+        BIKOL_CORPUS_PATH,
+        min_coverage=TRANSLATION_PHRASE_MIN_COVERAGE,
+        max_pieces=TRANSLATION_PHRASE_MAX_PIECES,
+    )
 
 
 # ============================================
@@ -510,6 +1419,20 @@ def translate_text(text: str, source_lang: str, target_lang: str) -> str:
 class TTSRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=5000)
     language: Literal["bcl", "fil", "eng"] = Field(default=DEFAULT_LANGUAGE)
+    format: Optional[Literal["wav", "ogg", "mp3"]] = Field(
+        default=None,
+        description="Output format: wav (16-bit PCM), ogg (Opus), mp3. Defaults to the Accept header, then wav.",
+    )
+    sample_rate: Optional[int] = Field(
+        default=None,
+        description="Optional lower output sample rate, e.g. 8000 or 16000",
+    )
+
+
+class SpeakRequest(BaseModel):
+    text: str = Field(..., min_length=1, max_length=5000)
+    source_lang: str = Field(..., description="Language of text: english, tagalog, bikol, eng, fil, bcl")
+    language: Literal["bcl", "fil", "eng"] = Field(default=DEFAULT_LANGUAGE, description="Language to speak")
 
 
 class STTResponse(BaseModel):
@@ -522,8 +1445,25 @@ class HealthResponse(BaseModel):
     tts_models_loaded: list[str]
     stt_model_loaded: bool
     stt_current_language: Optional[str]
+    stt_adapters: Optional[dict]
+    stt_scheduler: dict
+    stt_streams: dict
+    stt_batching: dict
     default_language: str
     supported_languages: list[str]
+    tts_cache: dict
+    translation_memory: dict
+    translation_tiers: dict
+    google_translate: dict
+    tts_audio_pack: Optional[dict]
+    tts_batching: dict
+    speak: dict
+    inference_pools: dict
+    model_registry: dict
+    model_precision: dict
+    model_backends: dict
+    warmup: dict
+    worker: dict
 
 
 class TranslateRequest(BaseModel):
@@ -536,39 +1476,134 @@ class TranslateResponse(BaseModel):
     text: str
     source_lang: str
     target_lang: str
+    tier: str = Field(..., description="What produced the text: passthrough, memory, phrase, google or nllb")
+
+
+class TranslateBatchRequest(BaseModel):
+    texts: list[Annotated[str, Field(max_length=5000)]] = Field(..., min_length=1, max_length=TRANSLATE_BATCH_MAX_TEXTS)
+    source_lang: str = Field(..., description="Source language: english, tagalog, bikol, eng, fil, bcl")
+    target_lang: str = Field(..., description="Target language: english, tagalog, bikol, eng, fil, bcl")
+
+
+class TranslateBatchResponse(BaseModel):
+    texts: list[str]
+    source_lang: str
+    target_lang: str
+    tiers: list[str] = Field(..., description="Per text: passthrough, memory, phrase, google or nllb")
 
 
 # ============================================
 # FastAPI App
 # ============================================
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    logger.info("Starting MyNaga AI Service...")
-    
-    # Preload TTS models (optional)
+# Short phrase per voice for the warm-up synthesis
+WARMUP_TTS_TEXT = {"bcl": "Marhay na aga, 10 pasyente.", "fil": "Magandang umaga, 10 pasyente.", "eng": "Good morning, 10 patients."}
+
+
+def warm_tts(language: str) -> None:
+    """One synthesis (normalize, forward, encode) so the first request doesn't pay for kernel/allocator setup."""
+    text_to_speech(WARMUP_TTS_TEXT.get(language, "10"), language)
+
+
+def warm_stt(language: str) -> None:
+    """One transcription of a second of faint noise."""
+    seconds = max(1.0, 2 * STT_MIN_AUDIO_S)
+    noise = np.random.default_rng(0).standard_normal(int(seconds * STT_SAMPLE_RATE)).astype(np.float32) * 0.01
+    transcribe_audio(noise, language)
+
+
+def warm_translation() -> None:
+    """One short NLLB generation."""
+    translate_texts_with_nllb(["Good morning."], "eng", "bcl")
+
+
+def load_translation_models() -> None:
+    load_translation_model()
+    if TRANSLATE_BACKEND != "eager":
+        model_registry.get(TRANSLATE_ENCODER_KEY, _load_translation_encoder)
+
+
+def warmup_plan() -> list[WarmupTask]:
+    """
+    Startup work selected by the PRELOAD_* env vars. Models are required for readiness;
+    the data tasks (resampler filters, translation memory seed, phrase tables) aren't.
+    """
     # Railway/Vercel requests can time out if the first request triggers a large model download/load.
     # Set PRELOAD_TTS_LANGUAGES="bcl,fil,eng" (or e.g. "bcl,fil") to warm models at startup.
     preload_env = os.environ.get("PRELOAD_TTS_LANGUAGES", "").strip()
     preload_langs = [DEFAULT_LANGUAGE]
     if preload_env:
         preload_langs = [x.strip() for x in preload_env.split(",") if x.strip()]
+    
+    tasks = [
+        WarmupTask(f"tts:{lang}", load=partial(load_tts_model, lang), warm=partial(warm_tts, lang), pool=tts_pool)
+        for lang in preload_langs
+    ]
+    
+    # STT (MMS-1B, ~4GB) and NLLB are loaded on first request unless asked for here.
+    # With AI_SERVICE_WORKERS > 1 anything not preloaded is loaded separately by every worker.
+    if os.environ.get("PRELOAD_STT", "0") == "1":
+        tasks.append(WarmupTask(
+            f"stt:{DEFAULT_LANGUAGE}", load=partial(load_stt_model, DEFAULT_LANGUAGE),
+            warm=partial(warm_stt, DEFAULT_LANGUAGE), pool=stt_pool,
+        ))
+    
+    if os.environ.get("PRELOAD_TRANSLATION", "0") == "1":
+        tasks.append(WarmupTask("translate", load=load_translation_models, warm=warm_translation, pool=translate_pool))
+    
+    # Resampling filters for common upload rates (8k/22.05k/44.1k/48k -> 16k)
+    tasks.append(WarmupTask("resampler", load=warm_resampler, required=False))
+    if TRANSLATION_MEMORY_SEED:
+        tasks.append(WarmupTask("translation_memory", load=seed_translation_memory, required=False))
+    if TRANSLATION_PHRASE_TIER:
+        tasks.append(WarmupTask("phrase_table", load=load_phrase_table, required=False))
+    return tasks
 
-    for lang in preload_langs:
+
+def preload_models() -> list:
+    """
+    Run the warm-up plan's loads (no warm-up inference) in the calling thread; used by the
+    pre-fork parent. Returns the resident torch modules (frozen and shared by the workers).
+    """
+    for task in warmup_plan():
         try:
-            load_tts_model(lang)
-            logger.info(f"TTS model preloaded: {lang}")
+            task.load()
+            logger.info(f"Preloaded: {task.name}")
         except Exception as e:
-            logger.warning(f"Could not preload TTS model ({lang}): {e}")
+            logger.warning(f"Could not preload {task.name}: {e}")
     
-    # STT model is loaded on-demand (it's 4GB)
-    logger.info("STT model will be loaded on first request")
+    return model_registry.modules()
+
+
+# Startup models, loaded and warmed in the background (GET /health/readiness). A required
+# model that keeps failing is retried WARMUP_MAX_ATTEMPTS times with doubling backoff,
+# then /health/liveness fails so the platform restarts the instance.
+WARMUP_MAX_ATTEMPTS = int(os.environ.get("WARMUP_MAX_ATTEMPTS", "5"))
+WARMUP_RETRY_BACKOFF_S = float(os.environ.get("WARMUP_RETRY_BACKOFF_S", "5"))
+
+model_warmup = ModelWarmup(warmup_plan(), max_attempts=WARMUP_MAX_ATTEMPTS, backoff_s=WARMUP_RETRY_BACKOFF_S)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Starting MyNaga AI Service...")
+    
+    # Accept traffic (and liveness probes) right away; models load and warm up concurrently.
+    # Under pre-fork serving the parent already loaded them, so each worker only warms up.
+    warmup_task = asyncio.create_task(model_warmup.run())
     
     yield
     
+    warmup_task.cancel()
     logger.info("Shutting down AI service...")
-    tts_models_cache.clear()
-    tts_tokenizers_cache.clear()
+    model_registry.clear()
+    tts_audio_cache.clear_memory()
+    translation_memory.close()
+    await google_translate.aclose()
+    if tts_audio_pack is not None:
+        tts_audio_pack.close()
+    for pool in (tts_pool, stt_pool, translate_pool):
+        pool.shutdown()
 
 
 app = FastAPI(
@@ -586,25 +1621,70 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if PROFILING_API_KEY:
+    app.add_middleware(ProfilingMiddleware, store=request_profiles, api_key=PROFILING_API_KEY)
+
+# Outermost: labels everything below with the endpoint and counts request/response bytes
+app.add_middleware(MetricsMiddleware, routes=app.routes)
+
+
+def service_overloaded(e: PoolFullError) -> HTTPException:
+    """503 with a Retry-After hint for requests shed by a full inference queue."""
+    logger.warning(str(e))
+    return HTTPException(
+        status_code=503,
+        detail=f"Service busy: {e}",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
 
 # ============================================
 # TTS Endpoint
 # ============================================
 
 @app.post("/tts", response_class=Response)
-async def synthesize_speech(request: TTSRequest, _: None = Depends(require_ai_key)):
-    """Convert text to speech audio (WAV)."""
+async def synthesize_speech(
+    request: TTSRequest,
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
+    accept: Optional[str] = Header(default=None),
+    _: None = Depends(require_ai_key),
+):
+    """
+    Convert text to speech audio.
+    Format comes from the `format` field or the Accept header (wav, ogg/Opus, mp3).
+    Supports ETag revalidation via If-None-Match.
+    """
     try:
-        logger.info(f"TTS request: lang={request.language}, text='{request.text[:50]}...'")
+        audio_format = request.format or negotiate_format(accept)
+        logger.info(f"TTS request: lang={request.language}, format={audio_format}, text='{request.text[:50]}...'")
+        current_language.set(request.language)
+        # An unsupported rate is rejected here, before any synthesis, ETag or cache entry
+        sample_rate = tts_output_rate(audio_format, request.sample_rate)
         
-        audio_bytes = text_to_speech(request.text, request.language)
+        # Normalize once: the ETag, the cache lookup and synthesis all use this text and key
+        spoken_text = normalize_tts_text(request.text, request.language)
+        key = tts_cache_key(spoken_text, request.language, audio_format, sample_rate, normalized=True)
+        etag = f'"{key}"'
+        cache_headers = {"ETag": etag, "Cache-Control": TTS_CACHE_CONTROL, "Vary": "Accept"}
+        
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=cache_headers)
+        
+        audio_bytes, _key = await cached_text_to_speech(
+            spoken_text, request.language, audio_format, sample_rate, normalized=True, key=key
+        )
         
         return Response(
             content=audio_bytes,
-            media_type="audio/wav",
-            headers={"Content-Disposition": "attachment; filename=speech.wav"}
+            media_type=media_type(audio_format),
+            headers={
+                "Content-Disposition": f"attachment; filename=speech.{file_extension(audio_format)}",
+                **cache_headers,
+            }
         )
     
+    except PoolFullError as e:
+        raise service_overloaded(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -612,19 +1692,56 @@ async def synthesize_speech(request: TTSRequest, _: None = Depends(require_ai_ke
         raise HTTPException(status_code=500, detail=f"TTS failed: {str(e)}")
 
 
+@app.post("/tts/stream")
+async def synthesize_speech_stream(request: TTSRequest, _: None = Depends(require_ai_key)):
+    """
+    Convert text to speech, streaming 16-bit PCM WAV audio sentence by sentence.
+    Only native-rate WAV is streamed; other formats and rates are a 400 (use /tts).
+    """
+    try:
+        logger.info(f"TTS stream request: lang={request.language}, text='{request.text[:50]}...'")
+        current_language.set(request.language)
+        if request.format not in (None, "wav") or tts_output_rate("wav", request.sample_rate) != TTS_SAMPLING_RATE:
+            raise ValueError(
+                f"/tts/stream sends {TTS_SAMPLING_RATE} Hz 16-bit PCM WAV; use /tts for other formats and sample rates"
+            )
+        
+        # Admission and model load happen before the WAV header, so they fail with a status code
+        stream = await started_stream(text_to_speech_stream(request.text, request.language))
+        
+        return StreamingResponse(
+            stream,
+            media_type="audio/wav",
+            headers={"Content-Disposition": "inline; filename=speech.wav"},
+        )
+    
+    except PoolFullError as e:
+        raise service_overloaded(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"TTS stream error: {e}")
+        raise HTTPException(status_code=500, detail=f"TTS failed: {str(e)}")
+
+
 # ============================================
 # STT Endpoint
 # ============================================
 
 @app.post("/stt", response_model=STTResponse)
 async def transcribe_speech(
-    audio: UploadFile = File(..., description="Audio file (WAV, WebM, MP3)"),
+    audio: UploadFile = File(..., description="Audio file (WAV, FLAC, OGG, MP3, WebM) or raw PCM"),
     language: Literal["bcl", "fil", "eng"] = Form(default=DEFAULT_LANGUAGE),
+    encoding: Literal["auto", "pcm_s16le"] = Form(
+        default="auto",
+        description="auto: decode the container; pcm_s16le: raw 16 kHz mono 16-bit PCM (no decoding or resampling)",
+    ),
     _: None = Depends(require_ai_key),
 ):
     """Convert speech audio to text."""
     try:
-        logger.info(f"STT request: lang={language}, file={audio.filename}")
+        logger.info(f"STT request: lang={language}, encoding={encoding}, file={audio.filename}")
+        current_language.set(language)
         
         # Read audio file
         audio_bytes = await audio.read()
@@ -635,13 +1752,16 @@ async def transcribe_speech(
         if len(audio_bytes) > 10 * 1024 * 1024:  # 10MB limit
             raise ValueError("Audio file too large (max 10MB)")
         
-        # Transcribe
-        transcription = speech_to_text(audio_bytes, language)
+        # Transcribe (queued with other requests of the same language)
+        with stt_pool.admission():
+            transcription = await stt_scheduler.submit(language, speech_to_text, audio_bytes, language, encoding)
         
         logger.info(f"STT result: '{transcription[:50]}...'")
         
         return STTResponse(text=transcription, language=language)
     
+    except PoolFullError as e:
+        raise service_overloaded(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -649,6 +1769,173 @@ async def transcribe_speech(
         raise HTTPException(status_code=500, detail=f"STT failed: {str(e)}")
 
 
+def batch_languages(language: str, count: int) -> list[str]:
+    """The /stt/batch language field: one language for every clip, or a comma-separated one per clip."""
+    languages = [code.strip() for code in language.split(",")]
+    if len(languages) == 1:
+        languages = languages * count
+    if len(languages) != count:
+        raise ValueError(f"Got {len(languages)} languages for {count} audio files")
+    for code in languages:
+        if code not in STT_LANGUAGE_CODES:
+            raise ValueError(f"Unsupported STT language: {code}")
+    return languages
+
+
+@app.post("/stt/batch")
+async def transcribe_speech_batch(
+    audio: list[UploadFile] = File(..., description="Audio files (WAV, FLAC, OGG, MP3, WebM) or raw PCM"),
+    language: str = Form(default=DEFAULT_LANGUAGE, description="bcl, fil or eng for all clips, or one per clip, comma-separated"),
+    encoding: Literal["auto", "pcm_s16le"] = Form(default="auto"),
+    _: None = Depends(require_ai_key),
+):
+    """
+    Transcribe many clips. Clips are grouped by language and similar duration into padded
+    batches (one forward pass each); results stream back as NDJSON, one line per clip
+    ({"index", "filename", "language", "text"} or {..., "error"}) as their batch finishes.
+    """
+    try:
+        if not audio:
+            raise ValueError("No audio files")
+        if len(audio) > STT_BATCH_MAX_CLIPS:
+            raise ValueError(f"Too many audio files (max {STT_BATCH_MAX_CLIPS})")
+        languages = batch_languages(language, len(audio))
+        
+        uploads = []
+        for upload in audio:
+            audio_bytes = await upload.read()
+            if len(audio_bytes) == 0:
+                raise ValueError(f"Empty audio file: {upload.filename}")
+            if len(audio_bytes) > 10 * 1024 * 1024:  # 10MB limit
+                raise ValueError(f"Audio file too large (max 10MB): {upload.filename}")
+            uploads.append(audio_bytes)
+        
+        logger.info(f"STT batch request: {len(uploads)} clips, languages={sorted(set(languages))}, encoding={encoding}")
+        
+        # The whole batch takes one admission slot; shed load before the stream starts
+        stt_pool.ensure_capacity()
+        filenames = [upload.filename for upload in audio]
+        
+        async def results() -> AsyncIterator[bytes]:
+            with stt_pool.admission():
+                async for result in speech_to_text_batch(uploads, languages, encoding):
+                    yield (json.dumps({**result, "filename": filenames[result["index"]]}) + "\n").encode()
+        
+        return StreamingResponse(results(), media_type="application/x-ndjson")
+    
+    except PoolFullError as e:
+        raise service_overloaded(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"STT batch error: {e}")
+        raise HTTPException(status_code=500, detail=f"STT failed: {str(e)}")
+
+
+def stream_command(text: str) -> Optional[str]:
+    """The "type" of a JSON control message on /stt/stream (None if it isn't one)."""
+    try:
+        message = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return message.get("type") if isinstance(message, dict) else None
+
+
+@app.websocket("/stt/stream")
+async def transcribe_speech_stream(
+    websocket: WebSocket,
+    language: Literal["bcl", "fil", "eng"] = Query(default=DEFAULT_LANGUAGE),
+    x_ai_key: Optional[str] = Header(default=None, alias="X-AI-KEY"),
+):
+    """
+    Streaming speech-to-text.
+
+    Client -> server: binary messages of raw 16 kHz mono 16-bit PCM (any size), and
+    text messages {"type": "flush"} (finalize the current utterance) or {"type": "end"}
+    (finalize and close).
+    Server -> client: {"type": "ready"}, then {"type": "partial" | "final", "segment", "text"}
+    events (finals also carry start_s/end_s), or {"type": "error", "message"} before closing.
+    """
+    if AI_SERVICE_API_KEY and x_ai_key != AI_SERVICE_API_KEY:
+        await websocket.close(code=1008)
+        return
+    
+    await websocket.accept()
+    if stt_stream_stats["active"] >= STT_STREAM_MAX_SESSIONS:
+        stt_stream_stats["rejected"] += 1
+        await websocket.send_json({"type": "error", "message": "Service busy: too many STT streams"})
+        await websocket.close(code=1013)
+        return
+    
+    stt_stream_stats["active"] += 1
+    stt_stream_stats["opened"] += 1
+    logger.info(f"STT stream opened: lang={language}")
+    
+    transcriber = new_stt_stream(language)
+    wakeup = asyncio.Event()
+    flush = asyncio.Event()
+    ended = False
+    
+    async def recognize():
+        # One pass at a time; audio that arrives during a pass is picked up by the next one
+        while True:
+            await wakeup.wait()
+            wakeup.clear()
+            final = flush.is_set()
+            flush.clear()
+            for event in await stt_scheduler.submit(language, transcriber.step, final):
+                stt_stream_stats["partials" if event["type"] == "partial" else "finals"] += 1
+                await websocket.send_json(event)
+            if final and ended:
+                return
+    
+    recognizer = None
+    try:
+        # Load the model (and switch the adapter) before audio starts arriving
+        await stt_scheduler.submit(language, load_stt_model, language)
+        await websocket.send_json({"type": "ready", "language": language, "sample_rate": STT_SAMPLE_RATE})
+        recognizer = asyncio.create_task(recognize())
+        
+        while not ended:
+            receiving = asyncio.create_task(websocket.receive())
+            done, _ = await asyncio.wait({receiving, recognizer}, return_when=asyncio.FIRST_COMPLETED)
+            if recognizer in done:
+                receiving.cancel()
+                recognizer.result()  # re-raise the recognition error
+            
+            message = receiving.result()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes") is not None:
+                transcriber.push(pcm16_to_float(message["bytes"]))
+            elif message.get("text"):
+                command = stream_command(message["text"])
+                if command == "end":
+                    ended = True
+                elif command != "flush":
+                    raise ValueError(f"Unknown STT stream message: {message['text'][:50]}")
+                flush.set()
+            wakeup.set()
+        
+        await recognizer
+        await websocket.close(code=1000)
+    
+    except WebSocketDisconnect:
+        logger.info(f"STT stream closed by client: lang={language}")
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close(code=1003)
+    except Exception as e:
+        logger.error(f"STT stream error: {e}")
+        await websocket.send_json({"type": "error", "message": f"STT failed: {str(e)}"})
+        await websocket.close(code=1011)
+    finally:
+        if recognizer is not None:
+            recognizer.cancel()
+        stt_stream_stats["active"] -= 1
+        logger.info(f"STT stream done: lang={language}, {transcriber.snapshot()}")
+
+
 # ============================================
 # Translation Endpoint
 # ============================================
@@ -658,17 +1945,21 @@ async def translate(request: TranslateRequest, _: None = Depends(require_ai_key)
     """Translate text between Bikol, Tagalog, and English."""
     try:
         logger.info(f"Translate request: {request.source_lang} → {request.target_lang}, text='{request.text[:50]}...'")
+        current_language.set(translation_language(request.target_lang))
         
-        translated = translate_text(request.text, request.source_lang, request.target_lang)
+        (translated,), (tier,) = await translate_texts_tiered([request.text], request.source_lang, request.target_lang)
         
-        logger.info(f"Translation result: '{translated[:50]}...'")
+        logger.info(f"Translation result ({tier}): '{translated[:50]}...'")
         
         return TranslateResponse(
             text=translated,
             source_lang=request.source_lang,
             target_lang=request.target_lang,
+            tier=tier,
         )
     
+    except PoolFullError as e:
+        raise service_overloaded(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -676,6 +1967,105 @@ async def translate(request: TranslateRequest, _: None = Depends(require_ai_key)
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
 
+@app.post("/translate/batch", response_model=TranslateBatchResponse)
+async def translate_batch(request: TranslateBatchRequest, _: None = Depends(require_ai_key)):
+    """
+    Translate many strings in one call; translations come back in input order.
+    Google-routed strings share multi-string requests, NLLB-routed ones batched generation.
+    """
+    try:
+        logger.info(f"Translate batch request: {request.source_lang} → {request.target_lang}, {len(request.texts)} strings")
+        current_language.set(translation_language(request.target_lang))
+        
+        translated, tiers = await translate_texts_tiered(request.texts, request.source_lang, request.target_lang)
+        
+        return TranslateBatchResponse(
+            texts=translated,
+            source_lang=request.source_lang,
+            target_lang=request.target_lang,
+            tiers=tiers,
+        )
+    
+    except PoolFullError as e:
+        raise service_overloaded(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch translation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch translation failed: {str(e)}")
+
+
+# ============================================
+# Speak Endpoint
+# ============================================
+
+@app.post("/speak")
+async def speak(request: SpeakRequest, _: None = Depends(require_ai_key)):
+    """
+    Translate text into the voice's language, normalize it and synthesize it in one call,
+    streaming 16-bit PCM WAV sentence by sentence (whole audio on a cache hit).
+    Server-Timing reports the translate and normalize stages (and synthesize on a cache
+    hit); X-Translated-Text (URL-encoded) and X-Translation-Tier describe the translation.
+    """
+    try:
+        logger.info(f"Speak request: {request.source_lang} → {request.language}, text='{request.text[:50]}...'")
+        current_language.set(request.language)
+        started = time.perf_counter()
+        
+        # Load the voice while translating
+        tts_pool.ensure_capacity()
+        voice = asyncio.ensure_future(tts_pool.run(load_tts_model, request.language))
+        try:
+            (translated,), (tier,) = await translate_texts_tiered([request.text], request.source_lang, request.language)
+        except BaseException:
+            voice.cancel()
+            raise
+        translated_at = time.perf_counter()
+        
+        # Same key as /tts of the translated text
+        spoken_text = normalize_text(translated, request.language)
+        cache_key = tts_cache_key(spoken_text, request.language, "wav", normalized=True)
+        sentences = split_sentences(spoken_text)
+        normalized_at = time.perf_counter()
+        
+        stages = {"translate": translated_at - started, "normalize": normalized_at - translated_at}
+        observe_stage("normalize", stages["normalize"], request.language)
+        speak_stats["requests"] += 1
+        speak_stats["translate_ms"] += stages["translate"] * 1000
+        speak_stats["normalize_ms"] += stages["normalize"] * 1000
+        
+        headers = {"Content-Disposition": "inline; filename=speech.wav", "X-Translation-Tier": tier}
+        encoded_text = quote(translated)
+        if len(encoded_text) <= SPEAK_TEXT_HEADER_MAX_BYTES:
+            headers["X-Translated-Text"] = encoded_text
+        
+        cached = await cached_tts_audio(cache_key)
+        if cached is not None:
+            voice.cancel()
+            speak_stats["cache_hits"] += 1
+            stages["synthesize"] = time.perf_counter() - normalized_at
+            headers["Server-Timing"] = server_timing(stages)
+            return Response(content=cached, media_type="audio/wav", headers=headers)
+        
+        # Surface model load errors and a full TTS queue as a status code instead of a truncated stream
+        await voice
+        stream = await started_stream(speak_stream(sentences, request.language, cache_key, started))
+        headers["Server-Timing"] = server_timing(stages)
+        return StreamingResponse(
+            stream,
+            media_type="audio/wav",
+            headers=headers,
+        )
+    
+    except PoolFullError as e:
+        raise service_overloaded(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Speak error: {e}")
+        raise HTTPException(status_code=500, detail=f"Speak failed: {str(e)}")
+
+
 # ============================================
 # Health & Info Endpoints
 # ============================================
@@ -683,16 +2073,151 @@ async def translate(request: TranslateRequest, _: None = Depends(require_ai_key)
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Check service health."""
+    stt_bundle = model_registry.peek(STT_MODEL)
     return HealthResponse(
         status="ok",
-        tts_models_loaded=list(tts_models_cache.keys()),
-        stt_model_loaded=stt_model is not None,
-        stt_current_language=stt_current_lang,
+        tts_models_loaded=[lang for lang, name in TTS_MODELS.items() if model_registry.is_loaded(name)],
+        stt_model_loaded=any(key.startswith(STT_MODEL) for key in model_registry.loaded_keys()),
+        stt_current_language=stt_bundle.current_lang if stt_bundle is not None else None,
+        stt_adapters=stt_bundle.adapters.snapshot() if stt_bundle is not None else None,
+        stt_scheduler=stt_scheduler.snapshot(),
+        stt_streams=dict(stt_stream_stats),
+        stt_batching=stt_batch_snapshot(),
         default_language=DEFAULT_LANGUAGE,
         supported_languages=list(TTS_MODELS.keys()),
+        tts_cache=tts_audio_cache.snapshot(),
+        translation_memory=translation_memory.snapshot(),
+        google_translate=google_translate.snapshot(),
+        translation_tiers={
+            **translation_tier_stats.snapshot(),
+            "phrase_table": phrase_table.snapshot() if phrase_table is not None else None,
+        },
+        tts_audio_pack=tts_audio_pack.snapshot() if tts_audio_pack is not None else None,
+        tts_batching=tts_batcher.snapshot(),
+        speak=speak_snapshot(),
+        inference_pools={pool.name: pool.snapshot() for pool in (tts_pool, stt_pool, translate_pool)},
+        model_registry=model_registry.snapshot(),
+        model_precision={
+            "requested": {"tts": TTS_PRECISION, "stt": STT_PRECISION, "translate": TRANSLATE_PRECISION},
+            "applied": dict(applied_precision),
+        },
+        model_backends={"tts": TTS_BACKEND, "stt": STT_BACKEND, "translate": TRANSLATE_BACKEND},
+        warmup=model_warmup.snapshot(),
+        worker={"pid": os.getpid(), "torch_threads": torch.get_num_threads()},
     )
 
 
+@app.get("/health/liveness")
+async def liveness():
+    """
+    The process is up and serving (models may still be loading); 503 once a required
+    startup model has failed every warm-up attempt, so the instance gets restarted.
+    """
+    if not model_warmup.healthy:
+        failed = [name for name, model in model_warmup.snapshot()["models"].items() if model["state"] == "failed" and model["required"]]
+        return JSONResponse(status_code=503, content={"status": "failed", "failed_models": failed})
+    return {"status": "ok"}
+
+
+@app.get("/health/readiness")
+async def readiness():
+    """200 once every required startup model has loaded and run a warm-up inference, 503 until then."""
+    snapshot = model_warmup.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
+
+# ============================================
+# Metrics Endpoint
+# ============================================
+
+def metric_families() -> list:
+    """The /health counters as Prometheus metric families (computed on every scrape)."""
+    cache_stats = tts_audio_cache.stats
+    memory_stats = translation_memory.stats
+    lookups = {
+        "tts_audio": (cache_stats["memory_hits"] + cache_stats["disk_hits"], cache_stats["misses"]),
+        "translation_memory": (memory_stats["memory_hits"] + memory_stats["db_hits"], memory_stats["misses"]),
+        "models": (model_registry.stats["hits"], model_registry.stats["loads"]),
+    }
+    if tts_audio_pack is not None:
+        lookups["tts_audio_pack"] = (tts_audio_pack.stats["hits"], tts_audio_pack.stats["misses"])
+    
+    google = google_translate.snapshot()
+    google["circuit_open"] = int(google["circuit"]["state"] != "closed")
+    stt_bundle = model_registry.peek(STT_MODEL)
+    
+    return [
+        *cache_families(lookups),
+        *stats_families(
+            "ai_inference_pool", "pool", {pool.name: pool.snapshot() for pool in (tts_pool, stt_pool, translate_pool)},
+            counters=("admitted", "rejected", "completed", "failed"), gauges=("running", "queue_depth"),
+        ),
+        *stats_families("ai_translation_tier", "tier", translation_tier_stats.snapshot()["tiers"], counters=("hits",)),
+        *stats_families(
+            "ai_google_translate", "client", {"v2": google},
+            counters=("calls", "requests", "failures", "deadline_exceeded"), gauges=("circuit_open", "queued_calls"),
+        ),
+        *stats_families("ai_tts_batcher", "batcher", {"tts": tts_batcher.snapshot()}, counters=("requests", "batches")),
+        *stats_families(
+            "ai_stt_scheduler", "scheduler", {"stt": stt_scheduler.snapshot()},
+            counters=("requests", "dispatched", "language_switches"), gauges=("running",),
+        ),
+        *stats_families(
+            "ai_stt_adapters", "model", {STT_MODEL: stt_bundle.adapters.snapshot()} if stt_bundle is not None else {},
+            counters=("switches", "switch_time_s", "adapter_loads", "waits"),
+        ),
+        *stats_families(
+            "ai_stt_streams", "endpoint", {"/stt/stream": stt_stream_stats},
+            counters=("opened", "rejected", "partials", "finals"), gauges=("active",),
+        ),
+    ]
+
+
+CallbackCollector(metric_families)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics (of the worker that answers, with AI_SERVICE_WORKERS > 1)."""
+    return Response(content=generate_latest(METRICS_REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+
+# ============================================
+# Profiling Endpoints (PROFILING_API_KEY)
+# ============================================
+
+@app.post("/admin/profile/sample")
+async def sample_stacks(
+    seconds: float = Query(default=10.0, gt=0, le=PROFILING_SAMPLE_MAX_S),
+    interval_ms: float = Query(default=PROFILING_SAMPLE_INTERVAL_MS, ge=1, le=1000),
+    _: None = Depends(require_profiling_key),
+):
+    """
+    Sample every thread's stack for `seconds` and return collapsed stacks
+    (flamegraph.pl, inferno, speedscope). One run at a time.
+    """
+    try:
+        collapsed = await asyncio.to_thread(stack_sampler.sample, seconds, interval_ms)
+    except SamplerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return Response(
+        content=collapsed,
+        media_type="text/plain",
+        headers={"Content-Disposition": "attachment; filename=stacks.collapsed"},
+    )
+
+
+@app.get("/admin/profiles/{profile_id}")
+async def request_profile(profile_id: str, _: None = Depends(require_profiling_key)):
+    """Report of a request sent with X-Profile (its id is in the X-Profile-Id response header)."""
+    profile = request_profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found (expired or unknown id)")
+    if not profile.done:
+        raise HTTPException(status_code=409, detail="Request still running", headers={"Retry-After": "1"})
+    return Response(content=profile.report(), media_type="text/plain")
+
+
 @app.get("/")
 async def root():
     """Service info."""
@@ -701,9 +2226,19 @@ async def root():
         "version": "2.0.0",
         "endpoints": {
             "POST /tts": "Text-to-Speech",
+            "POST /tts/stream": "Text-to-Speech (streamed per sentence)",
             "POST /stt": "Speech-to-Text",
+            "WS /stt/stream": "Speech-to-Text (streamed, partial and final transcripts)",
+            "POST /stt/batch": "Speech-to-Text for many clips (NDJSON, one line per clip)",
             "POST /translate": "Translation (Bikol/Tagalog/English)",
+            "POST /translate/batch": "Translation of many strings (results in input order)",
+            "POST /speak": "Translate + Text-to-Speech in one call (streamed WAV)",
             "GET /health": "Health check",
+            "GET /health/liveness": "Liveness (process up)",
+            "GET /health/readiness": "Readiness (startup models loaded and warm; 503 until then)",
+            "GET /metrics": "Prometheus metrics",
+            "POST /admin/profile/sample": "Stack sampler, collapsed stacks (PROFILING_API_KEY)",
+            "GET /admin/profiles/{id}": "Report of an X-Profile request (PROFILING_API_KEY)",
         },
         "tts_languages": TTS_MODELS,
         "stt_languages": STT_LANGUAGE_CODES,
@@ -717,5 +2252,14 @@ if __name__ == "__main__":
     port = int(os.environ.get("AI_SERVICE_PORT", os.environ.get("TTS_PORT", 8001)))
     host = os.environ.get("AI_SERVICE_HOST", os.environ.get("TTS_HOST", "0.0.0.0"))
     
+    # AI_SERVICE_WORKERS > 1: load models once, then fork workers sharing the weights copy-on-write
+    workers = int(os.environ.get("AI_SERVICE_WORKERS", "1"))
+    threads = int(os.environ.get("AI_SERVICE_THREADS_PER_WORKER", "0"))
+    
     logger.info(f"Starting AI service on {host}:{port}")
-    uvicorn.run(app, host=host, port=port)
+    if workers > 1 and hasattr(os, "fork"):
+        from prefork import serve_prefork
+        
+        serve_prefork(app, host, port, workers, preload=preload_models, threads=threads)
+    else:
+        uvicorn.run(app, host=host, port=port)
@@ -0,0 +1,125 @@
+"""
+Audio Decoding for STT Input
+============================
+
+Turns an uploaded clip into the 16 kHz mono float32 samples MMS expects,
+without a temp file:
+- pcm_s16le: raw 16 kHz mono 16-bit little-endian PCM, used as-is (no decode, no resample)
+- auto: decoded from memory with soundfile (WAV, FLAC, OGG/Vorbis/Opus, MP3),
+  then PyAV (WebM/Opus from browsers, M4A/AAC), then librosa via a temp
+  file as a last resort for anything neither can read
+
+Decoded audio is downmixed and resampled with the cached polyphase filters
+from audio_encoding.
+
+Usage:
+    from audio_decoding import load_audio
+
+    samples = load_audio(audio_bytes)                       # any container
+    samples = load_audio(pcm_bytes, encoding="pcm_s16le")   # fast path
+"""
+
+import io
+import logging
+import tempfile
+
+import numpy as np
+
+from audio_encoding import polyphase_filter, resample
+
+logger = logging.getLogger(__name__)
+
+STT_SAMPLE_RATE = 16000
+
+# The missing-PyAV warning is logged once per process, not per upload
+_warned_no_pyav = False
+
+# encoding form values accepted by /stt
+INPUT_ENCODINGS = ("auto", "pcm_s16le")
+
+# Input rates whose resampling filters are built at startup
+COMMON_INPUT_RATES = (8000, 22050, 44100, 48000)
+
+
+def warm_resampler(rates: tuple[int, ...] = COMMON_INPUT_RATES, target_rate: int = STT_SAMPLE_RATE) -> None:
+    """Design the polyphase filters for common input rates ahead of the first request."""
+    import math
+
+    for rate in rates:
+        g = math.gcd(rate, target_rate)
+        polyphase_filter(target_rate // g, rate // g)
+
+
+def pcm16_to_float(data: bytes) -> np.ndarray:
+    """Raw little-endian 16-bit PCM -> float32 in [-1, 1)."""
+    if len(data) % 2:
+        raise ValueError("Raw PCM audio must have an even number of bytes (16-bit samples)")
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) * (1.0 / 32768.0)
+
+
+def _to_mono(audio: np.ndarray) -> np.ndarray:
+    return audio[:, 0] if audio.shape[1] == 1 else audio.mean(axis=1, dtype=np.float32)
+
+
+def _decode_soundfile(data: bytes) -> tuple[np.ndarray, int]:
+    import soundfile as sf
+
+    audio, rate = sf.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    return _to_mono(audio), rate
+
+
+def _decode_pyav(data: bytes, target_rate: int) -> np.ndarray:
+    """Decode with FFmpeg's codecs via PyAV, resampled to mono target_rate by libswresample."""
+    import av
+
+    chunks = []
+    with av.open(io.BytesIO(data)) as container:
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=target_rate)
+        for frame in container.decode(audio=0):
+            chunks.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(frame))
+        chunks.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(None))
+    return np.concatenate(chunks).astype(np.float32, copy=False) if chunks else np.zeros(0, dtype=np.float32)
+
+
+def _decode_librosa(data: bytes, target_rate: int) -> np.ndarray:
+    """Previous decode path (audioread/ffmpeg need a file); only reached for formats the others can't read."""
+    import librosa
+
+    with tempfile.NamedTemporaryFile(delete=True) as tmp:
+        tmp.write(data)
+        tmp.flush()
+        audio, _ = librosa.load(tmp.name, sr=target_rate)
+    return audio
+
+
+def decode_audio(data: bytes, target_rate: int = STT_SAMPLE_RATE) -> np.ndarray:
+    """Decode an encoded clip from memory to mono float32 at target_rate."""
+    try:
+        audio, rate = _decode_soundfile(data)
+        return resample(audio, rate, target_rate)
+    except RuntimeError as e:  # soundfile's LibsndfileError: container/codec not supported
+        logger.debug(f"soundfile could not decode upload: {e}")
+
+    global _warned_no_pyav
+    try:
+        return _decode_pyav(data, target_rate)
+    except ImportError:
+        if not _warned_no_pyav:
+            _warned_no_pyav = True
+            logger.warning("Audio format not readable by soundfile and PyAV is not installed; decoding via temp file")
+    except Exception as e:  # av.FFmpegError and friends: let audioread/ffmpeg have a go
+        logger.debug(f"PyAV could not decode upload: {str(e) or type(e).__name__}")
+
+    try:
+        return _decode_librosa(data, target_rate)
+    except Exception as e:
+        raise ValueError(f"Could not decode audio: {str(e) or type(e).__name__}")
+
+
+def load_audio(data: bytes, encoding: str = "auto") -> np.ndarray:
+    """Uploaded bytes -> 16 kHz mono float32 samples (see INPUT_ENCODINGS)."""
+    if encoding == "pcm_s16le":
+        return pcm16_to_float(data)
+    if encoding != "auto":
+        raise ValueError(f"Unsupported audio encoding: {encoding}. Supported: {list(INPUT_ENCODINGS)}")
+    return decode_audio(data, STT_SAMPLE_RATE)
@@ -0,0 +1,249 @@
+"""
+Audio Encoding for TTS Output
+=============================
+
+Encodes float32 waveforms into compact response formats:
+- wav: 16-bit PCM WAV (half the size of the float32 WAV scipy writes)
+- ogg: Opus in an OGG container (speech-grade at a fraction of the size)
+- mp3: MPEG layer III
+
+Also handles optional downsampling and Accept-header format negotiation.
+
+Usage:
+    from audio_encoding import encode_audio, negotiate_format
+
+    fmt = negotiate_format(request.headers.get("accept"))
+    audio = encode_audio(waveform, 16000, fmt, sample_rate=8000)
+"""
+
+import io
+import math
+import struct
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_FORMAT = "wav"
+
+# format -> (media type, file extension, soundfile format, soundfile subtype)
+AUDIO_FORMATS = {
+    "wav": ("audio/wav", "wav", "WAV", "PCM_16"),
+    "ogg": ("audio/ogg", "ogg", "OGG", "OPUS"),
+    "mp3": ("audio/mpeg", "mp3", "MP3", "MPEG_LAYER_III"),
+}
+
+# Accept-header media types understood for negotiation
+MEDIA_TYPE_FORMATS = {
+    "audio/wav": "wav",
+    "audio/wave": "wav",
+    "audio/x-wav": "wav",
+    "audio/ogg": "ogg",
+    "audio/opus": "ogg",
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+}
+
+# Output rates a client may ask for (only downsampling is applied)
+SUPPORTED_SAMPLE_RATES = (8000, 12000, 16000, 22050, 24000, 44100, 48000)
+
+# libopus only accepts these input rates
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+UNKNOWN_WAV_SIZE = 0xFFFFFFFF
+
+
+def media_type(audio_format: str) -> str:
+    return AUDIO_FORMATS[audio_format][0]
+
+
+def file_extension(audio_format: str) -> str:
+    return AUDIO_FORMATS[audio_format][1]
+
+
+def negotiate_format(accept: Optional[str], default: str = DEFAULT_FORMAT) -> str:
+    """
+    Pick an output format from an Accept header, honoring q-values.
+    Wildcards and unknown/missing headers fall back to `default`.
+    """
+    if not accept:
+        return default
+
+    best_format, best_q = None, 0.0
+    for entry in accept.split(","):
+        parts = [p.strip() for p in entry.split(";")]
+        mime = parts[0].lower()
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+
+        fmt = MEDIA_TYPE_FORMATS.get(mime)
+        if fmt is None and mime in ("audio/*", "*/*"):
+            fmt = default
+        if fmt is not None and q > best_q:
+            best_format, best_q = fmt, q
+
+    return best_format or default
+
+
+def resolve_sample_rate(source_rate: int, requested: Optional[int], audio_format: str) -> int:
+    """Validate a requested output rate; only downsampling is performed."""
+    if requested is None or requested >= source_rate:
+        target = source_rate
+    elif requested not in SUPPORTED_SAMPLE_RATES:
+        raise ValueError(f"Unsupported sample rate: {requested}. Supported: {list(SUPPORTED_SAMPLE_RATES)}")
+    else:
+        target = requested
+
+    if audio_format == "ogg" and target not in OPUS_SAMPLE_RATES:
+        raise ValueError(f"Opus supports sample rates {list(OPUS_SAMPLE_RATES)}, got {target}")
+    return target
+
+
+@lru_cache(maxsize=32)
+def polyphase_filter(up: int, down: int) -> tuple[np.ndarray, int]:
+    """
+    Anti-aliasing FIR filter for resampling by up/down, split into its `up`
+    polyphase sub-filters and cached per ratio. Same design as scipy's
+    resample_poly (Kaiser window, beta 5.0), which rebuilds it on every call.
+
+    Returns (phases, delay): phases[p] is sub-filter p reversed, so it dots
+    directly with a window of input samples; delay is the number of leading
+    output samples the filter's group delay shifts out.
+    """
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+
+    # Align the filter centre with output sample 0 (as resample_poly does)
+    pre_pad = down - half_len % down
+    taps = np.concatenate((np.zeros(pre_pad), taps))
+    delay = (half_len + pre_pad) // down
+
+    per_phase = -(-len(taps) // up)
+    taps = np.concatenate((taps, np.zeros(per_phase * up - len(taps))))
+    phases = np.ascontiguousarray(taps.reshape(per_phase, up).T[:, ::-1], dtype=np.float32)
+    phases.setflags(write=False)
+    return phases, delay
+
+
+def resample(waveform: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """
+    Polyphase resampling (anti-aliased) between integer rates; matches
+    scipy.signal.resample_poly. Each output phase is one BLAS matrix-vector
+    product over strided input windows or, when the decimation step is
+    shorter than the filter, a sum of shifted contiguous slices.
+    """
+    if source_rate == target_rate:
+        return waveform
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    g = math.gcd(source_rate, target_rate)
+    up, down = target_rate // g, source_rate // g
+    phases, delay = polyphase_filter(up, down)
+    taps = phases.shape[1]
+
+    n_in = len(waveform)
+    n_out = -(-n_in * up // down)
+    last_input = (delay + n_out - 1) * down // up
+
+    # Zero history before the first sample and enough zeros after the last one
+    padded = np.zeros(taps - 1 + max(n_in, last_input + 1), dtype=np.float32)
+    padded[taps - 1:taps - 1 + n_in] = waveform
+
+    windows = sliding_window_view(padded, taps)
+    # Windows `down` apart overlap too much for BLAS; read de-interleaved streams instead
+    streams = [np.ascontiguousarray(padded[q::down]) for q in range(down)] if down < taps else None
+
+    out = np.empty(n_out, dtype=np.float32)
+    for first in range(min(up, n_out)):
+        start, phase = divmod((delay + first) * down, up)
+        count = len(range(first, n_out, up))
+        if streams is None:
+            out[first::up] = windows[start:start + (count - 1) * down + 1:down] @ phases[phase]
+            continue
+        acc = np.zeros(count, dtype=np.float32)
+        term = np.empty(count, dtype=np.float32)
+        for k, coeff in enumerate(phases[phase]):
+            offset, stream = divmod(start + k, down)
+            np.multiply(streams[stream][offset:offset + count], coeff, out=term)
+            acc += term
+        out[first::up] = acc
+    return out
+
+
+def wav_header(sample_rate: int, num_samples: Optional[int] = None, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """
+    PCM WAV header. With num_samples=None the RIFF/data sizes are set to the
+    maximum value, which browsers and most decoders treat as "read until EOF"
+    (used for streaming).
+    """
+    byte_rate = sample_rate * channels * bits_per_sample // 8
+    block_align = channels * bits_per_sample // 8
+    if num_samples is None:
+        riff_size = data_size = UNKNOWN_WAV_SIZE
+    else:
+        data_size = num_samples * block_align
+        riff_size = 36 + data_size
+    return (
+        b"RIFF" + struct.pack("<I", riff_size) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, block_align, bits_per_sample)
+        + b"data" + struct.pack("<I", data_size)
+    )
+
+
+def pcm16_bytes(waveform: np.ndarray) -> bytes:
+    """Convert a float waveform in [-1, 1] to little-endian 16-bit PCM bytes."""
+    return (np.clip(waveform, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+
+
+def _encode_wav_pcm16(waveform: np.ndarray, sample_rate: int) -> memoryview:
+    """Write header and int16 samples straight into one preallocated buffer."""
+    header = wav_header(sample_rate, len(waveform))
+    buffer = bytearray(len(header) + 2 * len(waveform))
+    buffer[:len(header)] = header
+
+    samples = np.frombuffer(buffer, dtype="<i2", offset=len(header))
+    np.multiply(np.clip(waveform, -1.0, 1.0), 32767.0, out=samples, casting="unsafe")
+    return memoryview(buffer)
+
+
+def encode_audio(
+    waveform: np.ndarray,
+    source_rate: int,
+    audio_format: str = DEFAULT_FORMAT,
+    sample_rate: Optional[int] = None,
+) -> memoryview:
+    """
+    Encode a mono float32 waveform.
+
+    Args:
+        waveform: Samples in [-1, 1]
+        source_rate: Sampling rate of `waveform`
+        audio_format: One of AUDIO_FORMATS
+        sample_rate: Optional lower output rate
+
+    Returns:
+        Encoded audio as a memoryview over the output buffer (no trailing copy)
+    """
+    if audio_format not in AUDIO_FORMATS:
+        raise ValueError(f"Unsupported audio format: {audio_format}. Supported: {list(AUDIO_FORMATS)}")
+
+    target_rate = resolve_sample_rate(source_rate, sample_rate, audio_format)
+    waveform = resample(np.asarray(waveform, dtype=np.float32), source_rate, target_rate)
+
+    if audio_format == "wav":
+        return _encode_wav_pcm16(waveform, target_rate)
+
+    import soundfile as sf
+
+    _, _, sf_format, sf_subtype = AUDIO_FORMATS[audio_format]
+    buffer = io.BytesIO()
+    sf.write(buffer, waveform, target_rate, format=sf_format, subtype=sf_subtype)
+    return buffer.getbuffer()
@@ -0,0 +1,240 @@
+"""
+Pre-rendered TTS Audio Pack
+===========================
+
+Audio for the strings we speak most often (Bikol phrase corpus, facility
+names) is synthesized offline into a pack of two files:
+- <name>.bin:        all encoded clips concatenated
+- <name>.index.json: format, models, and one {key, language, text, offset, length} per clip
+
+At runtime the blob is memory-mapped and exact matches are served as
+zero-copy slices, without touching the model. Keys are the same as the
+/tts audio cache keys, so a pack built for another model revision, TTS
+backend or precision, or output format simply never matches. The index also
+carries the text and language of every clip, which is what the mobile app
+looks clips up by.
+
+Usage:
+    from audio_pack import AudioPack
+
+    pack = AudioPack.open("data/output/tts-pack/tts_pack")
+    audio = pack.get(cache_key)  # memoryview or None
+
+Build with:
+    python scripts/build_audio_pack.py
+"""
+
+import os
+import json
+import mmap
+import logging
+import tempfile
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+PACK_VERSION = 1
+
+# Knowledge-base fields holding text, by language
+PHRASE_LANGUAGE_FIELDS = {"bikol": "bcl", "filipino": "fil", "english": "eng"}
+
+
+def pack_paths(base_path: str) -> tuple[str, str]:
+    """(blob path, index path) for a pack base path like '.../tts_pack'."""
+    return f"{base_path}.bin", f"{base_path}.index.json"
+
+
+# ============================================
+# Corpus
+# ============================================
+
+def phrase_entries(data) -> Iterator[dict]:
+    """Every dict in a knowledge-base file that has at least one language field."""
+    if isinstance(data, dict):
+        if any(isinstance(data.get(field), str) for field in PHRASE_LANGUAGE_FIELDS):
+            yield data
+        for value in data.values():
+            yield from phrase_entries(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from phrase_entries(item)
+
+
+def collect_pack_phrases(knowledge_base_dir: str, languages: tuple[str, ...] = ("bcl", "fil", "eng")) -> list[tuple[str, str]]:
+    """
+    Collect (text, language) pairs to pre-render:
+    - every bikol/filipino/english string in bikol-phrases/*.json, in its own language
+      (plus a Bikol suggestedResponse where present)
+    - facility names and addresses from facilities/naga-health-centers.json, in every language
+
+    Word-level translation_mappings.json is skipped. Duplicates are removed, order is stable.
+    """
+    pairs: list[tuple[str, str]] = []
+
+    phrases_dir = os.path.join(knowledge_base_dir, "bikol-phrases")
+    for filename in sorted(os.listdir(phrases_dir)):
+        if not filename.endswith(".json") or filename == "translation_mappings.json":
+            continue
+        with open(os.path.join(phrases_dir, filename), encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in phrase_entries(data):
+            for field, language in PHRASE_LANGUAGE_FIELDS.items():
+                if language in languages and isinstance(entry.get(field), str):
+                    pairs.append((entry[field], language))
+            if "bcl" in languages and isinstance(entry.get("suggestedResponse"), str):
+                pairs.append((entry["suggestedResponse"], "bcl"))
+
+    facilities_path = os.path.join(knowledge_base_dir, "facilities", "naga-health-centers.json")
+    if os.path.exists(facilities_path):
+        with open(facilities_path, encoding="utf-8") as f:
+            facilities = json.load(f).get("facilities", [])
+        for facility in facilities:
+            for field in ("name", "address"):
+                if facility.get(field):
+                    pairs.extend((facility[field], language) for language in languages)
+
+    seen: set[tuple[str, str]] = set()
+    unique = []
+    for text, language in pairs:
+        text = text.strip()
+        if text and (text, language) not in seen:
+            seen.add((text, language))
+            unique.append((text, language))
+    return unique
+
+
+# ============================================
+# Writer
+# ============================================
+
+class AudioPackWriter:
+    """Append clips to a new pack; files are swapped in atomically on close()."""
+
+    def __init__(self, base_path: str, audio_format: str, media_type: str, sample_rate: Optional[int], metadata: Optional[dict] = None):
+        self.base_path = base_path
+        self.blob_path, self.index_path = pack_paths(base_path)
+        self.header = {
+            "version": PACK_VERSION,
+            "format": audio_format,
+            "media_type": media_type,
+            "sample_rate": sample_rate,
+            **(metadata or {}),
+        }
+        self.entries: list[dict] = []
+        self._keys: set[str] = set()
+
+        os.makedirs(os.path.dirname(os.path.abspath(base_path)), exist_ok=True)
+        fd, self._tmp_blob = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(base_path)), suffix=".bin.tmp")
+        self._blob = os.fdopen(fd, "wb")
+        self._offset = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def add(self, key: str, text: str, language: str, audio: bytes) -> None:
+        if key in self._keys:
+            return
+        self._blob.write(audio)
+        self.entries.append({"key": key, "language": language, "text": text, "offset": self._offset, "length": len(audio)})
+        self._keys.add(key)
+        self._offset += len(audio)
+
+    def close(self) -> None:
+        self._blob.close()
+        index = {**self.header, "total_bytes": self._offset, "entries": self.entries}
+        tmp_index = f"{self.index_path}.tmp"
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+        # Blob first: a reader opening the new index must find the matching blob
+        os.replace(self._tmp_blob, self.blob_path)
+        os.replace(tmp_index, self.index_path)
+
+    def abort(self) -> None:
+        self._blob.close()
+        if os.path.exists(self._tmp_blob):
+            os.remove(self._tmp_blob)
+
+
+# ============================================
+# Reader
+# ============================================
+
+class AudioPack:
+    """Read-only, memory-mapped audio pack with an in-memory key -> (offset, length) index."""
+
+    def __init__(self, base_path: str, header: dict, offsets: dict[str, tuple[int, int]], blob: Optional[mmap.mmap]):
+        self.base_path = base_path
+        self.header = header
+        self._offsets = offsets
+        self._blob = blob
+        self.stats = {"hits": 0, "misses": 0}
+
+    @classmethod
+    def open(cls, base_path: str) -> "AudioPack":
+        blob_path, index_path = pack_paths(base_path)
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != PACK_VERSION:
+            raise ValueError(f"Unsupported audio pack version: {index.get('version')}")
+
+        entries = index.pop("entries")
+        offsets = {entry["key"]: (entry["offset"], entry["length"]) for entry in entries}
+
+        blob = None
+        if index.get("total_bytes", 0) > 0:
+            with open(blob_path, "rb") as f:
+                blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(blob) != index["total_bytes"]:
+                blob.close()
+                raise ValueError(f"Audio pack blob size mismatch: {blob_path}")
+
+        logger.info(f"Audio pack loaded: {base_path} ({len(offsets)} clips, {index.get('total_bytes', 0) / (1024 * 1024):.1f} MB)")
+        return cls(base_path, index, offsets, blob)
+
+    @classmethod
+    def open_if_exists(cls, base_path: str) -> Optional["AudioPack"]:
+        """Open a pack, or return None (logged) if it's missing or unreadable."""
+        if not base_path or not os.path.exists(pack_paths(base_path)[1]):
+            return None
+        try:
+            return cls.open(base_path)
+        except Exception as e:
+            logger.warning(f"Could not open audio pack {base_path}: {e}")
+            return None
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._offsets
+
+    def get(self, key: str) -> Optional[memoryview]:
+        """Zero-copy view of a clip, or None."""
+        location = self._offsets.get(key)
+        if location is None or self._blob is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        offset, length = location
+        return memoryview(self._blob)[offset:offset + length]
+
+    def snapshot(self) -> dict:
+        """Pack info and counters for /health."""
+        return {
+            **self.stats,
+            "path": self.base_path,
+            "clips": len(self._offsets),
+            "format": self.header.get("format"),
+            "sample_rate": self.header.get("sample_rate"),
+            "revision": self.header.get("revision"),
+            "engine": self.header.get("engine"),
+            "total_bytes": self.header.get("total_bytes", 0),
+        }
+
+    def close(self) -> None:
+        if self._blob is not None:
+            try:
+                self._blob.close()
+            except BufferError:
+                # A response still holds a view; the mapping goes away with the process
+                pass
@@ -0,0 +1,271 @@
+"""
+Async Google Translate Client
+=============================
+
+Google Translate v2 calls made from the event loop instead of a translation
+worker thread:
+- One httpx.AsyncClient per process with a bounded keep-alive connection pool
+- A deadline per call (a hung request fails the caller, it never holds a worker)
+- Concurrent calls for the same language pair arriving within window_ms are
+  coalesced into one request (repeated q, split at max_segments strings /
+  max_chars characters)
+- A circuit breaker: after failure_threshold consecutive failed requests calls
+  fail fast with CircuitOpenError (callers go straight to NLLB) until
+  reset_timeout_s has passed and a probe request succeeds
+
+Usage:
+    from google_translate import CircuitBreaker, GoogleTranslateClient
+
+    client = GoogleTranslateClient(api_key, timeout_s=10, breaker=CircuitBreaker(5, 30))
+    translations = await client.translate(["Good morning", "Thank you"], "en", "tl")
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+import httpx
+
+from translation_batching import request_chunks
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_URL = "https://translation.googleapis.com/language/translate/v2"
+
+
+class GoogleTranslateError(RuntimeError):
+    """A Google Translate call failed (HTTP error, bad response or deadline)."""
+
+
+class GoogleTranslateTimeout(GoogleTranslateError):
+    """No response within the call's deadline."""
+
+
+class CircuitOpenError(GoogleTranslateError):
+    """Google Translate is considered unhealthy; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """
+    closed -> open after failure_threshold consecutive failures; open -> half_open
+    (a single probe call) after reset_timeout_s; the probe's outcome closes or reopens it.
+    Used from one event loop, so it needs no lock.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout_s = reset_timeout_s
+        self._clock = clock
+
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+        self.stats = {"opened": 0, "short_circuited": 0}
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (counts the ones that may not)."""
+        if self.state == "open" and self._clock() - self.opened_at >= self.reset_timeout_s:
+            self.state, self._probing = "half_open", False
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.stats["short_circuited"] += 1
+        return False
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info("Google Translate circuit closed")
+        self.state, self.failures, self._probing = "closed", 0, False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+            logger.warning(f"Google Translate circuit open for {self.reset_timeout_s:.0f}s after {self.failures} failure(s)")
+            self.state, self.opened_at, self._probing = "open", self._clock(), False
+            self.stats["opened"] += 1
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "state": self.state, "consecutive_failures": self.failures}
+
+
+@dataclass
+class _PendingCall:
+    texts: list[str]
+    future: asyncio.Future
+    deadline: float  # event loop time
+
+
+class GoogleTranslateClient:
+    """Coalescing, deadline-bound Google Translate v2 client behind a circuit breaker."""
+
+    def __init__(
+        self,
+        api_key: str,
+        url: str = DEFAULT_URL,
+        timeout_s: float = 10.0,
+        max_connections: int = 4,
+        window_ms: float = 5.0,
+        max_segments: int = 128,
+        max_chars: int = 5000,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Args:
+            api_key: Google Cloud API key
+            url: Translate v2 endpoint
+            timeout_s: Default deadline per call, including time spent waiting to be coalesced
+            max_connections: Keep-alive connections to Google
+            window_ms: How long to wait for concurrent calls to coalesce with the first one
+            max_segments: Most strings per request
+            max_chars: Most characters per request
+            breaker: Circuit breaker (default: open after 5 failures for 30 s)
+        """
+        self.api_key = api_key
+        self.url = url
+        self.timeout_s = timeout_s
+        self.max_connections = max(max_connections, 1)
+        self.window_s = max(window_ms, 0.0) / 1000.0
+        self.max_segments = max(max_segments, 1)
+        self.max_chars = max_chars
+        self.breaker = breaker or CircuitBreaker()
+
+        # (source, target) -> calls waiting for the window to close
+        self._queues: dict[tuple[str, str], list[_PendingCall]] = {}
+        self._timers: dict[tuple[str, str], asyncio.TimerHandle] = {}
+        self._sending: set[asyncio.Task] = set()
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_owner: tuple = ()
+
+        self.stats = {"calls": 0, "texts": 0, "requests": 0, "coalesced_calls": 0, "failures": 0, "deadline_exceeded": 0}
+
+    async def translate(self, texts: Sequence[str], source: str, target: str, timeout_s: Optional[float] = None) -> list[str]:
+        """
+        Translations of texts (Google language codes), in order. Raises CircuitOpenError
+        without calling Google while the circuit is open, GoogleTranslateTimeout after
+        the deadline, GoogleTranslateError on a failed request.
+        """
+        if not texts:
+            return []
+        if not self.breaker.allow():
+            raise CircuitOpenError("Google Translate circuit open")
+
+        loop = asyncio.get_running_loop()
+        timeout = self.timeout_s if timeout_s is None else timeout_s
+        call = _PendingCall(texts=list(texts), future=loop.create_future(), deadline=loop.time() + timeout)
+        # A caller past its deadline no longer reads the outcome
+        call.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.stats["calls"] += 1
+        self.stats["texts"] += len(call.texts)
+
+        key = (source, target)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = []
+            self._timers[key] = loop.call_later(self.window_s, self._send_queued, key)
+        queue.append(call)
+        if sum(len(pending.texts) for pending in queue) >= self.max_segments:
+            self._timers.pop(key).cancel()
+            self._send_queued(key)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(call.future), timeout)
+        except asyncio.TimeoutError:
+            self.stats["deadline_exceeded"] += 1
+            raise GoogleTranslateTimeout(f"No Google Translate response within {timeout:.1f}s") from None
+
+    def snapshot(self) -> dict:
+        """Counters for /health."""
+        return {
+            **self.stats,
+            "circuit": self.breaker.snapshot(),
+            "queued_calls": sum(len(queue) for queue in self._queues.values()),
+            "window_ms": self.window_s * 1000.0,
+            "max_connections": self.max_connections,
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ----------------------------------------
+    # Internals
+    # ----------------------------------------
+
+    def _send_queued(self, key: tuple[str, str]) -> None:
+        """Take every call queued for the pair and send them as one batch."""
+        self._timers.pop(key, None)
+        calls = self._queues.pop(key, None)
+        if calls:
+            task = asyncio.get_running_loop().create_task(self._send(key, calls))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, key: tuple[str, str], calls: list[_PendingCall]) -> None:
+        if len(calls) > 1:
+            self.stats["coalesced_calls"] += len(calls)
+
+        # Each distinct string once, in as few requests as the limits allow, given up at the
+        # earliest caller deadline (so a hung Google counts against the breaker right away)
+        unique = list(dict.fromkeys(text for call in calls for text in call.texts))
+        timeout = max(min(call.deadline for call in calls) - asyncio.get_running_loop().time(), 0.001)
+        try:
+            chunks = request_chunks(unique, self.max_segments, self.max_chars)
+            parts = await asyncio.gather(*(self._request([unique[i] for i in chunk], *key, timeout) for chunk in chunks))
+        except Exception as e:
+            for call in calls:
+                if not call.future.done():
+                    call.future.set_exception(e)
+            return
+
+        translated = dict(zip(unique, (text for part in parts for text in part)))
+        for call in calls:
+            if not call.future.done():
+                call.future.set_result([translated[text] for text in call.texts])
+
+    async def _request(self, texts: list[str], source: str, target: str, timeout_s: float) -> list[str]:
+        self.stats["requests"] += 1
+        try:
+            response = await self._http().post(self.url, timeout=timeout_s, data={
+                "key": self.api_key,
+                "q": texts,  # sent as repeated q fields
+                "source": source,
+                "target": target,
+                "format": "text",
+            })
+            response.raise_for_status()
+
+            # Translations come back in the order of the q fields
+            translations = response.json()["data"]["translations"]
+            if len(translations) != len(texts):
+                raise GoogleTranslateError(f"{len(translations)} translations for {len(texts)} strings")
+            result = [item["translatedText"] for item in translations]
+        except Exception as e:
+            self.stats["failures"] += 1
+            self.breaker.record_failure()
+            if isinstance(e, GoogleTranslateError):
+                raise
+            raise GoogleTranslateError(f"Google Translate request failed: {e!r}") from e
+
+        self.breaker.record_success()
+        return result
+
+    def _http(self) -> httpx.AsyncClient:
+        # Connections belong to one event loop and must not cross fork()
+        owner = (os.getpid(), asyncio.get_running_loop())
+        if self._client is None or self._client_owner != owner:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_s,
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            )
+            self._client_owner = owner
+        return self._client
@@ -0,0 +1,224 @@
+"""
+Inference Backends
+==================
+
+Runs the AI service models on one of three backends, chosen per model family:
+- eager:       transformers PyTorch modules (default)
+- torchscript: a traced + frozen TorchScript graph (no Python module overhead)
+- onnx:        an exported ONNX graph in ONNX Runtime (needs onnx + onnxruntime)
+
+Each family is exported as a plain tensors-in/tensors-out graph:
+- tts:       VITS (input_ids, attention_mask) -> (waveform, lengths), one graph per voice
+- stt:       Wav2Vec2ForCTC (input_values, attention_mask) -> logits, one graph per language adapter
+- translate: the NLLB encoder (input_ids, attention_mask) -> last_hidden_state;
+             autoregressive decoding stays in transformers' generate()
+
+Usage:
+    from inference_backends import GraphRunner, export_graph
+
+    export_graph("tts", vits_model, example_inputs, "onnx", "exported/tts-bcl.onnx")
+    runner = GraphRunner.load("tts", "exported/tts-bcl.onnx", "onnx", config=vits_model.config)
+    waveform, lengths = runner(input_ids=ids, attention_mask=mask)
+
+Export and parity-check with scripts/export_models.py.
+"""
+
+import os
+import logging
+from typing import Any, Optional
+
+import torch
+
+from model_precision import model_dtype
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("eager", "torchscript", "onnx")
+DEFAULT_BACKEND = "eager"
+
+EXPORT_SUFFIXES = {"torchscript": ".pt", "onnx": ".onnx"}
+
+ONNX_OPSET = 17
+
+
+def backend_from_env(var: str, default: str = DEFAULT_BACKEND) -> str:
+    """Read a backend name from an env var (e.g. TTS_BACKEND=onnx)."""
+    backend = os.environ.get(var, default).strip().lower()
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown backend {var}={backend!r}, using {default}. Supported: {list(BACKENDS)}")
+        return default
+    return backend
+
+
+def export_path(export_dir: str, name: str, backend: str) -> str:
+    """File an exported graph lives in, e.g. exported/tts-bcl.onnx."""
+    return os.path.join(export_dir, name + EXPORT_SUFFIXES[backend])
+
+
+# ============================================
+# Exportable graphs (tensor-only wrappers around the transformers models)
+# ============================================
+
+class VitsGraph(torch.nn.Module):
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor):
+        output = self.model(input_ids=input_ids, attention_mask=attention_mask)
+        return output.waveform, output.sequence_lengths
+
+
+class CTCGraph(torch.nn.Module):
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_values: torch.Tensor, attention_mask: torch.Tensor):
+        return self.model(input_values=input_values, attention_mask=attention_mask).logits
+
+
+class EncoderGraph(torch.nn.Module):
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.encoder = model.get_encoder()
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor):
+        return self.encoder(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+
+# family -> (wrapper, input names, output names, dynamic axes)
+GRAPH_SPECS = {
+    "tts": (
+        VitsGraph,
+        ["input_ids", "attention_mask"],
+        ["waveform", "lengths"],
+        {
+            "input_ids": {0: "batch", 1: "tokens"},
+            "attention_mask": {0: "batch", 1: "tokens"},
+            "waveform": {0: "batch", 1: "samples"},
+            "lengths": {0: "batch"},
+        },
+    ),
+    "stt": (
+        CTCGraph,
+        ["input_values", "attention_mask"],
+        ["logits"],
+        {
+            "input_values": {0: "batch", 1: "samples"},
+            "attention_mask": {0: "batch", 1: "samples"},
+            "logits": {0: "batch", 1: "frames"},
+        },
+    ),
+    "translate": (
+        EncoderGraph,
+        ["input_ids", "attention_mask"],
+        ["last_hidden_state"],
+        {
+            "input_ids": {0: "batch", 1: "tokens"},
+            "attention_mask": {0: "batch", 1: "tokens"},
+            "last_hidden_state": {0: "batch", 1: "tokens"},
+        },
+    ),
+}
+
+
+def export_graph(family: str, model: torch.nn.Module, example_inputs: dict, backend: str, path: str) -> str:
+    """Trace (torchscript) or export (onnx) a model's graph for one family and save it to path."""
+    if backend not in EXPORT_SUFFIXES:
+        raise ValueError(f"Nothing to export for backend: {backend}")
+    wrapper_cls, input_names, output_names, dynamic_axes = GRAPH_SPECS[family]
+    wrapper = wrapper_cls(model).eval()
+    args = tuple(example_inputs[name] for name in input_names)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with torch.no_grad():
+        if backend == "torchscript":
+            traced = torch.jit.trace(wrapper, args, check_trace=False)
+            torch.jit.save(torch.jit.freeze(traced), path)
+        else:
+            torch.onnx.export(
+                wrapper, args, path,
+                input_names=input_names,
+                output_names=output_names,
+                dynamic_axes=dynamic_axes,
+                opset_version=ONNX_OPSET,
+                dynamo=False,
+            )
+    logger.info(f"Exported {family} graph ({backend}): {path}")
+    return path
+
+
+# ============================================
+# Runtime
+# ============================================
+
+class GraphRunner:
+    """
+    Runs one family's graph on any backend with the same call signature:
+    runner(**tensors) -> tuple of output tensors (in GRAPH_SPECS order).
+    """
+
+    def __init__(self, family: str, backend: str, module: Optional[torch.nn.Module] = None,
+                 session: Any = None, config: Any = None, estimated_bytes: int = 0,
+                 device: torch.device = torch.device("cpu"), dtype: torch.dtype = torch.float32):
+        _, self.input_names, self.output_names, _ = GRAPH_SPECS[family]
+        self.family = family
+        self.backend = backend
+        self.module = module
+        self.session = session
+        self.config = config
+        # Where inputs must live and which float dtype they need (exported graphs are CPU fp32)
+        self.device = device
+        self.dtype = dtype
+        # Lets the model registry account for graphs whose weights aren't nn.Parameters
+        self.estimated_bytes = estimated_bytes
+
+    @classmethod
+    def eager(cls, family: str, model: torch.nn.Module) -> "GraphRunner":
+        """Wrap a loaded transformers model (no export)."""
+        wrapper_cls = GRAPH_SPECS[family][0]
+        device = next(model.parameters()).device
+        return cls(
+            family, "eager", module=wrapper_cls(model).eval(), config=getattr(model, "config", None),
+            device=device, dtype=model_dtype(model),
+        )
+
+    @classmethod
+    def load(cls, family: str, path: str, backend: str, config: Any = None, threads: int = 0) -> "GraphRunner":
+        """Load an exported graph written by export_graph()."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No exported {family} graph at {path} (run scripts/export_models.py)")
+        size = os.path.getsize(path)
+
+        if backend == "torchscript":
+            module = torch.jit.load(path, map_location="cpu").eval()
+            return cls(family, backend, module=module, config=config, estimated_bytes=size)
+
+        if backend == "onnx":
+            import onnxruntime as ort
+
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if threads:
+                options.intra_op_num_threads = threads
+            session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+            return cls(family, backend, session=session, config=config, estimated_bytes=size)
+
+        raise ValueError(f"Unsupported backend: {backend}. Supported: {list(BACKENDS)}")
+
+    def __call__(self, **inputs: torch.Tensor) -> tuple:
+        if self.session is not None:
+            feeds = {name: inputs[name].cpu().numpy() for name in self.input_names}
+            return tuple(torch.from_numpy(output) for output in self.session.run(self.output_names, feeds))
+
+        with torch.no_grad():
+            outputs = self.module(*(inputs[name] for name in self.input_names))
+        return outputs if isinstance(outputs, tuple) else (outputs,)
+
+
+def max_abs_diff(reference: torch.Tensor, candidate: torch.Tensor) -> float:
+    """Largest element-wise difference (inf if the shapes differ)."""
+    if reference.shape != candidate.shape:
+        return float("inf")
+    return (reference.float() - candidate.float()).abs().max().item()
@@ -0,0 +1,179 @@
+"""
+Bounded Inference Pools
+=======================
+
+Runs blocking torch inference off the asyncio event loop, one bounded
+executor per model family (TTS, STT, translation), with an admission limit
+so overload fails fast instead of piling up requests behind a slow model.
+
+Usage:
+    from inference_pool import InferencePool, PoolFullError
+
+    stt_pool = InferencePool("stt", max_workers=1, max_queue=4)
+
+    try:
+        text = await stt_pool.submit(speech_to_text, audio_bytes, "bcl")
+    except PoolFullError as e:
+        ...  # respond 503 with Retry-After: e.retry_after
+"""
+
+import math
+import time
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# Number of recent samples kept for wait/run time percentiles
+TIMING_WINDOW = 512
+
+
+class PoolFullError(Exception):
+    """Raised when a pool's admission queue is full."""
+
+    def __init__(self, pool_name: str, retry_after: int):
+        super().__init__(f"{pool_name} inference queue is full, retry in {retry_after}s")
+        self.pool_name = pool_name
+        self.retry_after = retry_after
+
+
+def _summarize(samples: deque) -> dict:
+    """avg/p50/p95/max in milliseconds for a window of durations in seconds."""
+    if not samples:
+        return {"count": 0, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        "count": n,
+        "avg_ms": round(sum(ordered) / n * 1000, 2),
+        "p50_ms": round(ordered[n // 2] * 1000, 2),
+        "p95_ms": round(ordered[min(n - 1, int(n * 0.95))] * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+class InferencePool:
+    """Bounded thread pool plus admission control for one model family."""
+
+    def __init__(self, name: str, max_workers: int = 1, max_queue: int = 8, min_retry_after: int = 1,
+                 on_wait: Optional[Callable[[float], None]] = None,
+                 call_wrapper: Optional[Callable[[Callable], Callable]] = None):
+        """
+        Args:
+            name: Family name used in errors and metrics (e.g. "tts")
+            max_workers: Threads running inference concurrently
+            max_queue: Requests allowed to wait for a worker before new ones are rejected
+            min_retry_after: Lower bound for the Retry-After hint in seconds
+            on_wait: Called on the worker with the seconds a call waited for it (e.g. for metrics)
+            call_wrapper: Maps each fn to the callable actually run (e.g. to profile it)
+        """
+        self.name = name
+        self.max_workers = max(max_workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self.min_retry_after = min_retry_after
+        self.on_wait = on_wait
+        self.call_wrapper = call_wrapper
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-infer")
+        self._admitted = 0  # only touched from the event loop thread
+        self._running = 0
+        self._lock = threading.Lock()
+        self._wait_times: deque = deque(maxlen=TIMING_WINDOW)
+        self._run_times: deque = deque(maxlen=TIMING_WINDOW)
+
+        self.stats = {"admitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    # ----------------------------------------
+    # Admission
+    # ----------------------------------------
+
+    def retry_after_seconds(self) -> int:
+        """Estimate how long until a slot frees up, from recent run times."""
+        with self._lock:
+            recent = list(self._run_times)[-32:]
+        avg_run = sum(recent) / len(recent) if recent else 1.0
+        backlog = max(self._admitted - self.max_workers, 0) + 1
+        return max(self.min_retry_after, math.ceil(avg_run * backlog / self.max_workers))
+
+    def ensure_capacity(self) -> None:
+        """Raise PoolFullError if a new request would exceed the admission limit."""
+        if self._admitted >= self.capacity:
+            self.stats["rejected"] += 1
+            raise PoolFullError(self.name, self.retry_after_seconds())
+
+    @contextmanager
+    def admission(self):
+        """Hold one admission slot for the duration of a request."""
+        self.ensure_capacity()
+        self._admitted += 1
+        self.stats["admitted"] += 1
+        try:
+            yield
+        finally:
+            self._admitted -= 1
+
+    # ----------------------------------------
+    # Execution
+    # ----------------------------------------
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run fn on this pool's executor (no admission check) and record wait/run time.
+        fn sees the caller's context variables (e.g. metric labels).
+        """
+        loop = asyncio.get_running_loop()
+        submitted_at = time.monotonic()
+        if self.call_wrapper is not None:
+            fn = self.call_wrapper(fn)
+
+        def timed_call():
+            started_at = time.monotonic()
+            with self._lock:
+                self._running += 1
+                self._wait_times.append(started_at - submitted_at)
+            if self.on_wait is not None:
+                self.on_wait(started_at - submitted_at)
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._run_times.append(time.monotonic() - started_at)
+                    self.stats["completed" if ok else "failed"] += 1
+
+        return await loop.run_in_executor(self._executor, contextvars.copy_context().run, timed_call)
+
+    async def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Admit one request and run fn on the pool, failing fast if the queue is full."""
+        with self.admission():
+            return await self.run(fn, *args, **kwargs)
+
+    def snapshot(self) -> dict:
+        """Queue depth, utilization and timing for /health."""
+        with self._lock:
+            running = self._running
+            wait = _summarize(self._wait_times)
+            run = _summarize(self._run_times)
+            stats = dict(self.stats)
+        return {
+            **stats,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queue_depth": max(self._admitted - running, 0),
+            "wait_time": wait,
+            "run_time": run,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
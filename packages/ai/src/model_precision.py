@@ -0,0 +1,106 @@
+"""
+Model Precision Modes
+=====================
+
+Load-time precision for the AI service models on CPU-only instances:
+- fp32: weights as published (default)
+- int8: dynamic int8 quantization of nn.Linear layers (weights stored as int8,
+        activations quantized on the fly); CPU only
+- bf16: weights cast to bfloat16; needs a CPU with native bf16 (AVX512-BF16/AMX)
+        or a CUDA GPU to actually be faster
+
+Unsupported combinations fall back to fp32 with a warning, so a bad env value
+never stops the service from starting.
+
+Usage:
+    from model_precision import apply_precision, match_model_dtype
+
+    model, mode = apply_precision(model, "int8", device="cpu")
+    inputs = match_model_dtype(inputs, model)
+"""
+
+import os
+import logging
+from typing import Any
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+PRECISION_MODES = ("fp32", "int8", "bf16")
+DEFAULT_PRECISION = "fp32"
+
+
+def precision_from_env(var: str, default: str = DEFAULT_PRECISION) -> str:
+    """Read a precision mode from an env var (e.g. STT_PRECISION=int8)."""
+    mode = os.environ.get(var, default).strip().lower()
+    if mode not in PRECISION_MODES:
+        logger.warning(f"Unknown precision {var}={mode!r}, using {default}. Supported: {list(PRECISION_MODES)}")
+        return default
+    return mode
+
+
+def resolve_precision(mode: str, device: str) -> str:
+    """Map a requested mode to one that works on this device."""
+    if mode not in PRECISION_MODES:
+        raise ValueError(f"Unsupported precision: {mode}. Supported: {list(PRECISION_MODES)}")
+    if mode == "int8" and device != "cpu":
+        logger.warning(f"Dynamic int8 quantization is CPU-only, using fp32 on {device}")
+        return "fp32"
+    if mode == "bf16" and device == "cpu" and not torch.backends.mkldnn.is_available():
+        logger.warning("bf16 needs oneDNN on CPU, using fp32")
+        return "fp32"
+    return mode
+
+
+def apply_precision(
+    model: torch.nn.Module,
+    mode: str,
+    device: str = "cpu",
+    keep_float: tuple[str, ...] = (),
+) -> tuple[torch.nn.Module, str]:
+    """
+    Convert a loaded (eval-mode) model to the requested precision.
+
+    Args:
+        model: Loaded model
+        mode: One of PRECISION_MODES
+        device: Device the model lives on
+        keep_float: int8 only - Linear layers whose qualified name contains any of these
+            substrings stay in float (e.g. MMS adapters, which are swapped at runtime)
+
+    Returns:
+        (converted model, effective mode actually applied)
+    """
+    mode = resolve_precision(mode, device)
+    if mode == "int8":
+        qconfig_spec = {
+            name: torch.ao.quantization.default_dynamic_qconfig
+            for name, module in model.named_modules()
+            if isinstance(module, torch.nn.Linear) and not any(part in name for part in keep_float)
+        }
+        model = torch.ao.quantization.quantize_dynamic(model, qconfig_spec, dtype=torch.qint8)
+    elif mode == "bf16":
+        model = model.to(torch.bfloat16)
+    return model, mode
+
+
+def model_dtype(model: Any) -> torch.dtype:
+    """Floating dtype of the model's (non-quantized) parameters, or of an inference backend's inputs."""
+    if not isinstance(model, torch.nn.Module):
+        return getattr(model, "dtype", torch.float32)
+    for param in model.parameters():
+        if param.is_floating_point():
+            return param.dtype
+    return torch.float32
+
+
+def match_model_dtype(inputs: Any, model: Any) -> Any:
+    """Cast floating input tensors (e.g. STT input_values) to the model's dtype; ids are left alone."""
+    dtype = model_dtype(model)
+    if dtype == torch.float32:
+        return inputs
+    return {
+        key: value.to(dtype) if torch.is_tensor(value) and value.is_floating_point() else value
+        for key, value in inputs.items()
+    }
@@ -0,0 +1,329 @@
+"""
+Model Residency Registry
+========================
+
+Single place where the AI services keep loaded models. Tracks the
+approximate resident bytes of every model and keeps the total under a
+memory budget by evicting least-recently-used, idle models. Loads are
+single-flight (concurrent first requests share one load) and every use
+is refcounted, so a model is never evicted in the middle of inference.
+
+Usage:
+    from model_registry import ModelRegistry
+
+    registry = ModelRegistry.from_env()
+
+    with registry.use("facebook/mms-tts-bcl", lambda: load_vits("bcl")) as (model, tokenizer):
+        ...
+"""
+
+import gc
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Any]
+
+
+def iter_modules(value: Any) -> Iterator[Any]:
+    """Yield the torch modules held by a loaded model value (a module, or a tuple/list/dict/object holding modules)."""
+    import torch
+
+    if isinstance(value, torch.nn.Module):
+        yield value
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            yield from iter_modules(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_modules(item)
+    elif hasattr(value, "__dict__") and not isinstance(value, type):
+        for item in vars(value).values():
+            if isinstance(item, torch.nn.Module):
+                yield item
+
+
+def estimate_model_bytes(value: Any) -> int:
+    """
+    Approximate resident size of a loaded model: parameters + buffers of every
+    torch module found in `value` (a module, or a tuple/list/dict/object holding modules).
+    Tokenizers and processors are small and not counted.
+    """
+    import torch
+
+    seen: set[int] = set()
+
+    def module_bytes(module: "torch.nn.Module") -> int:
+        tensors = list(module.parameters()) + list(module.buffers())
+        # Dynamically quantized Linear layers keep their int8 weights in packed params
+        for submodule in module.modules():
+            if hasattr(submodule, "_weight_bias"):
+                tensors.extend(t for t in submodule._weight_bias() if t is not None)
+
+        total = 0
+        for tensor in tensors:
+            if id(tensor) in seen:
+                continue
+            seen.add(id(tensor))
+            total += tensor.numel() * tensor.element_size()
+        return total
+
+    # Exported graphs (TorchScript constants, ONNX sessions) report their own size
+    holders = value if isinstance(value, (tuple, list)) else [value]
+    extra = sum(getattr(item, "estimated_bytes", 0) for item in holders)
+
+    return sum(module_bytes(module) for module in iter_modules(value)) + extra
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size_bytes: int
+    refcount: int = 0
+    loaded_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    load_seconds: float = 0.0
+
+
+class ModelRegistry:
+    """Memory-budgeted LRU + idle-time residency manager for models."""
+
+    def __init__(self, memory_budget_bytes: int = 0, idle_timeout_s: float = 0.0,
+                 on_load: Optional[Callable[[str, float], None]] = None):
+        """
+        Args:
+            memory_budget_bytes: Max total resident model bytes (0 = unlimited)
+            idle_timeout_s: Evict models unused for this long (0 = never)
+            on_load: Called with (key, load seconds) after every load (e.g. for metrics)
+        """
+        self.memory_budget_bytes = memory_budget_bytes
+        self.idle_timeout_s = idle_timeout_s
+        self.on_load = on_load
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._loading: dict[str, threading.Event] = {}
+        self._known_sizes: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {"loads": 0, "hits": 0, "coalesced_loads": 0, "evictions": 0, "idle_evictions": 0}
+
+    @classmethod
+    def from_env(cls, on_load: Optional[Callable[[str, float], None]] = None) -> "ModelRegistry":
+        """Build a registry from MODEL_MEMORY_BUDGET_MB and MODEL_IDLE_TIMEOUT_S."""
+        budget_mb = float(os.environ.get("MODEL_MEMORY_BUDGET_MB", "0"))
+        idle_timeout = float(os.environ.get("MODEL_IDLE_TIMEOUT_S", "0"))
+        return cls(memory_budget_bytes=int(budget_mb * 1024 * 1024), idle_timeout_s=idle_timeout, on_load=on_load)
+
+    # ----------------------------------------
+    # Public API
+    # ----------------------------------------
+
+    def acquire(self, key: str, loader: Loader) -> Any:
+        """Return the model for `key`, loading it at most once, and take a reference."""
+        self.evict_idle()
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    entry.last_used = time.monotonic()
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry.value
+
+                pending = self._loading.get(key)
+                if pending is None:
+                    pending = threading.Event()
+                    self._loading[key] = pending
+                    break
+                self.stats["coalesced_loads"] += 1
+
+            # Another thread is loading this model; wait and re-check
+            # (if that load failed we fall through and try ourselves).
+            pending.wait()
+
+        try:
+            return self._load(key, loader)
+        finally:
+            with self._lock:
+                self._loading.pop(key).set()
+
+    def release(self, key: str) -> None:
+        """Drop a reference taken by acquire()."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.refcount > 0:
+                entry.refcount -= 1
+                entry.last_used = time.monotonic()
+
+    @contextmanager
+    def use(self, key: str, loader: Loader) -> Iterator[Any]:
+        """Hold a model for the duration of a block (it can't be evicted meanwhile)."""
+        value = self.acquire(key, loader)
+        try:
+            yield value
+        finally:
+            self.release(key)
+
+    def get(self, key: str, loader: Loader) -> Any:
+        """Load/touch a model without holding a reference (e.g. for preloading)."""
+        value = self.acquire(key, loader)
+        self.release(key)
+        return value
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Return a resident model without loading or touching LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.value if entry is not None else None
+
+    def is_loaded(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def loaded_keys(self) -> list[str]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def modules(self) -> list:
+        """Torch modules of every resident model (e.g. to freeze them before forking workers)."""
+        with self._lock:
+            values = [entry.value for entry in self._entries.values()]
+        return [module for value in values for module in iter_modules(value)]
+
+    def evict(self, key: str) -> bool:
+        """Evict one model if it is not in use."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount > 0:
+                return False
+            self._drop(key)
+            self.stats["evictions"] += 1
+        self._free_memory()
+        return True
+
+    def evict_idle(self) -> int:
+        """Evict models unused for longer than idle_timeout_s."""
+        if self.idle_timeout_s <= 0:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                key for key, entry in self._entries.items()
+                if entry.refcount == 0 and now - entry.last_used > self.idle_timeout_s
+            ]
+            for key in idle:
+                logger.info(f"Evicting idle model: {key}")
+                self._drop(key)
+            self.stats["idle_evictions"] += len(idle)
+        if idle:
+            self._free_memory()
+        return len(idle)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        self._free_memory()
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def snapshot(self) -> dict:
+        """Resident models and counters for /health."""
+        now = time.monotonic()
+        with self._lock:
+            models = {
+                key: {
+                    "size_mb": round(entry.size_bytes / (1024 * 1024), 1),
+                    "refcount": entry.refcount,
+                    "idle_s": round(now - entry.last_used, 1),
+                    "load_s": round(entry.load_seconds, 2),
+                }
+                for key, entry in self._entries.items()
+            }
+            resident = sum(entry.size_bytes for entry in self._entries.values())
+            stats = dict(self.stats)
+        return {
+            **stats,
+            "resident_mb": round(resident / (1024 * 1024), 1),
+            "budget_mb": round(self.memory_budget_bytes / (1024 * 1024), 1) if self.memory_budget_bytes else None,
+            "idle_timeout_s": self.idle_timeout_s or None,
+            "models": models,
+        }
+
+    # ----------------------------------------
+    # Internals
+    # ----------------------------------------
+
+    def _load(self, key: str, loader: Loader) -> Any:
+        # Make room up front using the size seen last time, to avoid a transient peak
+        size_hint = self._known_sizes.get(key, 0)
+        if size_hint:
+            self._make_room(size_hint)
+
+        started = time.monotonic()
+        value = loader()
+        load_seconds = time.monotonic() - started
+        size = estimate_model_bytes(value)
+
+        self._make_room(size)
+        with self._lock:
+            self._known_sizes[key] = size
+            self._entries[key] = _Entry(value=value, size_bytes=size, refcount=1, load_seconds=load_seconds)
+            self.stats["loads"] += 1
+            resident = sum(entry.size_bytes for entry in self._entries.values())
+
+        logger.info(
+            f"Model resident: {key} ({size / (1024 * 1024):.0f} MB, loaded in {load_seconds:.1f}s, "
+            f"total {resident / (1024 * 1024):.0f} MB)"
+        )
+        if self.on_load is not None:
+            self.on_load(key, load_seconds)
+        if self.memory_budget_bytes and resident > self.memory_budget_bytes:
+            logger.warning(f"Model memory budget exceeded ({resident} > {self.memory_budget_bytes} bytes): all other models are in use")
+        return value
+
+    def _make_room(self, incoming_bytes: int) -> None:
+        """Evict LRU models with no references until incoming_bytes fits the budget."""
+        if not self.memory_budget_bytes:
+            return
+        evicted = False
+        with self._lock:
+            resident = sum(entry.size_bytes for entry in self._entries.values())
+            for key in list(self._entries.keys()):
+                if resident + incoming_bytes <= self.memory_budget_bytes:
+                    break
+                entry = self._entries[key]
+                if entry.refcount > 0:
+                    continue
+                logger.info(f"Evicting model to fit memory budget: {key}")
+                resident -= entry.size_bytes
+                self._drop(key)
+                self.stats["evictions"] += 1
+                evicted = True
+        if evicted:
+            self._free_memory()
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry (caller holds self._lock)."""
+        self._entries.pop(key, None)
+
+    @staticmethod
+    def _free_memory() -> None:
+        gc.collect()
+        try:
+            import torch
+
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
@@ -0,0 +1,153 @@
+"""
+Background Model Warm-up
+========================
+
+Loads the startup models concurrently after the service is already accepting
+connections, and runs one dummy inference on each so the first real request
+doesn't pay for kernel selection, allocator growth and lazy initialization.
+
+Every task goes pending -> loading -> warming -> ready. A required task that
+fails is retried with exponential backoff (state "retrying") and marked
+"failed" once it has used max_attempts; optional tasks aren't retried. The
+service is ready once every required task is ready. Liveness doesn't wait
+for any of it, but fails once a required task has given up, so the platform
+restarts the instance instead of leaving it unready forever.
+
+Usage:
+    from model_warmup import ModelWarmup, WarmupTask
+
+    warmup = ModelWarmup([
+        WarmupTask("tts:bcl", load=partial(load_tts_model, "bcl"), warm=partial(warm_tts, "bcl"), pool=tts_pool),
+    ])
+    asyncio.create_task(warmup.run())
+    warmup.ready        # False until tts:bcl has loaded and run once
+    warmup.healthy      # False once a required task has failed for good
+    warmup.snapshot()   # per-task state, timings and errors
+"""
+
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from inference_pool import InferencePool
+
+logger = logging.getLogger(__name__)
+
+STATES = ("pending", "loading", "warming", "retrying", "ready", "failed")
+
+
+@dataclass
+class WarmupTask:
+    name: str
+    load: Callable[[], Any]
+    # Dummy inference after the load (None: nothing to warm)
+    warm: Optional[Callable[[], Any]] = None
+    # Pool whose workers run load and warm-up (None: the default executor)
+    pool: Optional[InferencePool] = None
+    # Whether readiness waits for it
+    required: bool = True
+
+    state: str = field(default="pending", init=False)
+    load_s: Optional[float] = field(default=None, init=False)
+    warm_s: Optional[float] = field(default=None, init=False)
+    error: Optional[str] = field(default=None, init=False)
+    attempts: int = field(default=0, init=False)
+
+
+class ModelWarmup:
+    """Runs warm-up tasks concurrently and tracks their state for readiness."""
+
+    def __init__(self, tasks: list[WarmupTask], max_attempts: int = 5, backoff_s: float = 5.0, max_backoff_s: float = 300.0):
+        """
+        Args:
+            tasks: Startup work
+            max_attempts: Tries per required task before it is marked failed
+            backoff_s: Wait before the first retry, doubled for every further one
+            max_backoff_s: Longest wait between retries
+        """
+        self.tasks = {task.name: task for task in tasks}
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return all(task.state == "ready" for task in self.tasks.values() if task.required)
+
+    @property
+    def healthy(self) -> bool:
+        return not any(task.state == "failed" for task in self.tasks.values() if task.required)
+
+    async def run(self) -> None:
+        """Run every task at once (each pool bounds its own concurrency)."""
+        self.started_at = time.monotonic()
+        await asyncio.gather(*(self._run_task(task) for task in self.tasks.values()))
+        self.finished_at = time.monotonic()
+
+        failed = [task.name for task in self.tasks.values() if task.state == "failed"]
+        logger.info(
+            f"Warm-up finished in {self.finished_at - self.started_at:.1f}s"
+            + (f", failed: {', '.join(failed)}" if failed else "")
+        )
+
+    async def _call(self, task: WarmupTask, fn: Callable[[], Any]) -> float:
+        started = time.monotonic()
+        if task.pool is not None:
+            await task.pool.run(fn)
+        else:
+            await asyncio.to_thread(fn)
+        return time.monotonic() - started
+
+    async def _run_task(self, task: WarmupTask) -> None:
+        attempts = self.max_attempts if task.required else 1
+        while True:
+            task.attempts += 1
+            try:
+                task.state = "loading"
+                task.load_s = await self._call(task, task.load)
+                if task.warm is not None:
+                    task.state = "warming"
+                    task.warm_s = await self._call(task, task.warm)
+            except Exception as e:
+                task.error = f"{type(e).__name__}: {e}"
+                if task.attempts >= attempts:
+                    task.state = "failed"
+                    log = logger.error if task.required else logger.warning
+                    log(f"Warm-up: {task.name} failed after {task.attempts} attempt(s): {task.error}")
+                    return
+                delay = min(self.backoff_s * 2 ** (task.attempts - 1), self.max_backoff_s)
+                task.state = "retrying"
+                logger.warning(f"Warm-up: {task.name} failed ({task.error}), retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            task.state, task.error = "ready", None
+            logger.info(
+                f"Warm-up: {task.name} ready (load {task.load_s:.1f}s"
+                + (f", warm-up {task.warm_s:.2f}s)" if task.warm_s is not None else ")")
+            )
+            return
+
+    def snapshot(self) -> dict:
+        """Readiness and per-task state for /health/readiness."""
+        now = time.monotonic()
+        return {
+            "ready": self.ready,
+            "healthy": self.healthy,
+            "elapsed_s": round((self.finished_at or now) - self.started_at, 2) if self.started_at is not None else None,
+            "models": {
+                task.name: {
+                    "state": task.state,
+                    "required": task.required,
+                    "load_s": round(task.load_s, 3) if task.load_s is not None else None,
+                    "warm_s": round(task.warm_s, 3) if task.warm_s is not None else None,
+                    "error": task.error,
+                    "attempts": task.attempts,
+                }
+                for task in self.tasks.values()
+            },
+        }
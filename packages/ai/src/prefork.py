@@ -0,0 +1,161 @@
+"""
+Pre-fork Multi-Worker Serving
+=============================
+
+Loads models once in a parent process and freezes them (eval mode, no
+grad, gc.freeze). It then forks N uvicorn workers that accept on one
+shared listening socket and share the weight pages copy-on-write.
+uvicorn's own --workers spawns fresh interpreters, so each of those
+workers would load its own copy of every model.
+
+Each worker sets its own torch intra-op thread count (cores / workers by
+default) so N workers don't oversubscribe the CPU.
+
+Usage:
+    AI_SERVICE_WORKERS=4 python src/ai_service.py
+
+    from prefork import serve_prefork
+
+    serve_prefork(app, "0.0.0.0", 8001, workers=4, preload=preload_models)
+"""
+
+import gc
+import os
+import time
+import signal
+import logging
+from typing import Any, Callable, Iterable, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before replacing a worker that died, so a crash loop doesn't spin
+RESTART_DELAY_S = 1.0
+
+
+def threads_per_worker(workers: int, requested: int = 0) -> int:
+    """torch intra-op threads for each worker: explicit value, or an even share of the cores."""
+    if requested > 0:
+        return requested
+    return max(1, (os.cpu_count() or 1) // max(workers, 1))
+
+
+def freeze_modules(modules: Iterable[torch.nn.Module]) -> int:
+    """Put modules in eval mode and drop autograd on every parameter; returns the count frozen."""
+    count = 0
+    for module in modules:
+        module.eval()
+        module.requires_grad_(False)
+        count += 1
+    return count
+
+
+def _configure_worker_threads(threads: int) -> None:
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already fixed for this process (inter-op pool used before the fork)
+        pass
+
+
+def _run_worker(app: Any, sock, host: str, port: int, threads: int) -> None:
+    """Child process: configure torch threads and serve on the inherited socket."""
+    import uvicorn
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _configure_worker_threads(threads)
+
+    logger.info(f"Worker {os.getpid()} serving with {threads} torch thread(s)")
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port))
+    server.run(sockets=[sock])
+
+
+def serve_prefork(
+    app: Any,
+    host: str,
+    port: int,
+    workers: int,
+    preload: Optional[Callable[[], Iterable[torch.nn.Module]]] = None,
+    threads: int = 0,
+) -> None:
+    """
+    Preload, freeze, fork `workers` uvicorn processes and supervise them until SIGINT/SIGTERM.
+
+    Args:
+        app: ASGI app to serve
+        host: Bind address
+        port: Bind port
+        workers: Number of worker processes
+        preload: Loads models in the parent and returns the torch modules to freeze
+        threads: torch intra-op threads per worker (0 = cores / workers)
+    """
+    import uvicorn
+
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Pre-fork serving needs os.fork (not available on this platform)")
+
+    threads = threads_per_worker(workers, threads)
+
+    # Keep the parent single-threaded: forking a process with live OpenMP
+    # worker threads can deadlock the children's first parallel op.
+    torch.set_num_threads(1)
+
+    if preload is not None:
+        frozen = freeze_modules(preload())
+        logger.info(f"Preloaded and froze {frozen} model module(s) in parent {os.getpid()}")
+
+    # Move everything allocated so far out of the collector's reach; otherwise
+    # a GC pass in a worker touches every object header and un-shares its page.
+    gc.collect()
+    gc.freeze()
+
+    sock = uvicorn.Config(app, host=host, port=port).bind_socket()
+    children: dict[int, int] = {}  # pid -> worker slot
+    stopping = False
+
+    def spawn(slot: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                _run_worker(app, sock, host, port, threads)
+            except BaseException as e:
+                logger.error(f"Worker {os.getpid()} crashed: {e}")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        children[pid] = slot
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    for slot in range(workers):
+        spawn(slot)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    logger.info(f"Started {workers} worker(s) on {host}:{port}, {threads} torch thread(s) each")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        slot = children.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        logger.warning(f"Worker {pid} exited (status {status}), restarting")
+        time.sleep(RESTART_DELAY_S)
+        if not stopping:
+            spawn(slot)
+
+    sock.close()
+    logger.info("All workers stopped")
@@ -0,0 +1,270 @@
+"""
+Request Profiling
+=================
+
+Tools for finding out where a slow request's time went, off unless enabled
+(PROFILING_API_KEY):
+- Per request: a request sent with X-Profile: cprofile (or torch) and the
+  profiling key runs its inference pool work (tokenization, forward passes,
+  audio decoding and encoding) under cProfile or torch.profiler. The
+  response carries X-Profile-Id; the report is kept in a ProfileStore.
+- Process wide: StackSampler samples the stack of every thread at a fixed
+  interval for N seconds and returns collapsed stacks ("frame;frame;frame
+  count" per line), the input of flamegraph.pl, inferno and speedscope.
+
+While disabled nothing is installed: no middleware, no pool call wrapper.
+
+Usage:
+    from request_profiling import ProfileStore, ProfilingMiddleware, StackSampler, profiled_call
+
+    profiles = ProfileStore(keep=16)
+    app.add_middleware(ProfilingMiddleware, store=profiles, api_key=key)
+    pool = InferencePool("tts", call_wrapper=profiled_call)
+
+    collapsed = StackSampler().sample(seconds=10)
+"""
+
+import io
+import os
+import sys
+import time
+import hmac
+import uuid
+import pstats
+import cProfile
+import logging
+import threading
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "torch")
+
+# Functions / operators listed per report
+REPORT_ROWS = 60
+
+# The profile of the request being handled, if it asked for one
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+# torch.profiler can't run twice at once; a call that finds it busy runs unprofiled
+_torch_profiler_lock = threading.Lock()
+
+# Neither can cProfile from Python 3.12 on (one sys.monitoring profiler per
+# process; a second enable() raises ValueError), so cProfile calls take turns too
+_cprofile_lock = threading.Lock()
+
+
+class SamplerBusyError(RuntimeError):
+    """A sampling run is already in progress."""
+
+
+class RequestProfile:
+    """cProfile stats (or torch.profiler tables) of one request's pool calls, merged into one report."""
+
+    def __init__(self, mode: str, endpoint: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.mode = mode
+        self.endpoint = endpoint
+        self.started_at = time.time()
+        self.duration_s: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._stats: Optional[pstats.Stats] = None
+        self._tables: list[str] = []
+        self.calls = 0
+        self.skipped = 0
+
+    def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """fn(*args, **kwargs) under this request's profiler (on the calling thread)."""
+        if self.mode == "torch":
+            return self._run_torch(fn, *args, **kwargs)
+
+        if not _cprofile_lock.acquire(blocking=False):
+            with self._lock:
+                self.skipped += 1
+            return fn(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn, *args, **kwargs)
+        finally:
+            _cprofile_lock.release()
+            with self._lock:
+                self.calls += 1
+                if self._stats is None:
+                    self._stats = pstats.Stats(profiler, stream=io.StringIO())
+                else:
+                    self._stats.add(profiler)
+
+    def _run_torch(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        import torch
+
+        if not _torch_profiler_lock.acquire(blocking=False):
+            with self._lock:
+                self.skipped += 1
+            return fn(*args, **kwargs)
+
+        try:
+            with torch.profiler.profile(activities=[torch.profiler.ProfilerActivity.CPU], record_shapes=True) as prof:
+                result = fn(*args, **kwargs)
+        finally:
+            _torch_profiler_lock.release()
+
+        table = prof.key_averages().table(sort_by="self_cpu_time_total", row_limit=REPORT_ROWS)
+        with self._lock:
+            self.calls += 1
+            self._tables.append(f"## {getattr(fn, '__name__', repr(fn))}\n{table}")
+        return result
+
+    def finish(self) -> None:
+        self.duration_s = time.time() - self.started_at
+
+    @property
+    def done(self) -> bool:
+        return self.duration_s is not None
+
+    def report(self) -> str:
+        """Plain-text report: cumulative-time pstats listing, or one torch operator table per call."""
+        with self._lock:
+            header = (
+                f"# {self.mode} profile {self.id}: {self.endpoint}, "
+                f"{self.duration_s or 0.0:.3f}s, {self.calls} pool call(s)"
+                + (f", {self.skipped} unprofiled (profiler busy)" if self.skipped else "")
+                + "\n\n"
+            )
+            if self.mode == "torch":
+                return header + "\n".join(self._tables)
+            if self._stats is None:
+                return header
+            out = io.StringIO()
+            self._stats.stream = out
+            self._stats.sort_stats("cumulative").print_stats(REPORT_ROWS)
+            return header + out.getvalue()
+
+
+class ProfileStore:
+    """The last `keep` request profiles, by id."""
+
+    def __init__(self, keep: int = 16):
+        self.keep = max(keep, 1)
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def new(self, mode: str, endpoint: str) -> RequestProfile:
+        profile = RequestProfile(mode, endpoint)
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.keep:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+
+def profiled_call(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """InferencePool call wrapper: fn under the current request's profiler, if it asked for one."""
+    profile = current_profile.get()
+    return fn if profile is None else partial(profile.run, fn)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware: profiles requests that send X-Profile: <mode> and X-Profile-Key: <api_key>."""
+
+    def __init__(self, app, store: ProfileStore, api_key: str):
+        """
+        Args:
+            app: Inner ASGI app
+            store: Where finished profiles are kept
+            api_key: Value X-Profile-Key must match (requests without it are served unprofiled)
+        """
+        self.app = app
+        self.store = store
+        self.api_key = api_key
+
+    def requested_mode(self, scope) -> Optional[str]:
+        headers = dict(scope.get("headers") or [])
+        mode = headers.get(b"x-profile", b"").decode("latin-1").strip().lower()
+        if not mode:
+            return None
+        key = headers.get(b"x-profile-key", b"").decode("latin-1")
+        if not self.api_key or not hmac.compare_digest(key, self.api_key):
+            return None
+        return "cprofile" if mode in ("1", "true") else mode if mode in PROFILE_MODES else None
+
+    async def __call__(self, scope, receive, send):
+        mode = self.requested_mode(scope) if scope["type"] == "http" else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.store.new(mode, scope["path"])
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile.id.encode())]}
+            await send(message)
+
+        token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            current_profile.reset(token)
+            profile.finish()
+            logger.info(f"Profiled {scope['path']} ({mode}): {profile.id}, {profile.calls} pool call(s)")
+
+
+class StackSampler:
+    """Samples every thread's Python stack at an interval; output is collapsed stacks for flame graphs."""
+
+    def __init__(self, interval_ms: float = 5.0):
+        self.interval_s = max(interval_ms, 0.1) / 1000.0
+        self._lock = threading.Lock()
+        self._labels: dict = {}  # code object -> frame label
+
+        self.stats = {"runs": 0, "samples": 0}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename
+            short = os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+            label = self._labels[code] = f"{code.co_name} ({short}:{code.co_firstlineno})"
+        return label
+
+    def _stack(self, frame, thread_name: str) -> str:
+        frames = []
+        while frame is not None:
+            frames.append(self._label(frame.f_code))
+            frame = frame.f_back
+        frames.append(thread_name)
+        return ";".join(reversed(frames))
+
+    def sample(self, seconds: float, interval_ms: Optional[float] = None) -> str:
+        """Sample for `seconds` (blocking the calling thread) and return "stack count" lines, most frequent first."""
+        if not self._lock.acquire(blocking=False):
+            raise SamplerBusyError("A sampling run is already in progress")
+        try:
+            interval = self.interval_s if interval_ms is None else max(interval_ms, 0.1) / 1000.0
+            me = threading.get_ident()
+            counts: Counter = Counter()
+            samples = 0
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident != me:
+                        counts[self._stack(frame, names.get(ident, f"thread-{ident}"))] += 1
+                samples += 1
+                time.sleep(interval)
+
+            self.stats["runs"] += 1
+            self.stats["samples"] += samples
+            logger.info(f"Stack sampler: {samples} samples of {len(counts)} distinct stacks in {seconds:.1f}s")
+            return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+        finally:
+            self._lock.release()
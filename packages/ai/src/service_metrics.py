@@ -0,0 +1,208 @@
+"""
+Service Metrics
+===============
+
+Prometheus metrics for the AI service (served at /metrics):
+- ai_stage_duration_seconds{endpoint, language, stage}: time per pipeline stage.
+  Stages: queue_wait (inference pool), decode (audio in), vad, normalize,
+  tokenize (text tokenizer or audio feature extractor), forward, detokenize
+  (ids to text), encode (audio out)
+- ai_http_request_duration_seconds{endpoint, method, status}
+- ai_http_request_size_bytes / ai_http_response_size_bytes{endpoint}
+- ai_model_load_duration_seconds{model}
+- Metric families computed at scrape time from the service's own counters
+  (caches, pools, STT adapters and scheduler, ...) via CallbackCollector
+- process_* (resident memory, CPU, open fds) from prometheus_client's
+  process collector
+
+The endpoint label comes from the request path (MetricsMiddleware), the
+language from the stage itself or from current_language, set by the handler.
+Both are context variables, so they follow work into inference pool threads.
+With AI_SERVICE_WORKERS > 1 every worker keeps its own metrics and a scrape
+sees the worker that answered it.
+
+Usage:
+    from service_metrics import METRICS_REGISTRY, MetricsMiddleware, stage_timer
+
+    app.add_middleware(MetricsMiddleware, routes=app.routes)
+
+    with stage_timer("forward", language):
+        output = model(**inputs)
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable, Optional, Sequence
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, ProcessCollector
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+
+# Dedicated registry: only this service's metrics, and safe to import more than once in tests
+METRICS_REGISTRY = CollectorRegistry()
+ProcessCollector(registry=METRICS_REGISTRY)
+
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LOAD_BUCKETS = (1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+SIZE_BUCKETS = tuple(float(4 ** i) for i in range(4, 14))  # 256 B .. 64 MB
+
+STAGE_SECONDS = Histogram(
+    "ai_stage_duration_seconds", "Time spent per pipeline stage",
+    ["endpoint", "language", "stage"], buckets=STAGE_BUCKETS, registry=METRICS_REGISTRY,
+)
+REQUEST_SECONDS = Histogram(
+    "ai_http_request_duration_seconds", "HTTP request duration until the last response byte",
+    ["endpoint", "method", "status"], buckets=STAGE_BUCKETS, registry=METRICS_REGISTRY,
+)
+REQUEST_BYTES = Histogram(
+    "ai_http_request_size_bytes", "HTTP request body size",
+    ["endpoint"], buckets=SIZE_BUCKETS, registry=METRICS_REGISTRY,
+)
+RESPONSE_BYTES = Histogram(
+    "ai_http_response_size_bytes", "HTTP response body size",
+    ["endpoint"], buckets=SIZE_BUCKETS, registry=METRICS_REGISTRY,
+)
+MODEL_LOAD_SECONDS = Histogram(
+    "ai_model_load_duration_seconds", "Model load time (first use, preload or reload after eviction)",
+    ["model"], buckets=LOAD_BUCKETS, registry=METRICS_REGISTRY,
+)
+WEBSOCKET_SESSIONS = Counter(
+    "ai_websocket_sessions", "WebSocket sessions opened", ["endpoint"], registry=METRICS_REGISTRY,
+)
+
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="background")
+current_language: ContextVar[str] = ContextVar("current_language", default="none")
+
+
+def observe_stage(stage: str, seconds: float, language: Optional[str] = None) -> None:
+    STAGE_SECONDS.labels(current_endpoint.get(), language or current_language.get(), stage).observe(seconds)
+
+
+@contextmanager
+def stage_timer(stage: str, language: Optional[str] = None):
+    """Observe the duration of the with-block as one stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started, language)
+
+
+@contextmanager
+def metric_language(language: str):
+    """Label stages in the with-block (and work it hands to pools) with language."""
+    token = current_language.set(language)
+    try:
+        yield
+    finally:
+        current_language.reset(token)
+
+
+def observe_model_load(model: str, seconds: float) -> None:
+    MODEL_LOAD_SECONDS.labels(model).observe(seconds)
+
+
+class MetricsMiddleware:
+    """ASGI middleware: sets the endpoint label and records duration and body sizes per HTTP request."""
+
+    def __init__(self, app, routes: Sequence):
+        """
+        Args:
+            app: Inner ASGI app
+            routes: The app's routes (a live list); unknown paths are labelled "other"
+        """
+        self.app = app
+        self.routes = routes
+
+    def endpoint(self, path: str) -> str:
+        return path if any(getattr(route, "path", None) == path for route in self.routes) else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = self.endpoint(scope["path"])
+        token = current_endpoint.set(endpoint)
+        # Handlers set current_language; undone when the request ends
+        language_token = current_language.set(current_language.get())
+        try:
+            if scope["type"] == "websocket":
+                WEBSOCKET_SESSIONS.labels(endpoint).inc()
+                await self.app(scope, receive, send)
+                return
+            await self._http(scope, receive, send, endpoint)
+        finally:
+            current_endpoint.reset(token)
+            current_language.reset(language_token)
+
+    async def _http(self, scope, receive, send, endpoint: str) -> None:
+        started = time.perf_counter()
+        sizes = {"request": 0, "response": 0}
+        status = ["500"]
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes["request"] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            elif message["type"] == "http.response.body":
+                sizes["response"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            REQUEST_SECONDS.labels(endpoint, scope["method"], status[0]).observe(time.perf_counter() - started)
+            REQUEST_BYTES.labels(endpoint).observe(sizes["request"])
+            RESPONSE_BYTES.labels(endpoint).observe(sizes["response"])
+
+
+# ----------------------------------------
+# Scrape-time metrics from existing counters
+# ----------------------------------------
+
+class CallbackCollector:
+    """Registers a function returning metric families, called on every scrape."""
+
+    def __init__(self, families: Callable[[], Iterable[Metric]], registry: CollectorRegistry = METRICS_REGISTRY):
+        self._families = families
+        registry.register(self)
+
+    def collect(self):
+        yield from self._families()
+
+    def describe(self):
+        # Nothing up front: families depend on what is loaded at scrape time
+        return []
+
+
+def cache_families(lookups: dict[str, tuple[int, int]]) -> list[Metric]:
+    """ai_cache_hits_total / ai_cache_misses_total / ai_cache_hit_ratio from {cache: (hits, misses)}."""
+    hits = CounterMetricFamily("ai_cache_hits", "Cache lookups answered", labels=["cache"])
+    misses = CounterMetricFamily("ai_cache_misses", "Cache lookups not answered", labels=["cache"])
+    ratio = GaugeMetricFamily("ai_cache_hit_ratio", "Hits / lookups since start", labels=["cache"])
+    for cache, (hit_count, miss_count) in lookups.items():
+        hits.add_metric([cache], hit_count)
+        misses.add_metric([cache], miss_count)
+        ratio.add_metric([cache], hit_count / (hit_count + miss_count) if hit_count + miss_count else 0.0)
+    return [hits, misses, ratio]
+
+
+def stats_families(prefix: str, label: str, snapshots: dict[str, dict],
+                   counters: Sequence[str] = (), gauges: Sequence[str] = ()) -> list[Metric]:
+    """{prefix}_{key}_total counters and {prefix}_{key} gauges from {label value: stats dict}."""
+    families = []
+    for keys, family_type in ((counters, CounterMetricFamily), (gauges, GaugeMetricFamily)):
+        for key in keys:
+            family = family_type(f"{prefix}_{key}", f"{prefix.replace('_', ' ')}: {key.replace('_', ' ')}", labels=[label])
+            for name, stats in snapshots.items():
+                value = stats.get(key)
+                if isinstance(value, (int, float)):
+                    family.add_metric([name], value)
+            families.append(family)
+    return families
@@ -0,0 +1,196 @@
+"""
+Resident STT Language Adapters
+==============================
+
+MMS-1B is one shared encoder plus a small per-language adapter (an
+attention adapter in every encoder layer and the CTC head). Instead of
+reloading adapter weights from disk whenever the requested language changes
+(model.load_adapter()), every language's adapter modules are loaded once and
+kept resident, and a switch just points the model's layers at the other
+language's modules.
+
+A switch is only made when no inference is running on the shared model, so a
+request never sees its adapter swapped out mid-forward. Requests for the active
+language run concurrently; requests for another language wait for them to
+finish (the STT scheduler orders requests so that this rarely happens).
+
+Usage:
+    from stt_adapters import ResidentAdapters
+
+    adapters = ResidentAdapters(model, processor, load_adapter=_load_stt_adapter)
+    adapters.load_all(["bcl", "tgl", "eng"])
+
+    with adapters.use("tgl"):
+        logits = model(input_values).logits
+"""
+
+import copy
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+# Attribute holding the attention adapter in each MMS encoder layer
+ADAPTER_ATTR = "adapter_layer"
+
+
+@dataclass
+class AdapterSet:
+    """One language's adapter modules (keyed by the encoder layer that holds them) and CTC head."""
+    lang_code: str
+    layers: dict[str, torch.nn.Module]
+    lm_head: torch.nn.Module
+    vocab_size: int
+
+    def modules(self) -> Iterator[torch.nn.Module]:
+        yield from self.layers.values()
+        yield self.lm_head
+
+    def size_bytes(self) -> int:
+        return sum(
+            tensor.numel() * tensor.element_size()
+            for module in self.modules()
+            for tensor in module.state_dict().values()
+        )
+
+
+class ResidentAdapters:
+    """All language adapters of one Wav2Vec2ForCTC model, switched by reference."""
+
+    def __init__(self, model: Any, processor: Any, load_adapter: Callable[[Any, str], None]):
+        """
+        Args:
+            model: Wav2Vec2ForCTC with adapter layers (MMS)
+            processor: Its processor; the tokenizer's target language follows the active adapter
+            load_adapter: Loads one language's adapter weights into the model in place
+        """
+        self.model = model
+        self.processor = processor
+        self._load_adapter = load_adapter
+        self._layer_paths = [
+            name.rsplit(".", 1)[0] for name, _ in model.named_modules() if name.endswith(f".{ADAPTER_ATTR}")
+        ]
+
+        self._sets: dict[str, AdapterSet] = {}
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self.active: Optional[str] = None
+
+        self.stats = {"switches": 0, "switch_time_s": 0.0, "adapter_loads": 0, "waits": 0}
+
+    # ----------------------------------------
+    # Loading
+    # ----------------------------------------
+
+    def load_all(self, lang_codes: Iterable[str]) -> None:
+        """Load and keep every listed language's adapter resident."""
+        with self._cond:
+            while self._in_flight:
+                self._cond.wait()
+            for lang_code in lang_codes:
+                if lang_code not in self._sets:
+                    self._load(lang_code)
+
+    def _load(self, lang_code: str) -> None:
+        """Load a language's weights into fresh copies of the adapter modules and make it active."""
+        start = time.perf_counter()
+        # Install private copies first: loading writes in place, and the
+        # current modules belong to another language's resident set.
+        self._install_modules(
+            {path: copy.deepcopy(self.model.get_submodule(path).get_submodule(ADAPTER_ATTR)) for path in self._layer_paths},
+            copy.deepcopy(self.model.lm_head),
+            self.model.config.vocab_size,
+        )
+        self._load_adapter(self.model, lang_code)
+
+        adapter_set = AdapterSet(
+            lang_code=lang_code,
+            layers={path: self.model.get_submodule(path).get_submodule(ADAPTER_ATTR) for path in self._layer_paths},
+            lm_head=self.model.lm_head,
+            vocab_size=self.model.config.vocab_size,
+        )
+        for module in adapter_set.modules():
+            module.eval()
+            module.requires_grad_(False)
+
+        self._sets[lang_code] = adapter_set
+        self.processor.tokenizer.set_target_lang(lang_code)
+        self.active = lang_code
+        self.stats["adapter_loads"] += 1
+        logger.info(
+            f"STT adapter resident: {lang_code} ({adapter_set.size_bytes() / (1024 * 1024):.1f} MB, "
+            f"loaded in {time.perf_counter() - start:.2f}s)"
+        )
+
+    # ----------------------------------------
+    # Switching
+    # ----------------------------------------
+
+    def _install_modules(self, layers: dict[str, torch.nn.Module], lm_head: torch.nn.Module, vocab_size: int) -> None:
+        for path, module in layers.items():
+            setattr(self.model.get_submodule(path), ADAPTER_ATTR, module)
+        self.model.lm_head = lm_head
+        self.model.config.vocab_size = vocab_size
+
+    def _activate(self, lang_code: str) -> None:
+        start = time.perf_counter()
+        if lang_code not in self._sets:
+            self._load(lang_code)
+        else:
+            adapter_set = self._sets[lang_code]
+            self._install_modules(adapter_set.layers, adapter_set.lm_head, adapter_set.vocab_size)
+            self.model.target_lang = lang_code
+            self.processor.tokenizer.set_target_lang(lang_code)
+            self.active = lang_code
+        self.stats["switches"] += 1
+        self.stats["switch_time_s"] += time.perf_counter() - start
+
+    @contextmanager
+    def use(self, lang_code: str):
+        """Run inference with a language's adapter; waits while another language is running."""
+        with self._cond:
+            if self._in_flight and self.active != lang_code:
+                self.stats["waits"] += 1
+                while self._in_flight and self.active != lang_code:
+                    self._cond.wait()
+            if self.active != lang_code:
+                logger.info(f"Switching STT language adapter to: {lang_code}")
+                self._activate(lang_code)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                if self._in_flight == 0:
+                    self._cond.notify_all()
+
+    # ----------------------------------------
+    # Introspection
+    # ----------------------------------------
+
+    @property
+    def estimated_bytes(self) -> int:
+        """Resident size of the inactive adapter sets (the active one is counted with the model)."""
+        return sum(s.size_bytes() for code, s in self._sets.items() if code != self.active)
+
+    def snapshot(self) -> dict:
+        """Resident adapters and switch counters for /health."""
+        with self._cond:
+            stats = dict(self.stats)
+            in_flight = self._in_flight
+        switches = stats["switches"]
+        return {
+            **stats,
+            "switch_time_s": round(stats["switch_time_s"], 4),
+            "avg_switch_ms": round(stats["switch_time_s"] / switches * 1000, 3) if switches else 0.0,
+            "active": self.active,
+            "resident": sorted(self._sets),
+            "in_flight": in_flight,
+        }
@@ -0,0 +1,90 @@
+"""
+Batched STT
+===========
+
+Helpers for transcribing many clips with few forward passes (POST /stt/batch):
+
+1. plan_buckets groups clips of similar duration: clips are sorted by length
+   and cut into buckets bounded by clip count, padded samples per pass, and
+   how much longer the longest clip may be than the shortest (padding waste).
+2. Each bucket runs as one padded forward pass with an attention mask, so
+   padding doesn't leak into the shorter clips.
+3. batch_ctc_ids takes the argmax of the whole (batch, frames, vocab) logits
+   at once and blanks each row's padded frames, so the tokenizer's
+   batch_decode collapses every clip in one call.
+
+Usage:
+    from stt_batching import plan_buckets, ctc_frame_lengths, batch_ctc_ids
+
+    for bucket in plan_buckets([len(c) for c in clips], max_size=8, max_samples=16000 * 120):
+        ...  # pad clips[bucket], run the model -> logits
+        ids = batch_ctc_ids(logits, ctc_frame_lengths(lengths, logits.shape[1], config), blank_id)
+        texts = processor.batch_decode(ids)
+"""
+
+import logging
+from typing import Any, Optional, Sequence
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+def plan_buckets(
+    lengths: Sequence[int],
+    max_size: int = 8,
+    max_samples: int = 16000 * 120,
+    max_pad_ratio: float = 1.5,
+) -> list[list[int]]:
+    """
+    Indices of clips grouped into length-sorted buckets.
+
+    A bucket holds at most max_size clips, its padded size (clips x longest
+    clip) stays within max_samples, and its longest clip is at most
+    max_pad_ratio times its shortest. A clip longer than max_samples gets a
+    bucket of its own.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    buckets: list[list[int]] = []
+    for index in order:
+        length = lengths[index]
+        if buckets:
+            bucket = buckets[-1]
+            shortest = max(lengths[bucket[0]], 1)
+            if (
+                len(bucket) < max_size
+                and (len(bucket) + 1) * length <= max_samples
+                and length <= shortest * max_pad_ratio
+            ):
+                bucket.append(index)
+                continue
+        buckets.append([index])
+    return buckets
+
+
+def ctc_frame_lengths(lengths: Sequence[int], frames: int, config: Optional[Any] = None) -> torch.Tensor:
+    """
+    Valid CTC frames per clip of a padded batch whose logits have `frames` frames.
+
+    Follows the feature encoder's conv stack (config.conv_kernel / conv_stride)
+    when the model config is known; exported graphs fall back to scaling by the
+    longest clip, which is exact to within a frame.
+    """
+    lengths = torch.as_tensor(list(lengths), dtype=torch.long)
+    kernels = getattr(config, "conv_kernel", None)
+    strides = getattr(config, "conv_stride", None)
+    if kernels and strides:
+        out = lengths
+        for kernel, stride in zip(kernels, strides):
+            out = torch.div(out - kernel, stride, rounding_mode="floor") + 1
+    else:
+        longest = max(int(lengths.max()), 1) if len(lengths) else 1
+        out = torch.round(lengths.double() * frames / longest).long()
+    return out.clamp(min=0, max=frames)
+
+
+def batch_ctc_ids(logits: torch.Tensor, frame_lengths: torch.Tensor, blank_id: int) -> torch.Tensor:
+    """Per-frame argmax ids for a padded batch, with frames past each clip's end set to the CTC blank."""
+    ids = logits.argmax(dim=-1)
+    padding = torch.arange(ids.shape[1], device=ids.device)[None, :] >= frame_lengths.to(ids.device)[:, None]
+    return ids.masked_fill(padding, blank_id)
@@ -0,0 +1,180 @@
+"""
+Language-Affine STT Scheduler
+=============================
+
+Orders queued STT requests so that requests for the same language run back to
+back. MMS-1B switches its language adapter between languages (see
+stt_adapters.py), and a switch has to wait for every in-flight request of the
+old language to finish. Dispatching in arrival order under mixed bcl/fil/eng
+traffic would switch on almost every request and serialize the workers.
+
+Policy:
+- keep dispatching the active language while it has queued requests
+- switch to the language with the oldest queued request once the active one is
+  empty, after max_streak requests in a row, or when another language's oldest
+  request has waited longer than max_wait_ms (so no language starves)
+- before a switch, stop dispatching and let the in-flight requests drain, so
+  no worker thread sits blocked on the adapter
+
+Usage:
+    from stt_scheduler import LanguageAffineScheduler
+
+    scheduler = LanguageAffineScheduler(pool=stt_pool, max_streak=8, max_wait_ms=2000)
+    text = await scheduler.submit("bcl", speech_to_text, audio_bytes, "bcl")
+"""
+
+import time
+import asyncio
+import logging
+import contextvars
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from inference_pool import InferencePool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _QueuedRequest:
+    fn: Callable[..., Any]
+    args: tuple
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    # The caller's context variables (e.g. metric labels), restored when the request runs
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+
+
+class LanguageAffineScheduler:
+    """Per-language queues in front of an inference pool, dispatched in same-language runs."""
+
+    def __init__(self, pool: InferencePool, max_streak: int = 8, max_wait_ms: float = 2000.0,
+                 on_wait: Optional[Callable[[float], None]] = None):
+        """
+        Args:
+            pool: Inference pool that runs the requests; its max_workers bounds concurrency
+            max_streak: Requests of one language dispatched in a row before others get a turn
+            max_wait_ms: Queue time after which another language's request forces a switch
+            on_wait: Called with the seconds a request spent queued here (e.g. for metrics)
+        """
+        self.pool = pool
+        self.on_wait = on_wait
+        self.max_streak = max(max_streak, 1)
+        self.max_wait_s = max(max_wait_ms, 0.0) / 1000.0
+
+        self._queues: dict[str, deque[_QueuedRequest]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._running = 0
+        self._streak = 0
+        self.active: Optional[str] = None
+
+        self.stats = {"requests": 0, "dispatched": 0, "language_switches": 0}
+
+    async def submit(self, language: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Queue fn(*args) under a language and wait for its result."""
+        loop = asyncio.get_running_loop()
+        request = _QueuedRequest(fn=fn, args=args, future=loop.create_future())
+        self._queues.setdefault(language, deque()).append(request)
+        self.stats["requests"] += 1
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        else:
+            self._wakeup.set()
+
+        return await request.future
+
+    def snapshot(self) -> dict:
+        """Queue and switch counters for /health."""
+        dispatched = self.stats["dispatched"]
+        return {
+            **self.stats,
+            "avg_run_length": round(dispatched / (self.stats["language_switches"] + 1), 2) if dispatched else 0.0,
+            "active": self.active,
+            "running": self._running,
+            "queued": {lang: len(q) for lang, q in self._queues.items() if q},
+            "max_streak": self.max_streak,
+            "max_wait_ms": self.max_wait_s * 1000.0,
+        }
+
+    # ----------------------------------------
+    # Internals
+    # ----------------------------------------
+
+    def _drop_abandoned(self) -> None:
+        """Forget queued requests whose caller went away."""
+        for queue in self._queues.values():
+            while queue and queue[0].future.done():
+                queue.popleft()
+
+    def _next_language(self) -> Optional[str]:
+        """Language to dispatch next, or None to wait (at capacity, idle, or draining before a switch)."""
+        if self._running >= self.pool.max_workers:
+            return None
+        waiting = [lang for lang, queue in self._queues.items() if queue]
+        if not waiting:
+            return None
+
+        now = time.monotonic()
+        others = [lang for lang in waiting if lang != self.active]
+        starved = any(now - self._queues[lang][0].enqueued_at > self.max_wait_s for lang in others)
+        if self.active in waiting and (not others or (self._streak < self.max_streak and not starved)):
+            return self.active
+
+        target = min(others, key=lambda lang: self._queues[lang][0].enqueued_at)
+        if self._running:
+            return None  # let the active language drain first
+
+        if self.active is not None:
+            self.stats["language_switches"] += 1
+        self.active = target
+        self._streak = 0
+        return target
+
+    async def _dispatch(self) -> None:
+        try:
+            while True:
+                self._drop_abandoned()
+                if not any(self._queues.values()) and not self._running:
+                    return
+                language = self._next_language()
+                if language is None:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                request = self._queues[language].popleft()
+                self._running += 1
+                self._streak += 1
+                self.stats["dispatched"] += 1
+                task = asyncio.create_task(self._run(request), context=request.context)
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except BaseException as e:
+            # Never leave callers waiting on a dispatcher that died
+            error = e if isinstance(e, Exception) else RuntimeError("STT scheduler stopped")
+            for queue in self._queues.values():
+                for request in queue:
+                    if not request.future.done():
+                        request.future.set_exception(error)
+                queue.clear()
+            raise
+
+    async def _run(self, request: _QueuedRequest) -> None:
+        if self.on_wait is not None:
+            self.on_wait(time.monotonic() - request.enqueued_at)
+        try:
+            result = await self.pool.run(request.fn, *request.args)
+        except Exception as e:
+            if not request.future.done():
+                request.future.set_exception(e)
+        else:
+            if not request.future.done():
+                request.future.set_result(result)
+        finally:
+            self._running -= 1
+            self._wakeup.set()
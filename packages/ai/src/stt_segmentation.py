@@ -0,0 +1,164 @@
+"""
+Long-Audio STT Segmentation
+===========================
+
+Keeps MMS-1B's cost proportional to the speech in a clip rather than its
+length, with a bounded forward-pass size:
+
+1. Energy VAD: frames well above the clip's own noise floor are speech;
+   short gaps are bridged, blips dropped, segments padded a little.
+2. The speech segments are packed back to back (short silent gaps in between),
+   so long pauses cost nothing.
+3. The packed audio runs through the model in fixed-size windows that
+   overlap. Each window's CTC frames are trimmed to the middle of its
+   overlaps, so every output frame comes from a window that saw context
+   on both sides, and the frames are concatenated before CTC decoding.
+
+Usage:
+    from stt_segmentation import detect_speech, pack_segments, windowed_ctc
+
+    segments = detect_speech(audio, 16000)
+    speech = pack_segments(audio, segments, gap=3200)
+    ids = windowed_ctc(speech, run_logits, window=320000, overlap=32000)
+    text = processor.decode(ids)
+"""
+
+import logging
+from typing import Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# run_logits(list of equal-length windows) -> one (frames, vocab) array per window
+LogitsRunner = Callable[[list[np.ndarray]], list[np.ndarray]]
+
+
+# ============================================
+# Voice activity detection
+# ============================================
+
+def frame_energy_db(audio: np.ndarray, frame: int) -> np.ndarray:
+    """RMS level of consecutive non-overlapping frames, in dBFS."""
+    n = len(audio) // frame
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:n * frame].reshape(n, frame)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+def detect_speech(
+    audio: np.ndarray,
+    rate: int,
+    frame_ms: float = 30.0,
+    margin_db: float = 12.0,
+    floor_db: float = -55.0,
+    ceiling_db: float = -35.0,
+    min_speech_ms: float = 150.0,
+    min_silence_ms: float = 400.0,
+    pad_ms: float = 200.0,
+) -> list[tuple[int, int]]:
+    """
+    Speech regions as (start, end) sample ranges.
+
+    A frame is speech when it is margin_db above the noise floor (the clip's
+    10th-percentile frame level), with the threshold kept between floor_db
+    and ceiling_db so a clip that is nearly all speech isn't cut. Gaps shorter
+    than min_silence_ms are bridged, regions shorter than min_speech_ms are
+    dropped, and each region is padded by pad_ms on both sides.
+    """
+    frame = max(int(rate * frame_ms / 1000), 1)
+    levels = frame_energy_db(audio, frame)
+    if len(levels) == 0:
+        return [(0, len(audio))] if len(audio) else []
+
+    threshold = min(max(float(np.percentile(levels, 10)) + margin_db, floor_db), ceiling_db)
+    active = levels > threshold
+
+    # Rising/falling edges of the active mask -> frame ranges
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], active.astype(np.int8), [0]))))
+    regions = list(zip(edges[0::2], edges[1::2]))
+
+    min_gap = min_silence_ms / frame_ms
+    merged: list[list[int]] = []
+    for start, end in regions:
+        if merged and start - merged[-1][1] < min_gap:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    pad = int(rate * pad_ms / 1000)
+    min_len = min_speech_ms / frame_ms
+    segments = []
+    for start, end in merged:
+        if end - start < min_len:
+            continue
+        lo = max(start * frame - pad, 0)
+        hi = min(end * frame + pad, len(audio))
+        if segments and lo <= segments[-1][1]:
+            segments[-1] = (segments[-1][0], hi)
+        else:
+            segments.append((lo, hi))
+    return segments
+
+
+def pack_segments(audio: np.ndarray, segments: list[tuple[int, int]], gap: int) -> np.ndarray:
+    """Concatenate the speech segments with `gap` samples of silence between them."""
+    if not segments:
+        return np.zeros(0, dtype=np.float32)
+    silence = np.zeros(gap, dtype=np.float32)
+    parts = []
+    for i, (start, end) in enumerate(segments):
+        if i:
+            parts.append(silence)
+        parts.append(audio[start:end])
+    return np.concatenate(parts).astype(np.float32, copy=False)
+
+
+# ============================================
+# Overlapping windows + CTC stitching
+# ============================================
+
+def plan_windows(length: int, window: int, overlap: int) -> list[tuple[int, int]]:
+    """(start, end) of fixed-size windows stepping by window - overlap; the last one is shifted back to end at `length`."""
+    if length <= window:
+        return [(0, length)]
+    step = window - overlap
+    starts = list(range(0, length - window, step))
+    starts.append(length - window)
+    return [(start, start + window) for start in starts]
+
+
+def windowed_ctc(
+    audio: np.ndarray,
+    run_logits: LogitsRunner,
+    window: int,
+    overlap: int,
+    batch_size: int = 1,
+) -> np.ndarray:
+    """
+    CTC token ids (argmax per frame, before collapsing) for audio of any length.
+
+    Windows are run batch_size at a time, so peak memory depends on the
+    window size and not on the clip length. Each window keeps the frames
+    between the midpoints of its overlaps with its neighbours.
+    """
+    if overlap * 2 > window:
+        raise ValueError("Window overlap must be at most half the window")
+
+    spans = plan_windows(len(audio), window, overlap)
+    pieces: list[np.ndarray] = []
+    for first in range(0, len(spans), batch_size):
+        batch = spans[first:first + batch_size]
+        logits = run_logits([audio[start:end] for start, end in batch])
+        for index, ((start, end), frames) in enumerate(zip(batch, logits), first):
+            # Frames per sample from the output itself (backend-agnostic)
+            ratio = len(frames) / max(end - start, 1)
+            keep_from = start if index == 0 else (start + spans[index - 1][1]) // 2
+            keep_to = end if index == len(spans) - 1 else (spans[index + 1][0] + end) // 2
+            lo = int(round((keep_from - start) * ratio))
+            hi = int(round((keep_to - start) * ratio))
+            pieces.append(np.asarray(frames[lo:hi]).argmax(axis=-1))
+
+    return np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.int64)
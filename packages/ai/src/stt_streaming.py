@@ -0,0 +1,275 @@
+"""
+Streaming STT
+=============
+
+Incremental transcription of live 16 kHz PCM for the /stt/stream WebSocket:
+
+1. An online version of the energy VAD in stt_segmentation tracks the noise
+   floor over the last few seconds. Idle audio is kept only as a short
+   pre-roll; a speech segment starts at the first active frame (plus the
+   pre-roll) and ends after endpoint_ms of trailing silence.
+2. While a segment is open, the model re-runs on its uncommitted tail every
+   partial_ms of new audio and the collapsed CTC output is sent as a partial
+   transcript.
+3. Once the uncommitted tail exceeds commit_s, its frames up to `context`
+   before the end are committed: they had at least `context` of right context,
+   like the frames windowed_ctc keeps. The next pass starts `context` before
+   the commit point, so each pass sees a bounded amount of audio however long
+   the user speaks.
+4. At end-of-speech (or a client flush) the rest is decoded and the segment is
+   sent as a final transcript.
+
+The transcriber itself is synchronous: push() is called from the event loop
+as frames arrive, and step() runs on an inference worker, consuming everything
+pushed since the last step, so a slow model coalesces audio instead of
+queuing passes.
+
+Usage:
+    from stt_streaming import StreamingTranscriber
+
+    transcriber = StreamingTranscriber(model_in_use)  # -> (run_logits, decode) while held
+    transcriber.push(pcm16_to_float(frame_bytes))
+    for event in transcriber.step():
+        ...  # {"type": "partial" | "final", "segment": 0, "text": "..."}
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Callable, ContextManager
+
+import numpy as np
+
+from stt_segmentation import LogitsRunner, frame_energy_db
+
+logger = logging.getLogger(__name__)
+
+# decode(CTC ids per frame, uncollapsed) -> text
+CTCDecoder = Callable[[np.ndarray], str]
+
+# Holds the model for one pass: `with model_in_use() as (run_logits, decode): ...`
+ModelInUse = Callable[[], ContextManager[tuple[LogitsRunner, CTCDecoder]]]
+
+# Shortest audio worth a forward pass (Wav2Vec2's conv front end needs 400 samples)
+MIN_DECODE_SAMPLES = 1600
+
+
+class StreamingTranscriber:
+    """VAD-segmented, incrementally CTC-decoded transcription of one audio stream."""
+
+    def __init__(
+        self,
+        model_in_use: ModelInUse,
+        rate: int = 16000,
+        partial_ms: float = 500.0,
+        endpoint_ms: float = 600.0,
+        commit_s: float = 4.0,
+        context_s: float = 2.0,
+        frame_ms: float = 30.0,
+        margin_db: float = 12.0,
+        floor_db: float = -55.0,
+        ceiling_db: float = -35.0,
+        history_s: float = 10.0,
+        min_speech_ms: float = 150.0,
+        pad_ms: float = 200.0,
+    ):
+        """
+        Args:
+            model_in_use: Context manager factory yielding (run_logits, decode) for one pass;
+                the model is only held while a pass runs, not while the VAD is idle
+            rate: Sample rate of the pushed audio
+            partial_ms: New speech needed before another partial pass
+            endpoint_ms: Trailing silence that ends a segment
+            commit_s: Uncommitted audio that triggers committing the stable prefix
+            context_s: Left/right context kept around the commit point
+            frame_ms, margin_db, floor_db, ceiling_db, min_speech_ms, pad_ms: As in detect_speech
+            history_s: Recent audio the noise floor is estimated from
+        """
+        self.model_in_use = model_in_use
+        self.rate = rate
+        self.frame = max(int(rate * frame_ms / 1000), 1)
+        self.margin_db = margin_db
+        self.floor_db = floor_db
+        self.ceiling_db = ceiling_db
+        self.partial_samples = int(rate * partial_ms / 1000)
+        self.endpoint_frames = max(int(endpoint_ms / frame_ms), 1)
+        self.min_speech_frames = max(int(min_speech_ms / frame_ms), 1)
+        self.pad_frames = int(pad_ms / frame_ms)
+        self.commit_samples = int(rate * commit_s)
+        self.context = int(rate * context_s)
+
+        self._lock = threading.Lock()
+        self._pending: list[np.ndarray] = []
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._levels: deque = deque(maxlen=max(int(history_s * 1000 / frame_ms), 1))
+        self._preroll: deque = deque(maxlen=self.pad_frames)
+        self._position = 0  # stream samples consumed by the VAD
+        self._segment_index = 0
+        self._reset_segment()
+
+        self.stats = {"segments": 0, "dropped_segments": 0, "passes": 0, "audio_s": 0.0, "decoded_s": 0.0}
+
+    def _reset_segment(self) -> None:
+        self._in_speech = False
+        self._audio = np.zeros(0, dtype=np.float32)  # segment audio from sample _offset onward
+        self._offset = 0
+        self._segment_start = 0  # stream sample where the segment begins
+        self._speech_frames = 0
+        self._silent_frames = 0
+        self._committed: list[np.ndarray] = []
+        self._committed_to = 0  # segment sample up to which frames are committed
+        self._decoded_to = 0  # segment length at the last pass
+        self._last_partial = ""
+
+    @property
+    def in_speech(self) -> bool:
+        return self._in_speech
+
+    # ----------------------------------------
+    # Input (event loop)
+    # ----------------------------------------
+
+    def push(self, samples: np.ndarray) -> None:
+        """Queue float32 samples for the next step()."""
+        if len(samples):
+            with self._lock:
+                self._pending.append(samples)
+
+    # ----------------------------------------
+    # Processing (inference worker)
+    # ----------------------------------------
+
+    def step(self, final: bool = False) -> list[dict]:
+        """
+        Run the VAD over the audio pushed since the last step and decode as needed.
+
+        With final=True the open segment is finalized regardless of the VAD
+        (client flush or end of stream). Returns partial/final events in order.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        audio = np.concatenate([self._carry, *pending]) if pending else self._carry
+        usable = len(audio) // self.frame * self.frame
+        self._carry = audio[usable:]
+        self.stats["audio_s"] += usable / self.rate
+
+        events: list[dict] = []
+        if usable:
+            self._run_vad(audio[:usable], events)
+
+        if final:
+            if self._in_speech:
+                self._append(self._carry)
+                self._finalize(events)
+            self._carry = np.zeros(0, dtype=np.float32)
+        elif self._in_speech and self._segment_length() - self._decoded_to >= self.partial_samples:
+            text = self._decode_pass(final=False)
+            if text != self._last_partial:
+                self._last_partial = text
+                events.append({"type": "partial", "segment": self._segment_index, "text": text})
+        return events
+
+    def _run_vad(self, audio: np.ndarray, events: list[dict]) -> None:
+        frames = audio.reshape(-1, self.frame)
+        for frame, level in zip(frames, frame_energy_db(audio, self.frame)):
+            self._levels.append(level)
+            threshold = min(max(float(np.percentile(self._levels, 10)) + self.margin_db, self.floor_db), self.ceiling_db)
+            active = level > threshold
+            self._position += self.frame
+
+            if not self._in_speech:
+                if active:
+                    self._open_segment()
+                    self._append(frame)
+                    self._speech_frames = 1
+                else:
+                    self._preroll.append(frame)
+                continue
+
+            self._append(frame)
+            if active:
+                self._speech_frames += 1
+                self._silent_frames = 0
+            else:
+                self._silent_frames += 1
+                if self._silent_frames >= self.endpoint_frames:
+                    # Keep pad_ms of the trailing silence, as the batch VAD does
+                    trim = (self._silent_frames - self.pad_frames) * self.frame
+                    self._audio = self._audio[:max(len(self._audio) - trim, 0)]
+                    self._finalize(events)
+
+    def _open_segment(self) -> None:
+        self._reset_segment()
+        preroll = list(self._preroll)
+        self._preroll.clear()
+        self._in_speech = True
+        self._audio = np.concatenate(preroll) if preroll else np.zeros(0, dtype=np.float32)
+        self._segment_start = self._position - self.frame - len(self._audio)
+
+    def _append(self, samples: np.ndarray) -> None:
+        if len(samples):
+            self._audio = np.concatenate([self._audio, samples])
+
+    def _segment_length(self) -> int:
+        return self._offset + len(self._audio)
+
+    def _finalize(self, events: list[dict]) -> None:
+        """Close the open segment: decode the rest and emit a final (blips without a partial are dropped)."""
+        if self._speech_frames < self.min_speech_frames and not self._last_partial:
+            self.stats["dropped_segments"] += 1
+        else:
+            start = self._segment_start
+            end = start + self._segment_length()
+            events.append({
+                "type": "final",
+                "segment": self._segment_index,
+                "text": self._decode_pass(final=True),
+                "start_s": round(start / self.rate, 3),
+                "end_s": round(end / self.rate, 3),
+            })
+            self.stats["segments"] += 1
+            self._segment_index += 1
+        self._reset_segment()
+
+    def _decode_pass(self, final: bool) -> str:
+        """Run the model on the uncommitted tail (plus left context), commit what is stable, return the text so far."""
+        length = self._segment_length()
+        self._decoded_to = length
+        window = self._audio  # starts at _offset = max(_committed_to - context, 0)
+
+        with self.model_in_use() as (run_logits, decode):
+            if len(window) < MIN_DECODE_SAMPLES:
+                return decode(np.concatenate(self._committed)) if self._committed else ""
+
+            logits = run_logits([window])[0]
+            self.stats["passes"] += 1
+            self.stats["decoded_s"] += len(window) / self.rate
+            ids = np.asarray(logits).argmax(axis=-1)
+            ratio = len(ids) / len(window)
+            lo = int(round((self._committed_to - self._offset) * ratio))
+
+            if final:
+                self._committed.append(ids[lo:])
+                tail = ids[:0]
+            elif length - self._committed_to > self.commit_samples:
+                commit_to = length - self.context
+                hi = int(round((commit_to - self._offset) * ratio))
+                self._committed.append(ids[lo:hi])
+                tail = ids[hi:]
+                self._committed_to = commit_to
+                # Only the left context before the commit point is needed from now on
+                drop = max(commit_to - self.context - self._offset, 0)
+                self._audio = self._audio[drop:]
+                self._offset += drop
+            else:
+                tail = ids[lo:]
+
+            return decode(np.concatenate([*self._committed, tail]))
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats,
+            "audio_s": round(self.stats["audio_s"], 2),
+            "decoded_s": round(self.stats["decoded_s"], 2),
+            "in_speech": self._in_speech,
+        }
@@ -0,0 +1,410 @@
+"""
+TTS Text Normalization
+======================
+
+Spells out numbers and number-like tokens for Bikol, Filipino and English
+before they reach VITS (whose character vocabularies have no digits):
+
+- Cardinals, comma-grouped numbers and decimals: 1,500 / 2.5
+- Ordinals: 1st, 22nd
+- Phone numbers, read digit by digit: (054) 472-3000, 0917 123 4567, +63 917 123 4567
+- Times: 8:30 AM, 14:00
+- Dates: 12/25/2024 (MM/DD/YYYY), 2024-12-25
+- Peso amounts: ₱1,250.50, PHP 500
+- Dosage units: 500mg, 5 ml, 10%
+
+All rules are compiled once into a single alternation regex and every
+number word table below 1000 is precomputed per language, so normalizing is
+one regex pass plus table lookups.
+
+Usage:
+    from text_normalizer import normalize_text, normalize_batch
+
+    normalize_text("Inumon an 500mg alas 8:00 AM", "bcl")
+    normalize_batch(["Tawag sa 911", "₱150.00"], "fil")
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Optional
+
+SUPPORTED_LANGUAGES = ("bcl", "fil", "eng")
+
+LANGUAGE_ALIASES = {
+    "bcl": "bcl", "bikol": "bcl", "bicol": "bcl",
+    "fil": "fil", "tgl": "fil", "tagalog": "fil", "filipino": "fil",
+    "eng": "eng", "en": "eng", "english": "eng",
+}
+
+# Number words in different languages
+NUMBER_WORDS = {
+    "eng": {
+        0: "zero", 1: "one", 2: "two", 3: "three", 4: "four",
+        5: "five", 6: "six", 7: "seven", 8: "eight", 9: "nine",
+        10: "ten", 11: "eleven", 12: "twelve", 13: "thirteen", 14: "fourteen",
+        15: "fifteen", 16: "sixteen", 17: "seventeen", 18: "eighteen", 19: "nineteen",
+        20: "twenty", 30: "thirty", 40: "forty", 50: "fifty", 60: "sixty",
+        70: "seventy", 80: "eighty", 90: "ninety",
+        100: "hundred", 1000: "thousand", 1000000: "million", 1000000000: "billion",
+    },
+    "fil": {
+        0: "sero", 1: "isa", 2: "dalawa", 3: "tatlo", 4: "apat",
+        5: "lima", 6: "anim", 7: "pito", 8: "walo", 9: "siyam",
+        10: "sampu", 11: "labing-isa", 12: "labindalawa", 13: "labintatlo", 14: "labing-apat",
+        15: "labinlima", 16: "labing-anim", 17: "labimpito", 18: "labing-walo", 19: "labinsiyam",
+        20: "dalawampu", 30: "tatlumpu", 40: "apatnapu", 50: "limampu", 60: "animnapu",
+        70: "pitumpu", 80: "walumpu", 90: "siyamnapu",
+        100: "daan", 1000: "libo", 1000000: "milyon", 1000000000: "bilyon",
+    },
+    "bcl": {
+        0: "sero", 1: "saro", 2: "duwa", 3: "tulo", 4: "apat",
+        5: "lima", 6: "anom", 7: "pito", 8: "walo", 9: "siyam",
+        10: "sampulo", 11: "kagsaro", 12: "kagduwa", 13: "kagtulo", 14: "kag-apat",
+        15: "kaglima", 16: "kag-anom", 17: "kagpito", 18: "kagwalo", 19: "kagsiyam",
+        20: "duwampulo", 30: "tulompulo", 40: "apatnapulo", 50: "limampulo", 60: "anompulo",
+        70: "pitompulo", 80: "walompulo", 90: "siyamnapulo",
+        100: "gatos", 1000: "ribo", 1000000: "milyon", 1000000000: "bilyon",
+    },
+}
+
+# Per-language words used around numbers
+LANGUAGE_WORDS = {
+    "eng": {
+        "and": "and", "point": "point", "plus": "plus",
+        "peso": "peso", "pesos": "pesos", "centavos": "centavos",
+        "am": "a m", "pm": "p m",
+        "months": ["January", "February", "March", "April", "May", "June", "July",
+                   "August", "September", "October", "November", "December"],
+    },
+    "fil": {
+        "and": "at", "point": "punto", "plus": "plus",
+        "peso": "piso", "pesos": "piso", "centavos": "sentimo",
+        "am": "ng umaga", "pm": "ng hapon",
+        "months": ["Enero", "Pebrero", "Marso", "Abril", "Mayo", "Hunyo", "Hulyo",
+                   "Agosto", "Setyembre", "Oktubre", "Nobyembre", "Disyembre"],
+    },
+    "bcl": {
+        "and": "asin", "point": "punto", "plus": "plus",
+        "peso": "peso", "pesos": "pesos", "centavos": "sentimos",
+        "am": "sa aga", "pm": "sa hapon",
+        "months": ["Enero", "Pebrero", "Marso", "Abril", "Mayo", "Hunyo", "Hulyo",
+                   "Agosto", "Setyembre", "Oktubre", "Nobyembre", "Disyembre"],
+    },
+}
+
+UNIT_WORDS = {
+    "eng": {
+        "mg": "milligrams", "mcg": "micrograms", "µg": "micrograms", "g": "grams", "kg": "kilograms",
+        "ml": "milliliters", "l": "liters", "cc": "c c", "iu": "I U", "%": "percent",
+    },
+    "fil": {
+        "mg": "milligrams", "mcg": "micrograms", "µg": "micrograms", "g": "gramo", "kg": "kilo",
+        "ml": "milliliters", "l": "litro", "cc": "c c", "iu": "I U", "%": "porsyento",
+    },
+    "bcl": {
+        "mg": "milligrams", "mcg": "micrograms", "µg": "micrograms", "g": "gramo", "kg": "kilo",
+        "ml": "milliliters", "l": "litro", "cc": "c c", "iu": "I U", "%": "porsiyento",
+    },
+}
+
+# Short numbers that are always hotlines and read digit by digit
+HOTLINE_NUMBERS = frozenset({"911", "8888"})
+
+ENGLISH_ORDINAL_SUFFIXES = {
+    "one": "first", "two": "second", "three": "third", "five": "fifth",
+    "eight": "eighth", "nine": "ninth", "twelve": "twelfth",
+}
+
+# ============================================
+# Rules (one combined pattern, first alternative wins at each position)
+# ============================================
+
+_RULES = [
+    ("date_iso", r"\b(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2})\b"),
+    ("date_slash", r"\b(?P<sl_m>\d{1,2})/(?P<sl_d>\d{1,2})/(?P<sl_y>\d{4}|\d{2})\b"),
+    ("time", r"\b(?P<t_h>[01]?\d|2[0-3]):(?P<t_m>[0-5]\d)(?:\s?(?P<t_ampm>[AaPp])(?:[Mm]|\.[Mm]\.)(?![A-Za-z]))?"),
+    ("peso", r"(?:₱|\bPHP|\bPhp)\s?(?P<peso_int>\d{1,3}(?:,\d{3})+|\d+)(?:\.(?P<peso_cents>\d{1,2}))?(?!\d)"),
+    ("phone", r"(?:\+63[\s-]?|\b0)\d{2,3}[\s-]?\d{3}[\s-]?\d{4}\b"
+              r"|\(\d{2,4}\)\s?\d{3,4}[\s-]?\d{4}\b"
+              r"|\b\d{3,4}-\d{4}\b"
+              r"|\b\d{7,}\b"),
+    ("unit", r"(?P<u_val>\d+(?:\.\d+)?)\s?(?P<u_name>mg|mcg|µg|kg|g|ml|mL|L|cc|IU|%)(?![A-Za-z])"),
+    ("ordinal", r"\b(?P<ord>\d+)(?:st|nd|rd|th)\b"),
+    ("decimal", r"(?P<dec_int>\d+)\.(?P<dec_frac>\d+)"),
+    ("grouped", r"\b\d{1,3}(?:,\d{3})+\b"),
+    ("number", r"\d+"),
+]
+
+# The leading lookahead lets the scan skip positions that cannot start any rule
+# without trying every alternative there.
+NORMALIZE_PATTERN = re.compile(
+    r"(?=[\d₱+(P])(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in _RULES) + ")"
+)
+DIGIT_PATTERN = re.compile(r"\d")
+NUMBER_PATTERN = re.compile(r"\d+")
+WHITESPACE_PATTERN = re.compile(r"[ \t]{2,}")
+
+
+def _ligature(word: str) -> str:
+    """Filipino/Bikol linker: isa -> isang, anim -> anim na, tatlumpu't lima -> tatlumpu't limang."""
+    if word.endswith(("a", "e", "i", "o", "u")):
+        return word + "ng"
+    if word.endswith("n"):
+        return word + "g"
+    return word + " na"
+
+
+class TextNormalizer:
+    """Precompiled, table-driven TTS text normalizer for one language."""
+
+    def __init__(self, lang: str = "eng"):
+        self.lang = LANGUAGE_ALIASES.get(lang.lower(), "eng")
+        self.words = NUMBER_WORDS[self.lang]
+        self.lang_words = LANGUAGE_WORDS[self.lang]
+        self.units = UNIT_WORDS[self.lang]
+        self._digit_words = [self.words[d] for d in range(10)]
+        self._below_1000 = [self._compose_below_1000(n) for n in range(1000)]
+
+        self._handlers: dict[str, Callable[[re.Match], str]] = {
+            "date_iso": self._date_iso,
+            "date_slash": self._date_slash,
+            "time": self._time,
+            "peso": self._peso,
+            "phone": self._phone,
+            "unit": self._unit,
+            "ordinal": self._ordinal_match,
+            "decimal": self._decimal,
+            "grouped": self._grouped,
+            "number": self._number,
+        }
+
+    # ----------------------------------------
+    # Public API
+    # ----------------------------------------
+
+    def normalize(self, text: str) -> str:
+        """Spell out every number-like token in text."""
+        if not DIGIT_PATTERN.search(text):
+            return text
+        result = NORMALIZE_PATTERN.sub(self._dispatch, text)
+        return WHITESPACE_PATTERN.sub(" ", result)
+
+    def cardinal(self, num: int) -> str:
+        """Number to words, e.g. 1250 -> 'one thousand two hundred fifty'."""
+        if num < 0:
+            return f"negative {self.cardinal(-num)}"
+        if num < 1000:
+            return self._below_1000[num]
+
+        parts = []
+        remainder = num
+        for scale in (1000000000, 1000000, 1000):
+            count, remainder = divmod(remainder, scale)
+            if count:
+                parts.append(self._scaled(count, scale))
+        if remainder:
+            parts.append(self._join_remainder(self._below_1000[remainder], remainder))
+        return " ".join(parts)
+
+    def ordinal(self, num: int) -> str:
+        """Ordinal words, e.g. 2 -> 'second' / 'ika-duwa'."""
+        if self.lang == "eng":
+            words = self.cardinal(num).split(" ")
+            last = words[-1]
+            if last in ENGLISH_ORDINAL_SUFFIXES:
+                words[-1] = ENGLISH_ORDINAL_SUFFIXES[last]
+            elif last.endswith("y"):
+                words[-1] = last[:-1] + "ieth"
+            else:
+                words[-1] = last + "th"
+            return " ".join(words)
+        if num == 1:
+            return "una" if self.lang == "fil" else "enot"
+        return f"ika-{self.cardinal(num)}"
+
+    def digits(self, text: str) -> str:
+        """Read every digit in text individually (phone numbers)."""
+        return " ".join(self._digit_words[int(d)] for d in text if d.isdigit())
+
+    # ----------------------------------------
+    # Number composition
+    # ----------------------------------------
+
+    def _compose_below_1000(self, num: int) -> str:
+        words = self.words
+        if num < 100:
+            if num in words:
+                return words[num]
+            tens, ones = divmod(num, 10)
+            if self.lang == "fil":
+                return f"{words[tens * 10]}'t {words[ones]}"
+            if self.lang == "bcl":
+                return f"{words[tens * 10]} may {words[ones]}"
+            return f"{words[tens * 10]} {words[ones]}"
+
+        hundreds, remainder = divmod(num, 100)
+        head = self._scaled(hundreds, 100)
+        if remainder == 0:
+            return head
+        return f"{head} {self._join_remainder(self._compose_below_1000(remainder), remainder)}"
+
+    def _scaled(self, count: int, scale: int) -> str:
+        """'two hundred', 'dalawang daan', 'sanribo' ..."""
+        scale_word = self.words[scale]
+        # Hundreds are composed while the below-1000 table is being built, so single
+        # digits come straight from the word table.
+        count_words = self.words[count] if count < 10 else self.cardinal(count)
+        if self.lang == "eng":
+            return f"{count_words} {scale_word}"
+
+        if count == 1:
+            if self.lang == "bcl" and scale in (100, 1000):
+                return {100: "sanggatos", 1000: "sanribo"}[scale]
+            one = "isang" if self.lang == "fil" else "sarong"
+            return f"{one} {scale_word}"
+
+        linked = _ligature(count_words)
+        if self.lang == "fil" and scale == 100 and linked.endswith(" na"):
+            scale_word = "raan"
+        return f"{linked} {scale_word}"
+
+    def _join_remainder(self, words: str, remainder: int) -> str:
+        """Filipino/Bikol put 'at'/'asin' before a trailing part below 100."""
+        if self.lang != "eng" and remainder < 100:
+            return f"{self.lang_words['and']} {words}"
+        return words
+
+    def _year(self, year: int) -> str:
+        if self.lang == "eng" and 1100 <= year <= 2999 and not (2000 <= year <= 2009):
+            high, low = divmod(year, 100)
+            if low == 0:
+                return f"{self.cardinal(high)} hundred"
+            low_words = f"oh {self.cardinal(low)}" if low < 10 else self.cardinal(low)
+            return f"{self.cardinal(high)} {low_words}"
+        return self.cardinal(year)
+
+    def _date(self, year: int, month: int, day: int, original: str) -> str:
+        if not (1 <= month <= 12 and 1 <= day <= 31):
+            return self._numbers_only(original)
+        month_name = self.lang_words["months"][month - 1]
+        if self.lang == "eng":
+            return f"{month_name} {self.ordinal(day)}, {self._year(year)}"
+        day_words = f"ika-{self.cardinal(day)}"
+        connector = "ng" if self.lang == "fil" else "kan"
+        return f"{day_words} {connector} {month_name}, {self._year(year)}"
+
+    def _numbers_only(self, text: str) -> str:
+        return NUMBER_PATTERN.sub(lambda m: self.cardinal(int(m.group(0))), text)
+
+    # ----------------------------------------
+    # Rule handlers
+    # ----------------------------------------
+
+    def _dispatch(self, match: re.Match) -> str:
+        spoken = self._handlers[match.lastgroup](match)
+        # Keep words apart when digits were glued to letters ("COVID19" -> "COVID nineteen")
+        text, start, end = match.string, match.start(), match.end()
+        if start > 0 and text[start - 1].isalpha():
+            spoken = " " + spoken
+        if end < len(text) and text[end].isalpha():
+            spoken = spoken + " "
+        return spoken
+
+    def _date_iso(self, m: re.Match) -> str:
+        return self._date(int(m.group("iso_y")), int(m.group("iso_m")), int(m.group("iso_d")), m.group(0))
+
+    def _date_slash(self, m: re.Match) -> str:
+        year = int(m.group("sl_y"))
+        if len(m.group("sl_y")) == 2:
+            year += 2000
+        return self._date(year, int(m.group("sl_m")), int(m.group("sl_d")), m.group(0))
+
+    def _time(self, m: re.Match) -> str:
+        hour, minute = int(m.group("t_h")), int(m.group("t_m"))
+        ampm = m.group("t_ampm")
+        suffix = ""
+        if ampm:
+            suffix = " " + self.lang_words["am" if ampm.lower() == "a" else "pm"]
+
+        if self.lang == "eng":
+            if minute == 0:
+                minute_words = "o'clock" if not ampm else ""
+            elif minute < 10:
+                minute_words = f"oh {self.cardinal(minute)}"
+            else:
+                minute_words = self.cardinal(minute)
+            spoken = f"{self.cardinal(hour)} {minute_words}".strip()
+            return spoken + suffix
+
+        spoken = f"alas {self.cardinal(hour)}"
+        if minute:
+            minute_unit = "minuto" if self.lang == "fil" else "minutos"
+            spoken += f" {self.lang_words['and']} {self.cardinal(minute)} {minute_unit}"
+        return spoken + suffix
+
+    def _peso(self, m: re.Match) -> str:
+        amount = int(m.group("peso_int").replace(",", ""))
+        unit = self.lang_words["peso" if amount == 1 else "pesos"]
+        spoken = f"{self.cardinal(amount)} {unit}"
+        cents = m.group("peso_cents")
+        if cents and int(cents):
+            cents_value = int(cents) * (10 if len(cents) == 1 else 1)
+            spoken += f" {self.lang_words['and']} {self.cardinal(cents_value)} {self.lang_words['centavos']}"
+        return spoken
+
+    def _phone(self, m: re.Match) -> str:
+        text = m.group(0)
+        spoken = self.digits(text)
+        if text.startswith("+"):
+            spoken = f"{self.lang_words['plus']} {spoken}"
+        return spoken
+
+    def _unit(self, m: re.Match) -> str:
+        value = m.group("u_val")
+        value_words = self._decimal_words(value) if "." in value else self.cardinal(int(value))
+        return f"{value_words} {self.units[m.group('u_name').lower()]}"
+
+    def _ordinal_match(self, m: re.Match) -> str:
+        return self.ordinal(int(m.group("ord")))
+
+    def _decimal_words(self, value: str) -> str:
+        integer, fraction = value.split(".", 1)
+        return f"{self.cardinal(int(integer))} {self.lang_words['point']} {self.digits(fraction)}"
+
+    def _decimal(self, m: re.Match) -> str:
+        return self._decimal_words(m.group(0))
+
+    def _grouped(self, m: re.Match) -> str:
+        return self.cardinal(int(m.group(0).replace(",", "")))
+
+    def _number(self, m: re.Match) -> str:
+        if m.group(0) in HOTLINE_NUMBERS:
+            return self.digits(m.group(0))
+        return self.cardinal(int(m.group(0)))
+
+
+@lru_cache(maxsize=None)
+def get_normalizer(lang: str = "eng") -> TextNormalizer:
+    """Shared normalizer instance per language (tables are built once)."""
+    return TextNormalizer(lang)
+
+
+def normalize_text(text: str, lang: str = "eng") -> str:
+    """Normalize one text for TTS in the given language (bcl, fil, eng)."""
+    return get_normalizer(lang).normalize(text)
+
+
+def normalize_batch(texts: list[str], lang: str = "eng") -> list[str]:
+    """Normalize many texts (e.g. streaming chunks or a pre-render corpus) with one normalizer."""
+    normalizer = get_normalizer(lang)
+    return [normalizer.normalize(text) for text in texts]
+
+
+def number_to_words(num: int, lang: str = "eng") -> str:
+    """Convert a number to words in the specified language."""
+    return get_normalizer(lang).cardinal(num)
+
+
+def digits_to_words(num_str: str, lang: Optional[str] = "eng") -> str:
+    """Convert each digit in a string to words (for phone numbers)."""
+    return get_normalizer(lang or "eng").digits(num_str)
@@ -0,0 +1,157 @@
+"""
+Batched NLLB Translation Inputs
+===============================
+
+Prepares text for NLLB generation in length-sorted batches:
+
+1. split_for_translation cuts text into sentences (keeping the separators,
+   so paragraphs and line breaks survive) and splits any sentence over
+   max_chars at clause boundaries, then between words. Nothing is truncated.
+2. length_sorted_batches groups sentences of similar token length, bounded by
+   sentence count and padded tokens per batch.
+3. encode_batch builds the encoder inputs ([src_lang] tokens </s>, right
+   padded) itself instead of setting tokenizer.src_lang, so one tokenizer
+   can serve concurrent requests in different languages.
+4. max_new_tokens_for gives each batch a generation budget proportional to
+   its longest input instead of a fixed max_length.
+
+request_chunks packs many short strings into as few Google Translate
+requests as its per-request limits allow.
+
+Usage:
+    from translation_batching import split_for_translation, join_segments, encode_batch
+
+    segments, separators = split_for_translation(text)
+    ...  # translate the segments
+    translated = join_segments(translations, separators)
+"""
+
+import re
+import math
+import logging
+from typing import Sequence
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends; the separator (whitespace or line breaks) is kept for reassembly
+SENTENCE_SPLIT_PATTERN = re.compile(r"((?<=[.!?])\s+|\s*\n+\s*)")
+CLAUSE_SPLIT_PATTERN = re.compile(r"(?<=[,;:])\s+")
+
+# A period after these doesn't end the sentence
+ABBREVIATIONS = ("Dr.", "Dra.", "Mr.", "Mrs.", "Ms.", "St.", "Sto.", "Sta.", "No.", "Brgy.", "Gov.", "Hon.", "vs.", "e.g.", "i.e.")
+
+
+def _split_long(sentence: str, max_chars: int) -> list[str]:
+    """Split an over-long sentence at clause boundaries, then between words."""
+    pieces: list[str] = []
+    for clause in CLAUSE_SPLIT_PATTERN.split(sentence):
+        words: list[str] = []
+        for word in clause.split():
+            if words and len(" ".join(words + [word])) > max_chars:
+                pieces.append(" ".join(words))
+                words = []
+            words.append(word)
+        if words:
+            if pieces and len(pieces[-1]) + 1 + len(" ".join(words)) <= max_chars:
+                pieces[-1] = f"{pieces[-1]} {' '.join(words)}"
+            else:
+                pieces.append(" ".join(words))
+    return pieces
+
+
+def split_for_translation(text: str, max_chars: int = 400) -> tuple[list[str], list[str]]:
+    """
+    (segments, separators) with len(separators) == len(segments) - 1, such that
+    join_segments(segments, separators) rebuilds the text. Segments may be empty
+    (e.g. leading blank lines); they don't need translating.
+    """
+    parts = SENTENCE_SPLIT_PATTERN.split(text.strip())
+    segments, separators = [parts[0]], []
+    for separator, sentence in zip(parts[1::2], parts[2::2]):
+        if "\n" not in separator and segments[-1].endswith(ABBREVIATIONS):
+            segments[-1] = f"{segments[-1]} {sentence}"
+        else:
+            separators.append(separator if "\n" in separator else " ")
+            segments.append(sentence)
+
+    if all(len(segment) <= max_chars for segment in segments):
+        return segments, separators
+
+    split_segments, split_separators = [], []
+    for i, segment in enumerate(segments):
+        pieces = _split_long(segment, max_chars) if len(segment) > max_chars else [segment]
+        if i:
+            split_separators.append(separators[i - 1])
+        split_segments.extend(pieces)
+        split_separators.extend([" "] * (len(pieces) - 1))
+    return split_segments, split_separators
+
+
+def join_segments(segments: Sequence[str], separators: Sequence[str]) -> str:
+    """Inverse of split_for_translation (applied to the translated segments)."""
+    out = [segments[0]] if segments else []
+    for separator, segment in zip(separators, segments[1:]):
+        out.append(separator)
+        out.append(segment)
+    return "".join(out).strip()
+
+
+def length_sorted_batches(lengths: Sequence[int], max_batch: int = 16, max_tokens: int = 4096) -> list[list[int]]:
+    """Indices sorted by length (longest first) and cut into batches of at most max_batch items / max_tokens padded tokens."""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches: list[list[int]] = []
+    for index in order:
+        # Longest first: the batch's first item sets its padded width
+        if batches and len(batches[-1]) < max_batch and (len(batches[-1]) + 1) * lengths[batches[-1][0]] <= max_tokens:
+            batches[-1].append(index)
+        else:
+            batches.append([index])
+    return batches
+
+
+def max_new_tokens_for(input_tokens: int, ratio: float = 2.0, margin: int = 16, cap: int = 512) -> int:
+    """Generation budget for inputs of up to input_tokens tokens."""
+    return min(int(math.ceil(input_tokens * ratio)) + margin, cap)
+
+
+def token_ids(tokenizer, texts: Sequence[str]) -> list[list[int]]:
+    """Subword ids without special tokens (no language state involved)."""
+    return tokenizer(list(texts), add_special_tokens=False)["input_ids"]
+
+
+def encode_batch(tokenizer, ids: Sequence[Sequence[int]], src_code: str, max_tokens: int = 512) -> dict[str, torch.Tensor]:
+    """
+    NLLB encoder inputs for pre-tokenized texts: [src_lang] ids </s>, right padded,
+    as the tokenizer would produce with src_lang set, without mutating it.
+    """
+    lang_id = tokenizer.convert_tokens_to_ids(src_code)
+    rows = []
+    for row in ids:
+        if len(row) + 2 > max_tokens:
+            logger.warning(f"Translation segment of {len(row)} tokens cut to {max_tokens - 2}")
+            row = row[:max_tokens - 2]
+        rows.append([lang_id, *row, tokenizer.eos_token_id])
+
+    width = max(len(row) for row in rows)
+    input_ids = torch.full((len(rows), width), tokenizer.pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(rows), width), dtype=torch.long)
+    for i, row in enumerate(rows):
+        input_ids[i, :len(row)] = torch.tensor(row, dtype=torch.long)
+        attention_mask[i, :len(row)] = 1
+    return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+def request_chunks(texts: Sequence[str], max_items: int = 128, max_chars: int = 5000) -> list[list[int]]:
+    """Consecutive indices cut into API requests of at most max_items strings / max_chars characters."""
+    chunks: list[list[int]] = []
+    chars = 0
+    for index, text in enumerate(texts):
+        if chunks and len(chunks[-1]) < max_items and chars + len(text) <= max_chars:
+            chunks[-1].append(index)
+            chars += len(text)
+        else:
+            chunks.append([index])
+            chars = len(text)
+    return chunks
@@ -0,0 +1,340 @@
+"""
+Translation Memory
+==================
+
+Persistent cache of translations, so the same chatbot answer about the same
+facility or medicine is translated once instead of on every request:
+- Hot tier: in-memory LRU of recent entries
+- Cold tier: SQLite database that survives restarts and redeploys (point
+  TRANSLATION_MEMORY_PATH at a persistent volume)
+
+Entries are keyed by (normalized source text, source language, target
+language, engine), so a Google result never stands in for an NLLB one and a
+model change starts from an empty memory for that engine. Machine
+translations expire after a TTL; curated translations seeded from the
+knowledge base (engine "kb") never do.
+
+Usage:
+    from translation_memory import TranslationMemory, collect_translation_pairs
+
+    memory = TranslationMemory.from_env()
+    memory.seed(collect_translation_pairs("data/knowledge-base"))
+
+    translated = memory.get(text, "eng_Latn", "bcl_Latn", "facebook/nllb-200-distilled-600M")
+    if translated is None:
+        translated = translate(...)
+        memory.put(text, "eng_Latn", "bcl_Latn", "facebook/nllb-200-distilled-600M", translated)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from itertools import permutations
+from typing import Iterable, Optional
+
+from audio_pack import PHRASE_LANGUAGE_FIELDS, phrase_entries
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_PATH = os.path.join(tempfile.gettempdir(), "mynaga-translation-memory.sqlite3")
+
+# Keys per SELECT ... IN (...) (SQLite's default limit is 999 parameters)
+DB_QUERY_KEYS = 500
+
+# Engine name for curated translations from the knowledge base
+SEEDED_ENGINE = "kb"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY,
+    source_text TEXT NOT NULL,
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL
+)
+"""
+
+
+def normalize_source_text(text: str) -> str:
+    """NFC and collapsed whitespace, so trivially different inputs share an entry."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def collect_translation_pairs(knowledge_base_dir: str) -> list[tuple[str, str, str, str]]:
+    """
+    (source text, source lang, target lang, translation) for every pair of
+    languages of every phrase in bikol-phrases/*.json, with bcl/fil/eng codes.
+    """
+    phrases_dir = os.path.join(knowledge_base_dir, "bikol-phrases")
+    pairs = []
+    for filename in sorted(os.listdir(phrases_dir)):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(phrases_dir, filename), encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in phrase_entries(data):
+            texts = {
+                language: entry[field].strip()
+                for field, language in PHRASE_LANGUAGE_FIELDS.items()
+                if isinstance(entry.get(field), str) and entry[field].strip()
+            }
+            for source, target in permutations(texts, 2):
+                pairs.append((texts[source], source, target, texts[target]))
+    return pairs
+
+
+class TranslationMemory:
+    """Entry-bounded memory LRU in front of a SQLite store, with per-entry expiry."""
+
+    def __init__(self, db_path: Optional[str], memory_entries: int, ttl_s: float):
+        """
+        Args:
+            db_path: SQLite file for the persistent tier (None or "" keeps the memory tier only)
+            memory_entries: Maximum entries in the in-memory LRU (0 disables it)
+            ttl_s: Lifetime of machine translations in seconds (0 = never expire)
+        """
+        self.db_path = db_path or None
+        self.memory_entries = max(memory_entries, 0)
+        self.ttl_s = ttl_s
+
+        # key -> (translation, expires_at or None)
+        self._memory: "OrderedDict[str, tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()  # memory tier and stats
+        # The connection; held only for store I/O, so memory hits never wait on a seed or a write
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid = 0
+
+        self.stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "expired": 0, "stores": 0, "seeded": 0}
+
+        if self.db_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+                with self._db_lock:
+                    self._connection()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Translation memory store disabled ({self.db_path}): {e}")
+                self.db_path = None
+
+    @classmethod
+    def from_env(cls) -> "TranslationMemory":
+        """Build from TRANSLATION_MEMORY_PATH, TRANSLATION_MEMORY_ENTRIES and TRANSLATION_MEMORY_TTL_DAYS."""
+        ttl_days = float(os.environ.get("TRANSLATION_MEMORY_TTL_DAYS", "30"))
+        return cls(
+            db_path=os.environ.get("TRANSLATION_MEMORY_PATH", DEFAULT_MEMORY_PATH),
+            memory_entries=int(os.environ.get("TRANSLATION_MEMORY_ENTRIES", "4096")),
+            ttl_s=ttl_days * 86400,
+        )
+
+    @staticmethod
+    def make_key(text: str, source_lang: str, target_lang: str, engine: str) -> str:
+        payload = "\x1f".join([normalize_source_text(text), source_lang, target_lang, engine])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ----------------------------------------
+    # Lookup / store
+    # ----------------------------------------
+
+    def get(self, text: str, source_lang: str, target_lang: str, engine: str) -> Optional[str]:
+        """Cached translation, or None on a miss or an expired entry."""
+        return self.get_many([text], source_lang, target_lang, engine)[0]
+
+    def get_many(self, texts: list[str], source_lang: str, target_lang: str, engine: str,
+                 memory_only: bool = False) -> list[Optional[str]]:
+        """
+        Cached translations in input order (None for misses and expired entries), with one
+        store query for everything the memory tier doesn't hold. memory_only skips the store
+        (no I/O, fine on an event loop) and, if there is one, leaves the misses uncounted for
+        the store lookup that follows.
+        """
+        keys = [self.make_key(text, source_lang, target_lang, engine) for text in texts]
+        results: list[Optional[str]] = [None] * len(keys)
+        missing = []
+        now = time.time()
+
+        with self._lock:
+            for j, key in enumerate(keys):
+                cached = self._memory.get(key)
+                if cached is not None:
+                    translation, expires_at = cached
+                    if expires_at is None or expires_at > now:
+                        self._memory.move_to_end(key)
+                        self.stats["memory_hits"] += 1
+                        results[j] = translation
+                        continue
+                    del self._memory[key]
+                    self.stats["expired"] += 1
+                missing.append(j)
+        if not missing or (memory_only and self.db_path):
+            return results
+
+        rows = self._db_get([keys[j] for j in missing])
+        with self._lock:
+            for j in missing:
+                row = rows.get(keys[j])
+                if row is None:
+                    self.stats["misses"] += 1
+                    continue
+                translation, expires_at = row
+                if expires_at is not None and expires_at <= now:
+                    self.stats["expired"] += 1
+                    self.stats["misses"] += 1
+                    continue
+                self.stats["db_hits"] += 1
+                self._memory_put(keys[j], translation, expires_at)
+                results[j] = translation
+        return results
+
+    def put(self, text: str, source_lang: str, target_lang: str, engine: str, translation: str,
+            ttl_s: Optional[float] = None) -> None:
+        """Store a translation in both tiers; ttl_s overrides the default lifetime (0 = never expire)."""
+        self.put_many([(text, translation)], source_lang, target_lang, engine, ttl_s=ttl_s)
+
+    def put_many(self, translations: Iterable[tuple[str, str]], source_lang: str, target_lang: str, engine: str,
+                 ttl_s: Optional[float] = None) -> None:
+        """Store (text, translation) pairs in both tiers with a single store transaction."""
+        ttl_s = self.ttl_s if ttl_s is None else ttl_s
+        now = time.time()
+        expires_at = now + ttl_s if ttl_s > 0 else None
+        rows = [
+            (self.make_key(text, source_lang, target_lang, engine), normalize_source_text(text),
+             source_lang, target_lang, engine, translation, now, expires_at)
+            for text, translation in translations
+        ]
+
+        with self._lock:
+            for row in rows:
+                self._memory_put(row[0], row[5], expires_at)
+            self.stats["stores"] += len(rows)
+        self._db_write(rows)
+
+    def seed(self, pairs: Iterable[tuple[str, str, str, str]], engine: str = SEEDED_ENGINE) -> int:
+        """Store curated (text, source lang, target lang, translation) pairs that never expire; returns the count."""
+        now = time.time()
+        rows = [
+            (self.make_key(text, source, target, engine), normalize_source_text(text), source, target, engine, translation, now, None)
+            for text, source, target, translation in pairs
+        ]
+        if self.db_path:
+            self._db_write(rows)
+        with self._lock:
+            if not self.db_path:
+                for key, _, _, _, _, translation, _, _ in rows:
+                    self._memory_put(key, translation, None)
+            self.stats["seeded"] += len(rows)
+        return len(rows)
+
+    def purge_expired(self) -> int:
+        """Delete expired entries from the store; returns how many were removed."""
+        if not self.db_path:
+            return 0
+        with self._db_lock:
+            try:
+                conn = self._connection()
+                with conn:
+                    cursor = conn.execute(
+                        "DELETE FROM translations WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+                    )
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                logger.warning(f"Translation memory purge failed: {e}")
+                return 0
+
+    def snapshot(self) -> dict:
+        """Counters and sizes for /health."""
+        stored = None
+        if self.db_path:
+            with self._db_lock:
+                try:
+                    stored = self._connection().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+        with self._lock:
+            return {
+                **self.stats,
+                "memory_entries": len(self._memory),
+                "memory_max_entries": self.memory_entries,
+                "db_enabled": self.db_path is not None,
+                "db_entries": stored,
+            }
+
+    def clear_memory(self) -> None:
+        """Drop the hot tier (the store survives restarts by design)."""
+        with self._lock:
+            self._memory.clear()
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ----------------------------------------
+    # Hot tier (caller holds self._lock)
+    # ----------------------------------------
+
+    def _memory_put(self, key: str, translation: str, expires_at: Optional[float]) -> None:
+        if not self.memory_entries:
+            return
+        self._memory[key] = (translation, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    # ----------------------------------------
+    # Store (_connection's callers hold self._db_lock)
+    # ----------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not cross fork(): pre-forked workers each open their own
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(SCHEMA)
+            conn.commit()
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def _db_get(self, keys: list[str]) -> dict[str, tuple[str, Optional[float]]]:
+        """key -> (translation, expires_at) for the keys in the store."""
+        if not self.db_path or not keys:
+            return {}
+        found = {}
+        try:
+            with self._db_lock:
+                conn = self._connection()
+                for start in range(0, len(keys), DB_QUERY_KEYS):
+                    chunk = keys[start:start + DB_QUERY_KEYS]
+                    found.update(
+                        (key, (translation, expires_at))
+                        for key, translation, expires_at in conn.execute(
+                            "SELECT key, translation, expires_at FROM translations "
+                            f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                            chunk,
+                        )
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Translation memory read failed: {e}")
+        return found
+
+    def _db_write(self, rows: list[tuple]) -> None:
+        if not self.db_path or not rows:
+            return
+        try:
+            with self._db_lock:
+                conn = self._connection()
+                with conn:
+                    conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Translation memory write failed: {e}")
@@ -0,0 +1,214 @@
+"""
+Tiered Translation
+==================
+
+Translation requests are answered by the cheapest tier that can:
+1. memory - exact hit in the translation memory (curated knowledge-base
+   phrases, or a machine translation made before)
+2. phrase - the text is covered by entries of the Bikol phrase tables
+   (BikolTranslator's translation_mappings.json plus the curated phrases of
+   bikol_corpus.json), matched longest phrase first
+3. google / nllb - machine translation
+
+PhraseTable only answers when at least min_coverage of the words are matched
+and the text needs at most max_pieces table entries. The default of one
+answers only texts that are a whole table entry: gluing entries together drops
+whatever joins them in Bikol ("good morning" would become "Maray aga", without
+the linker "na"), so anything longer goes to the model. TierStats counts hits
+and time spent per tier.
+
+Usage:
+    from translation_tiers import PhraseTable, TierStats
+
+    table = PhraseTable.from_files("data/knowledge-base/bikol-phrases/translation_mappings.json",
+                                   "data/output/bikol/bikol_corpus.json")
+    table.translate("kulog nin payo", "bcl", "eng")  # "headache"
+
+    stats = TierStats()
+    stats.record("phrase", count=1, seconds=0.0001)
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from typing import Iterable, Optional
+
+from bikol_translator import BikolTranslator
+
+logger = logging.getLogger(__name__)
+
+# Cheapest first
+TIERS = ("memory", "phrase", "google", "nllb")
+
+# BikolTranslator mapping name -> (source, target) in bcl/fil/eng codes
+MAPPING_DIRECTIONS = {
+    "bikol_to_filipino": ("bcl", "fil"),
+    "bikol_to_english": ("bcl", "eng"),
+    "filipino_to_bikol": ("fil", "bcl"),
+    "english_to_bikol": ("eng", "bcl"),
+}
+
+# Corpus entry fields -> language codes
+CORPUS_FIELDS = {"bikol": "bcl", "filipino": "fil", "english": "eng"}
+
+WORD_PATTERN = re.compile(r"[^\W_]+(?:['-][^\W_]+)*")
+
+
+def _variants(entry: str) -> list[str]:
+    """Lowercased alternatives of a table entry: "teeth/tooth (pl.)" -> ["teeth", "tooth"]."""
+    entry = re.sub(r"\([^)]*\)", " ", entry)
+    return [" ".join(part.lower().split()) for part in entry.split("/") if part.strip()]
+
+
+def _words(text: str) -> list[str]:
+    return [word.lower() for word in WORD_PATTERN.findall(text)]
+
+
+class PhraseTable:
+    """Longest-match phrase lookup per (source, target) language pair."""
+
+    def __init__(self, pairs: Iterable[tuple[str, str, str, str]], min_coverage: float = 1.0, max_pieces: int = 1):
+        """
+        Args:
+            pairs: (source text, source lang, target lang, translation) entries
+            min_coverage: Fraction of the words that must be matched (1.0 = all)
+            max_pieces: Most table entries one translation may be built from
+        """
+        self.min_coverage = min_coverage
+        self.max_pieces = max(max_pieces, 1)
+
+        # (source, target) -> {tuple of words: translation}; the first entry for a phrase wins
+        self._tables: dict[tuple[str, str], dict[tuple[str, ...], str]] = {}
+        self._longest: dict[tuple[str, str], int] = {}
+        for text, source, target, translation in pairs:
+            rendered = _variants(translation)
+            if not rendered:
+                continue
+            table = self._tables.setdefault((source, target), {})
+            for variant in _variants(text):
+                words = tuple(_words(variant))
+                if words and words not in table:
+                    table[words] = rendered[0]
+                    self._longest[(source, target)] = max(self._longest.get((source, target), 0), len(words))
+
+    @classmethod
+    def from_files(cls, mappings_path: str, corpus_path: Optional[str] = None,
+                   min_coverage: float = 1.0, max_pieces: int = 1) -> "PhraseTable":
+        """Build from BikolTranslator's mappings file and (optionally) bikol_corpus.json."""
+        pairs = []
+        mappings = BikolTranslator(mappings_path).mappings
+        for name, (source, target) in MAPPING_DIRECTIONS.items():
+            for text, translation in mappings.get(name, {}).items():
+                pairs.append((text, source, target, translation))
+
+        if corpus_path and os.path.exists(corpus_path):
+            with open(corpus_path, encoding="utf-8") as f:
+                corpus = json.load(f)
+            for entry in corpus.get("health_phrases", []) + corpus.get("dictionary", []):
+                texts = {code: entry[field] for field, code in CORPUS_FIELDS.items() if isinstance(entry.get(field), str)}
+                for source, text in texts.items():
+                    for target, translation in texts.items():
+                        if source != target:
+                            pairs.append((text, source, target, translation))
+
+        table = cls(pairs, min_coverage=min_coverage, max_pieces=max_pieces)
+        logger.info(f"Phrase table: {table.snapshot()['entries']}")
+        return table
+
+    def supports(self, source: str, target: str) -> bool:
+        return (source, target) in self._tables
+
+    def translate(self, text: str, source: str, target: str) -> Optional[str]:
+        """Translation assembled from table entries, or None if the text isn't covered well enough."""
+        table = self._tables.get((source, target))
+        if not table:
+            return None
+
+        matches = list(WORD_PATTERN.finditer(text))
+        if not matches:
+            return None
+        words = [match.group().lower() for match in matches]
+
+        out: list[str] = []
+        position = 0  # character offset in text
+        matched_words = pieces = 0
+        i = 0
+        while i < len(words):
+            for n in range(min(self._longest[(source, target)], len(words) - i), 0, -1):
+                translation = table.get(tuple(words[i:i + n]))
+                if translation is not None:
+                    break
+            else:
+                n, translation = 1, None
+
+            start, end = matches[i].start(), matches[i + n - 1].end()
+            out.append(text[position:start])
+            if translation is None:
+                out.append(text[start:end])
+            else:
+                pieces += 1
+                matched_words += n
+                if pieces > self.max_pieces:
+                    return None
+                # Keep a leading capital
+                out.append(translation[:1].upper() + translation[1:] if text[start].isupper() else translation)
+            position = end
+            i += n
+
+        if matched_words < self.min_coverage * len(words):
+            return None
+        out.append(text[position:])
+        return "".join(out)
+
+    def snapshot(self) -> dict:
+        return {
+            "entries": {f"{source}->{target}": len(table) for (source, target), table in self._tables.items()},
+            "min_coverage": self.min_coverage,
+            "max_pieces": self.max_pieces,
+        }
+
+
+class TierStats:
+    """Thread-safe hit counts and time per translation tier."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = {tier: 0 for tier in TIERS}
+        self._seconds = {tier: 0.0 for tier in TIERS}
+        self.requests = 0
+        self.texts = 0
+
+    def record_request(self, texts: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.texts += texts
+
+    def record(self, tier: str, count: int, seconds: float) -> None:
+        """count texts answered by tier, which spent seconds on them."""
+        with self._lock:
+            self._hits[tier] += count
+            self._seconds[tier] += seconds
+
+    def snapshot(self) -> dict:
+        """Per tier: hits, share of translated texts and mean latency per text; plus model time saved."""
+        with self._lock:
+            answered = sum(self._hits.values())
+            tiers = {
+                tier: {
+                    "hits": self._hits[tier],
+                    "hit_rate": round(self._hits[tier] / answered, 4) if answered else 0.0,
+                    "mean_ms": round(1000 * self._seconds[tier] / self._hits[tier], 3) if self._hits[tier] else None,
+                }
+                for tier in TIERS
+            }
+            # What the texts answered without a model would have cost at the NLLB rate seen so far
+            nllb_ms = tiers["nllb"]["mean_ms"]
+            saved = self._hits["memory"] + self._hits["phrase"]
+            return {
+                "requests": self.requests,
+                "texts": self.texts,
+                "tiers": tiers,
+                "estimated_model_ms_saved": round(saved * nllb_ms, 1) if nllb_ms is not None else None,
+            }
@@ -0,0 +1,174 @@
+"""
+TTS Micro-Batching Scheduler
+============================
+
+Collects concurrent TTS requests per language for a short window (or until a
+batch/token budget fills) and synthesizes them in one padded VITS forward
+pass. Each caller gets back only its own trimmed waveform.
+
+Usage:
+    from tts_batcher import TTSBatcher
+
+    batcher = TTSBatcher(run_batch=synthesize_waveforms, window_ms=10, max_batch_size=8)
+    waveform, sampling_rate = await batcher.submit("Maray na aga", "bcl")
+"""
+
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from inference_pool import InferencePool
+
+logger = logging.getLogger(__name__)
+
+# run_batch(language, texts) -> one result per text, in order
+BatchRunner = Callable[[str, list[str]], list[Any]]
+
+
+@dataclass
+class _PendingRequest:
+    text: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class TTSBatcher:
+    """Per-language dynamic micro-batching in front of a blocking batch synthesizer."""
+
+    def __init__(
+        self,
+        run_batch: BatchRunner,
+        window_ms: float = 10.0,
+        max_batch_size: int = 8,
+        max_batch_tokens: int = 2000,
+        pool: Optional[InferencePool] = None,
+    ):
+        """
+        Args:
+            run_batch: Blocking function synthesizing a list of texts for one language
+            window_ms: How long to wait for more requests after the first one arrives
+            max_batch_size: Maximum number of requests per forward pass
+            max_batch_tokens: Maximum total input length (characters ~ VITS tokens) per batch
+            pool: Inference pool that runs run_batch (None uses the event loop's default executor)
+        """
+        self.run_batch = run_batch
+        self.window_s = max(window_ms, 0.0) / 1000.0
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_batch_tokens = max(max_batch_tokens, 1)
+        self.pool = pool
+
+        self._queues: dict[str, list[_PendingRequest]] = {}
+        self._full_events: dict[str, asyncio.Event] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+
+        self.stats = {"requests": 0, "batches": 0, "max_batch_size_seen": 0}
+
+    async def submit(self, text: str, language: str) -> Any:
+        """Queue one text for synthesis and wait for its own result."""
+        loop = asyncio.get_running_loop()
+        pending = _PendingRequest(text=text, future=loop.create_future())
+
+        queue = self._queues.setdefault(language, [])
+        queue.append(pending)
+        self.stats["requests"] += 1
+
+        worker = self._workers.get(language)
+        if worker is None or worker.done():
+            self._workers[language] = asyncio.create_task(self._drain(language))
+        elif self._batch_full(queue) and language in self._full_events:
+            self._full_events[language].set()
+
+        return await pending.future
+
+    def snapshot(self) -> dict:
+        """Counters for /health."""
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "avg_batch_size": round(self.stats["requests"] / batches, 2) if batches else 0.0,
+            "queued": {lang: len(q) for lang, q in self._queues.items() if q},
+            "window_ms": self.window_s * 1000.0,
+            "max_batch_size": self.max_batch_size,
+            "max_batch_tokens": self.max_batch_tokens,
+        }
+
+    # ----------------------------------------
+    # Internals
+    # ----------------------------------------
+
+    def _batch_full(self, queue: list[_PendingRequest]) -> bool:
+        if len(queue) >= self.max_batch_size:
+            return True
+        return sum(len(p.text) for p in queue) >= self.max_batch_tokens
+
+    def _take_batch(self, queue: list[_PendingRequest]) -> list[_PendingRequest]:
+        """Pop the longest prefix of the queue that fits the batch and token budgets."""
+        batch: list[_PendingRequest] = []
+        tokens = 0
+        while queue and len(batch) < self.max_batch_size:
+            next_tokens = len(queue[0].text)
+            if batch and tokens + next_tokens > self.max_batch_tokens:
+                break
+            pending = queue.pop(0)
+            if pending.future.done():  # caller went away while queued
+                continue
+            batch.append(pending)
+            tokens += next_tokens
+        return batch
+
+    async def _drain(self, language: str) -> None:
+        """Worker loop for one language: wait out the window, run a batch, repeat."""
+        queue = self._queues[language]
+        full_event = asyncio.Event()
+        self._full_events[language] = full_event
+
+        try:
+            await self._drain_queue(language, queue, full_event)
+        except BaseException as e:
+            # Never leave callers waiting on a worker that died
+            error = e if isinstance(e, Exception) else RuntimeError("TTS batcher stopped")
+            for pending in queue:
+                if not pending.future.done():
+                    pending.future.set_exception(error)
+            queue.clear()
+            raise
+        finally:
+            self._full_events.pop(language, None)
+
+    async def _drain_queue(self, language: str, queue: list[_PendingRequest], full_event: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        while queue:
+            full_event.clear()
+            if not self._batch_full(queue):
+                remaining = queue[0].enqueued_at + self.window_s - time.monotonic()
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(full_event.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+
+            batch = self._take_batch(queue)
+            if not batch:
+                continue
+
+            self.stats["batches"] += 1
+            self.stats["max_batch_size_seen"] = max(self.stats["max_batch_size_seen"], len(batch))
+
+            try:
+                texts = [p.text for p in batch]
+                if self.pool is not None:
+                    results = await self.pool.run(self.run_batch, language, texts)
+                else:
+                    results = await loop.run_in_executor(None, self.run_batch, language, texts)
+            except Exception as e:
+                logger.error(f"TTS batch failed (lang={language}, size={len(batch)}): {e}")
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                continue
+
+            for pending, result in zip(batch, results):
+                if not pending.future.done():
+                    pending.future.set_result(result)
@@ -0,0 +1,296 @@
+"""
+TTS Audio Cache
+===============
+
+Two-tier, content-addressed cache for synthesized speech:
+- Hot tier: in-memory LRU bounded by total bytes
+- Cold tier: directory of encoded audio files bounded by total size
+
+Keys are derived from the normalized text, language, model id and model
+revision, so the same phrase spoken by the same model is only synthesized once.
+
+The cold tier keeps an in-memory index (key -> size, least recently used
+first) built from the directory at startup, so a write that pushes it over
+budget evicts down to DISK_LOW_WATER of the budget from the index instead of
+rescanning the directory. Disk reads and writes block: async callers check
+the hot tier with get(key, memory_only=True) and run the rest in a thread.
+
+Usage:
+    from tts_cache import TTSAudioCache
+
+    cache = TTSAudioCache.from_env()
+    key = cache.make_key(text, "bcl", "facebook/mms-tts-bcl", "main")
+    audio = cache.get(key)
+    if audio is None:
+        audio = synthesize(...)
+        cache.put(key, audio)
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "mynaga-tts-cache")
+AUDIO_FILE_SUFFIX = ".audio"
+
+# An over-budget cold tier is evicted down to this fraction of its budget, so
+# eviction runs once per batch of writes rather than on every one
+DISK_LOW_WATER = 0.9
+
+
+def normalize_cache_text(text: str) -> str:
+    """Collapse whitespace so trivially different inputs share a cache entry."""
+    return " ".join(text.split())
+
+
+class TTSAudioCache:
+    """Byte-bounded memory LRU in front of a size-capped on-disk store."""
+
+    def __init__(self, memory_max_bytes: int, disk_dir: Optional[str], disk_max_bytes: int):
+        """
+        Args:
+            memory_max_bytes: Maximum total size of entries kept in memory (0 disables the hot tier)
+            disk_dir: Directory for the cold tier (None or "" disables it)
+            disk_max_bytes: Maximum total size of the cold tier directory
+        """
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_dir = disk_dir or None
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        # Cold tier index: key -> size, least recently used first
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                self._load_disk_index()
+            except OSError as e:
+                logger.warning(f"TTS disk cache disabled ({self.disk_dir}): {e}")
+                self.disk_dir = None
+
+    @classmethod
+    def from_env(cls) -> "TTSAudioCache":
+        """Build a cache from TTS_CACHE_MEMORY_MB, TTS_CACHE_DIR and TTS_CACHE_DISK_MB."""
+        memory_mb = float(os.environ.get("TTS_CACHE_MEMORY_MB", "64"))
+        disk_mb = float(os.environ.get("TTS_CACHE_DISK_MB", "512"))
+        disk_dir = os.environ.get("TTS_CACHE_DIR", DEFAULT_CACHE_DIR)
+        return cls(
+            memory_max_bytes=int(memory_mb * 1024 * 1024),
+            disk_dir=disk_dir if disk_mb > 0 else None,
+            disk_max_bytes=int(disk_mb * 1024 * 1024),
+        )
+
+    @staticmethod
+    def make_key(text: str, language: str, model_id: str, revision: str, variant: str = "") -> str:
+        """
+        Content-addressed key for a synthesized utterance.
+        `variant` distinguishes encodings of the same utterance (e.g. output format).
+        """
+        payload = "\x1f".join([normalize_cache_text(text), language, model_id, revision, variant])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ----------------------------------------
+    # Lookup / store
+    # ----------------------------------------
+
+    def get(self, key: str, memory_only: bool = False) -> Optional[bytes]:
+        """
+        Return cached audio, promoting cold-tier hits into memory. memory_only skips the
+        cold tier (no I/O, fine on an event loop) and, if there is one, leaves the miss
+        uncounted for the full lookup that follows.
+        """
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return audio
+        if memory_only and self.disk_dir:
+            return None
+
+        audio = self._disk_read(key)
+        with self._lock:
+            if audio is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["disk_hits"] += 1
+            self._memory_put(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes) -> None:
+        """Store audio in both tiers."""
+        with self._lock:
+            self._memory_put(key, audio)
+        self._disk_write(key, audio)
+
+    def snapshot(self) -> dict:
+        """Counters and sizes for /health."""
+        with self._lock:
+            return {
+                **self.stats,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "memory_max_bytes": self.memory_max_bytes,
+                "disk_enabled": self.disk_dir is not None,
+                "disk_entries": len(self._disk_index),
+                "disk_bytes": self._disk_bytes,
+                "disk_max_bytes": self.disk_max_bytes,
+            }
+
+    def clear_memory(self) -> None:
+        """Drop the hot tier (the cold tier survives restarts by design)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    # ----------------------------------------
+    # Hot tier (caller holds self._lock)
+    # ----------------------------------------
+
+    def _memory_put(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.memory_max_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats["memory_evictions"] += 1
+
+    # ----------------------------------------
+    # Cold tier
+    # ----------------------------------------
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + AUDIO_FILE_SUFFIX)
+
+    def _disk_entries(self) -> list[tuple[str, int, float]]:
+        """(key, size, mtime) of every cached file."""
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(AUDIO_FILE_SUFFIX):
+                continue
+            try:
+                st = os.stat(os.path.join(self.disk_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((name[:-len(AUDIO_FILE_SUFFIX)], st.st_size, st.st_mtime))
+        return entries
+
+    def _load_disk_index(self) -> None:
+        """Index the cold tier once at startup; mtime is the last-access time across restarts."""
+        for key, size, _ in sorted(self._disk_entries(), key=lambda entry: entry[2]):
+            self._disk_index[key] = size
+            self._disk_bytes += size
+
+    def _disk_read(self, key: str) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            # mtime doubles as last-access time, so the LRU order survives a restart
+            os.utime(path, None)
+        except FileNotFoundError:
+            # Evicted by another worker sharing the directory
+            with self._lock:
+                self._disk_forget(key)
+            return None
+        except OSError as e:
+            logger.warning(f"TTS disk cache read failed: {e}")
+            return None
+
+        with self._lock:
+            self._disk_track(key, len(audio))
+        return audio
+
+    def _disk_write(self, key: str, audio: bytes) -> None:
+        if not self.disk_dir or len(audio) > self.disk_max_bytes:
+            return
+        with self._lock:
+            if key in self._disk_index:
+                return
+        path = self._disk_path(key)
+
+        # Write to a temp file and rename so readers never see partial audio
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"TTS disk cache write failed: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._disk_track(key, len(audio))
+            victims = self._disk_victims(keep=key)
+        self._disk_evict(victims)
+
+    def _disk_evict(self, keys: list[str]) -> None:
+        """Delete the files of keys already dropped from the index."""
+        for key in keys:
+            try:
+                os.remove(self._disk_path(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"TTS disk cache eviction failed: {e}")
+
+    # ----------------------------------------
+    # Cold tier index (caller holds self._lock)
+    # ----------------------------------------
+
+    def _disk_track(self, key: str, size: int) -> None:
+        previous = self._disk_index.pop(key, None)
+        self._disk_bytes += size - (previous or 0)
+        self._disk_index[key] = size
+
+    def _disk_forget(self, key: str) -> None:
+        size = self._disk_index.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+
+    def _disk_victims(self, keep: str) -> list[str]:
+        """Drop least-recently-used entries (never keep) down to the low-water mark; returns their keys."""
+        if self._disk_bytes <= self.disk_max_bytes:
+            return []
+        victims = []
+        low_water = self.disk_max_bytes * DISK_LOW_WATER
+        while self._disk_bytes > low_water and self._disk_index:
+            key = next(iter(self._disk_index))
+            if key == keep:
+                break
+            self._disk_forget(key)
+            victims.append(key)
+        self.stats["disk_evictions"] += len(victims)
+        return victims
@@ -11,7 +11,7 @@ Run with:
     python src/tts_service.py
 
 API:
-    POST /tts - Convert text to speech
+    POST /tts - Convert text to speech (cached, ETag/If-None-Match aware)
     GET /health - Health check
 """
 
@@ -23,11 +23,14 @@ from contextlib import asynccontextmanager
 
 import torch
 import scipy.io.wavfile
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 from pydantic import BaseModel, Field
 
+from tts_cache import TTSAudioCache
+from model_registry import ModelRegistry
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,41 +45,47 @@ LANGUAGE_MODELS = {
 # Default language
 DEFAULT_LANGUAGE = "bcl"
 
-# Model cache to avoid reloading
-models_cache: dict = {}
-tokenizers_cache: dict = {}
+# Hub revision of the checkpoints (part of the audio cache key)
+MODEL_REVISION = os.environ.get("TTS_MODEL_REVISION", "main")
+
+# Cache-Control sent with audio responses
+TTS_CACHE_CONTROL = os.environ.get("TTS_CACHE_CONTROL", "public, max-age=86400")
+
+# Loaded models, shared registry with memory budget / idle eviction (see model_registry.py)
+model_registry = ModelRegistry.from_env()
+
+# Synthesized audio cache (memory LRU + on-disk tier)
+audio_cache = TTSAudioCache.from_env()
+
+
+def _load_weights(language: str):
+    """Load model and tokenizer from the hub (called by the model registry)."""
+    model_name = LANGUAGE_MODELS[language]
+    logger.info(f"Loading TTS model: {model_name} (this may take a moment on first run...)")
+    
+    from transformers import VitsModel, AutoTokenizer
+    
+    # Load model and tokenizer
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=MODEL_REVISION)
+    model = VitsModel.from_pretrained(model_name, revision=MODEL_REVISION)
+    
+    # Move to GPU if available
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = model.to(device)
+    
+    logger.info(f"Model loaded successfully on {device}")
+    return model, tokenizer
 
 
 def load_model(language: str):
     """
     Load TTS model and tokenizer for the specified language.
-    Models are cached in memory after first load.
+    Models stay resident in the model registry (subject to its memory budget).
     """
     if language not in LANGUAGE_MODELS:
         raise ValueError(f"Unsupported language: {language}. Supported: {list(LANGUAGE_MODELS.keys())}")
     
-    model_name = LANGUAGE_MODELS[language]
-    
-    if language not in models_cache:
-        logger.info(f"Loading TTS model: {model_name} (this may take a moment on first run...)")
-        
-        from transformers import VitsModel, AutoTokenizer
-        
-        # Load model and tokenizer
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = VitsModel.from_pretrained(model_name)
-        
-        # Move to GPU if available
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        model = model.to(device)
-        
-        # Cache for reuse
-        tokenizers_cache[language] = tokenizer
-        models_cache[language] = model
-        
-        logger.info(f"Model loaded successfully on {device}")
-    
-    return models_cache[language], tokenizers_cache[language]
+    return model_registry.get(LANGUAGE_MODELS[language], lambda: _load_weights(language))
 
 
 def text_to_speech(text: str, language: str = DEFAULT_LANGUAGE) -> bytes:
@@ -90,21 +99,25 @@ def text_to_speech(text: str, language: str = DEFAULT_LANGUAGE) -> bytes:
     Returns:
         WAV audio bytes
     """
-    model, tokenizer = load_model(language)
-    device = next(model.parameters()).device
-    
-    # Tokenize input
-    inputs = tokenizer(text, return_tensors="pt").to(device)
-    
-    # Generate speech
-    with torch.no_grad():
-        output = model(**inputs).waveform
-    
-    # Convert to numpy - handle the output shape properly
-    waveform = output.squeeze().cpu().numpy()
+    if language not in LANGUAGE_MODELS:
+        raise ValueError(f"Unsupported language: {language}. Supported: {list(LANGUAGE_MODELS.keys())}")
     
-    # Get sampling rate from model config
-    sampling_rate = model.config.sampling_rate
+    # Hold the model so it can't be evicted mid-inference
+    with model_registry.use(LANGUAGE_MODELS[language], lambda: _load_weights(language)) as (model, tokenizer):
+        device = next(model.parameters()).device
+        
+        # Tokenize input
+        inputs = tokenizer(text, return_tensors="pt").to(device)
+        
+        # Generate speech
+        with torch.no_grad():
+            output = model(**inputs).waveform
+        
+        # Convert to numpy - handle the output shape properly
+        waveform = output.squeeze().cpu().numpy()
+        
+        # Get sampling rate from model config
+        sampling_rate = model.config.sampling_rate
     
     # Convert to WAV bytes
     buffer = io.BytesIO()
@@ -114,6 +127,36 @@ def text_to_speech(text: str, language: str = DEFAULT_LANGUAGE) -> bytes:
     return buffer.read()
 
 
+def cache_key(text: str, language: str) -> str:
+    """Audio cache key for a TTS request."""
+    if language not in LANGUAGE_MODELS:
+        raise ValueError(f"Unsupported language: {language}. Supported: {list(LANGUAGE_MODELS.keys())}")
+    return TTSAudioCache.make_key(text, language, LANGUAGE_MODELS[language], MODEL_REVISION)
+
+
+def cached_text_to_speech(text: str, language: str = DEFAULT_LANGUAGE) -> tuple[bytes, str]:
+    """
+    Convert text to speech, serving repeated phrases from the audio cache.
+    
+    Returns:
+        (WAV audio bytes, cache key)
+    """
+    key = cache_key(text, language)
+    audio_bytes = audio_cache.get(key)
+    if audio_bytes is None:
+        audio_bytes = text_to_speech(text, language)
+        audio_cache.put(key, audio_bytes)
+    return audio_bytes, key
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (possibly a list or weak validators) against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip().removeprefix("W/") for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
 # Request/Response models
 class TTSRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=5000, description="Text to synthesize")
@@ -128,6 +171,8 @@ class HealthResponse(BaseModel):
     models_loaded: list[str]
     default_language: str
     supported_languages: list[str]
+    tts_cache: dict
+    model_registry: dict
 
 
 # App lifecycle - preload default model
@@ -145,8 +190,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown: cleanup
     logger.info("Shutting down TTS service...")
-    models_cache.clear()
-    tokenizers_cache.clear()
+    model_registry.clear()
+    audio_cache.clear_memory()
 
 
 # Create FastAPI app
@@ -168,22 +213,32 @@ app.add_middleware(
 
 
 @app.post("/tts", response_class=Response)
-async def synthesize_speech(request: TTSRequest):
+async def synthesize_speech(
+    request: TTSRequest,
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
+):
     """
     Convert text to speech audio.
     
-    Returns WAV audio file.
+    Returns WAV audio file, or 304 if the client's If-None-Match matches.
     """
     try:
         logger.info(f"TTS request: lang={request.language}, text='{request.text[:50]}...'")
         
-        audio_bytes = text_to_speech(request.text, request.language)
+        etag = f'"{cache_key(request.text, request.language)}"'
+        cache_headers = {"ETag": etag, "Cache-Control": TTS_CACHE_CONTROL}
+        
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=cache_headers)
+        
+        audio_bytes, _key = cached_text_to_speech(request.text, request.language)
         
         return Response(
             content=audio_bytes,
             media_type="audio/wav",
             headers={
-                "Content-Disposition": "attachment; filename=speech.wav"
+                "Content-Disposition": "attachment; filename=speech.wav",
+                **cache_headers,
             }
         )
     
@@ -199,9 +254,11 @@ async def health_check():
     """Check service health and loaded models."""
     return HealthResponse(
         status="ok",
-        models_loaded=list(models_cache.keys()),
+        models_loaded=[lang for lang, name in LANGUAGE_MODELS.items() if model_registry.is_loaded(name)],
         default_language=DEFAULT_LANGUAGE,
         supported_languages=list(LANGUAGE_MODELS.keys()),
+        tts_cache=audio_cache.snapshot(),
+        model_registry=model_registry.snapshot(),
     )
 
 
@@ -0,0 +1,104 @@
+"""
+Tests for STT input decoding: the polyphase resampler against
+scipy.signal.resample_poly, the raw PCM fast path, and the
+soundfile -> PyAV -> librosa fallback order.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_audio_decoding.py -q
+"""
+
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy.signal import resample_poly
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import audio_decoding  # noqa: E402
+from audio_decoding import STT_SAMPLE_RATE, decode_audio, load_audio, pcm16_to_float  # noqa: E402
+from audio_encoding import resample  # noqa: E402
+
+
+@pytest.mark.parametrize("source_rate", [8000, 22050, 44100, 48000])
+def test_resampler_matches_resample_poly(source_rate):
+    rng = np.random.default_rng(source_rate)
+    waveform = rng.uniform(-1, 1, source_rate * 3 // 2).astype(np.float32)
+
+    ours = resample(waveform, source_rate, STT_SAMPLE_RATE)
+    g = np.gcd(source_rate, STT_SAMPLE_RATE)
+    reference = resample_poly(waveform.astype(np.float64), STT_SAMPLE_RATE // g, source_rate // g)
+
+    assert ours.dtype == np.float32 and ours.shape == reference.shape
+    assert np.max(np.abs(ours - reference)) < 1e-6
+
+
+def test_pcm_s16le_is_used_as_is():
+    samples = np.array([0, 16384, -32768, 32767], dtype="<i2")
+    audio = load_audio(samples.tobytes(), encoding="pcm_s16le")
+    assert audio.dtype == np.float32
+    np.testing.assert_array_equal(audio, [0.0, 0.5, -1.0, 32767 / 32768])
+
+
+def test_pcm_s16le_rejects_odd_byte_counts_and_unknown_encodings():
+    with pytest.raises(ValueError, match="even number of bytes"):
+        pcm16_to_float(b"\x00\x01\x02")
+    with pytest.raises(ValueError, match="Unsupported audio encoding"):
+        load_audio(b"\x00\x00", encoding="mulaw")
+
+
+def test_wav_is_decoded_in_memory_and_resampled():
+    import soundfile as sf
+
+    buffer = io.BytesIO()
+    sf.write(buffer, np.zeros((48000, 2), dtype=np.float32), 48000, format="WAV", subtype="PCM_16")
+    audio = load_audio(buffer.getvalue())
+    assert audio.dtype == np.float32 and len(audio) == STT_SAMPLE_RATE
+
+
+class FakeDecoders:
+    """Replaces the three decoders; each outcome is an exception to raise or samples to return."""
+
+    def __init__(self, monkeypatch, soundfile, pyav, librosa):
+        self.calls = []
+        outcomes = {"soundfile": soundfile, "pyav": pyav, "librosa": librosa}
+
+        def decoder(name):
+            def decode(data, *args):
+                self.calls.append(name)
+                outcome = outcomes[name]
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                return (outcome, STT_SAMPLE_RATE) if name == "soundfile" else outcome
+            return decode
+
+        for name in outcomes:
+            monkeypatch.setattr(audio_decoding, f"_decode_{name}", decoder(name))
+
+
+def test_fallback_order_soundfile_then_pyav_then_librosa(monkeypatch):
+    samples = np.ones(160, dtype=np.float32)
+
+    decoders = FakeDecoders(monkeypatch, soundfile=samples, pyav=samples, librosa=samples)
+    decode_audio(b"RIFF")
+    assert decoders.calls == ["soundfile"]
+
+    decoders = FakeDecoders(monkeypatch, soundfile=RuntimeError("unknown format"), pyav=samples, librosa=samples)
+    decode_audio(b"\x1aE\xdf\xa3 webm")
+    assert decoders.calls == ["soundfile", "pyav"]
+
+    # A container PyAV can't read, or no PyAV at all, still gets the librosa path
+    for pyav_error in (ValueError("Invalid data found when processing input"), ImportError("No module named 'av'")):
+        decoders = FakeDecoders(monkeypatch, soundfile=RuntimeError("unknown format"), pyav=pyav_error, librosa=samples)
+        np.testing.assert_array_equal(decode_audio(b"\x00\x00 m4a"), samples)
+        assert decoders.calls == ["soundfile", "pyav", "librosa"]
+
+
+def test_undecodable_audio_is_a_value_error(monkeypatch):
+    FakeDecoders(monkeypatch, soundfile=RuntimeError("unknown format"), pyav=ValueError("invalid data"),
+                 librosa=EOFError())
+    with pytest.raises(ValueError, match="Could not decode audio: EOFError"):
+        decode_audio(b"not audio")
@@ -0,0 +1,127 @@
+"""
+Tests for the pre-rendered TTS audio pack (writer, memory-mapped reader and
+corpus collection), on fake clips without a model.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_audio_pack.py -q
+"""
+
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import audio_pack  # noqa: E402
+from audio_pack import AudioPack, AudioPackWriter, collect_pack_phrases, pack_paths  # noqa: E402
+
+
+def write_pack(base_path: str, clips: dict[str, bytes]) -> None:
+    writer = AudioPackWriter(base_path, "wav", "audio/wav", 16000, metadata={"revision": "test"})
+    for key, audio in clips.items():
+        writer.add(key, f"text {key}", "bcl", audio)
+    writer.close()
+
+
+def test_clips_are_read_back_at_their_offsets(tmp_path):
+    base = str(tmp_path / "tts_pack")
+    writer = AudioPackWriter(base, "wav", "audio/wav", 16000, metadata={"revision": "test"})
+    writer.add("a", "Marhay na aga", "bcl", b"RIFF-aaaa")
+    writer.add("b", "Salamat", "fil", b"RIFF-bb")
+    writer.add("a", "Marhay na aga", "bcl", b"duplicate ignored")
+    writer.close()
+
+    with open(pack_paths(base)[1], encoding="utf-8") as f:
+        index = json.load(f)
+    assert [(e["key"], e["offset"], e["length"]) for e in index["entries"]] == [("a", 0, 9), ("b", 9, 7)]
+    assert index["total_bytes"] == 16
+
+    pack = AudioPack.open(base)
+    try:
+        assert len(pack) == 2
+        assert bytes(pack.get("a")) == b"RIFF-aaaa"
+        assert bytes(pack.get("b")) == b"RIFF-bb"
+        assert pack.get("missing") is None
+        assert pack.snapshot()["revision"] == "test"
+        assert (pack.stats["hits"], pack.stats["misses"]) == (2, 1)
+    finally:
+        pack.close()
+
+
+def test_new_pack_replaces_the_old_one_blob_first(tmp_path, monkeypatch):
+    base = str(tmp_path / "tts_pack")
+    blob_path, index_path = pack_paths(base)
+    write_pack(base, {"old": b"old clip"})
+
+    writer = AudioPackWriter(base, "wav", "audio/wav", 16000)
+    writer.add("new", "Dios mabalos", "bcl", b"new clip!")
+    # Until close() the old pack is untouched and still opens
+    old = AudioPack.open(base)
+    assert bytes(old.get("old")) == b"old clip"
+    old.close()
+
+    replaced = []
+    real_replace = os.replace
+    monkeypatch.setattr(audio_pack.os, "replace", lambda src, dst: (replaced.append(dst), real_replace(src, dst)))
+    writer.close()
+
+    assert replaced == [blob_path, index_path]
+    assert sorted(os.listdir(tmp_path)) == ["tts_pack.bin", "tts_pack.index.json"]
+    new = AudioPack.open(base)
+    assert "old" not in new and bytes(new.get("new")) == b"new clip!"
+    new.close()
+
+
+def test_aborted_pack_leaves_nothing_behind(tmp_path):
+    writer = AudioPackWriter(str(tmp_path / "tts_pack"), "wav", "audio/wav", 16000)
+    writer.add("a", "Marhay na aga", "bcl", b"RIFF")
+    writer.abort()
+    assert os.listdir(tmp_path) == []
+
+
+def test_open_rejects_other_versions_and_truncated_blobs(tmp_path):
+    base = str(tmp_path / "tts_pack")
+    blob_path, index_path = pack_paths(base)
+    write_pack(base, {"a": b"RIFF-aaaa"})
+
+    with open(blob_path, "r+b") as f:
+        f.truncate(4)
+    with pytest.raises(ValueError, match="size mismatch"):
+        AudioPack.open(base)
+
+    with open(index_path, encoding="utf-8") as f:
+        index = json.load(f)
+    index["version"] = audio_pack.PACK_VERSION + 1
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    with pytest.raises(ValueError, match="version"):
+        AudioPack.open(base)
+    assert AudioPack.open_if_exists(base) is None
+
+
+def test_collect_pack_phrases_dedups_in_order(tmp_path):
+    phrases = tmp_path / "bikol-phrases"
+    phrases.mkdir()
+    (phrases / "greetings.json").write_text(json.dumps({
+        "phrases": [
+            {"bikol": "Dios mabalos", "filipino": "Salamat", "english": "Thank you"},
+            {"bikol": " Dios mabalos ", "english": "Thanks", "suggestedResponse": "Dios mabalos"},
+        ],
+    }))
+    (phrases / "translation_mappings.json").write_text(json.dumps({"english_to_bikol": {"english": "skipped"}}))
+    facilities = tmp_path / "facilities"
+    facilities.mkdir()
+    (facilities / "naga-health-centers.json").write_text(json.dumps({
+        "facilities": [{"name": "Naga City Health Office", "address": ""}],
+    }))
+
+    assert collect_pack_phrases(str(tmp_path), languages=("bcl", "eng")) == [
+        ("Dios mabalos", "bcl"),
+        ("Thank you", "eng"),
+        ("Thanks", "eng"),
+        ("Naga City Health Office", "bcl"),
+        ("Naga City Health Office", "eng"),
+    ]
@@ -0,0 +1,152 @@
+"""
+Tests for the async Google Translate client against a local stub server that
+simulates latency and errors: coalescing, request packing, deadlines and the
+circuit breaker.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_google_translate.py -q
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from google_translate import (  # noqa: E402
+    CircuitBreaker,
+    CircuitOpenError,
+    GoogleTranslateClient,
+    GoogleTranslateError,
+    GoogleTranslateTimeout,
+)
+
+
+class StubGoogle(BaseHTTPRequestHandler):
+    """Translate v2 lookalike: upper-cases every q; delay_s / status set by the test."""
+
+    protocol_version = "HTTP/1.1"
+    delay_s = 0.0
+    status = 200
+    requests: list = []
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        StubGoogle.requests.append(form["q"])
+        time.sleep(StubGoogle.delay_s)
+
+        if StubGoogle.status == 200:
+            translations = [{"translatedText": f"{form['target'][0]}:{q.upper()}"} for q in form["q"]]
+            body = json.dumps({"data": {"translations": translations}}).encode()
+        else:
+            body = b'{"error": {"message": "backend error"}}'
+        self.send_response(StubGoogle.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubGoogle.delay_s, StubGoogle.status, StubGoogle.requests = 0.0, 200, []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGoogle)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/language/translate/v2"
+    server.shutdown()
+    server.server_close()
+
+
+def run(client: GoogleTranslateClient, coroutine_factory):
+    async def main():
+        try:
+            return await coroutine_factory()
+        finally:
+            await client.aclose()
+    return asyncio.run(main())
+
+
+def test_concurrent_calls_are_coalesced(stub_url):
+    client = GoogleTranslateClient("key", url=stub_url, window_ms=20)
+    calls = [["good morning"], ["thank you", "good morning"], ["where is the clinic"]]
+
+    results = run(client, lambda: asyncio.gather(*(client.translate(texts, "en", "tl") for texts in calls)))
+
+    assert results == [["tl:GOOD MORNING"], ["tl:THANK YOU", "tl:GOOD MORNING"], ["tl:WHERE IS THE CLINIC"]]
+    assert len(StubGoogle.requests) == 1
+    assert StubGoogle.requests[0] == ["good morning", "thank you", "where is the clinic"]
+    assert client.stats["coalesced_calls"] == 3
+
+
+def test_requests_are_split_at_the_segment_limit(stub_url):
+    client = GoogleTranslateClient("key", url=stub_url, window_ms=0, max_segments=2)
+    texts = [f"text {i}" for i in range(5)]
+
+    result = run(client, lambda: client.translate(texts, "tl", "en"))
+
+    assert result == [f"en:TEXT {i}" for i in range(5)]
+    assert sorted(len(q) for q in StubGoogle.requests) == [1, 2, 2]
+
+
+def test_deadline_fails_the_call_not_the_worker(stub_url):
+    StubGoogle.delay_s = 1.0
+    client = GoogleTranslateClient("key", url=stub_url, window_ms=0, timeout_s=5)
+
+    started = time.monotonic()
+    with pytest.raises(GoogleTranslateTimeout):
+        run(client, lambda: client.translate(["slow"], "en", "tl", timeout_s=0.1))
+    assert time.monotonic() - started < 0.9
+    assert client.stats["deadline_exceeded"] == 1
+
+
+def test_breaker_opens_on_errors_and_closes_after_a_good_probe(stub_url):
+    StubGoogle.status = 503
+    now = [0.0]
+    client = GoogleTranslateClient("key", url=stub_url, window_ms=0,
+                                   breaker=CircuitBreaker(failure_threshold=2, reset_timeout_s=30, clock=lambda: now[0]))
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(GoogleTranslateError):
+                await client.translate(["hello"], "en", "tl")
+        assert client.breaker.state == "open"
+
+        # Open: fail fast without calling Google
+        with pytest.raises(CircuitOpenError):
+            await client.translate(["hello"], "en", "tl")
+        assert len(StubGoogle.requests) == 2
+
+        # After the reset timeout one probe goes out; Google is healthy again
+        StubGoogle.status = 200
+        now[0] = 31.0
+        assert await client.translate(["hello"], "en", "tl") == ["tl:HELLO"]
+        assert client.breaker.state == "closed"
+
+    run(client, scenario)
+    assert client.breaker.stats == {"opened": 1, "short_circuited": 1}
+
+
+def test_failed_probe_reopens_the_circuit():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.allow()      # the probe
+    assert not breaker.allow()  # only one at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
@@ -0,0 +1,85 @@
+"""
+Tests for inference pool admission: load shedding with a Retry-After hint,
+and slots released on errors and cancellation.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_inference_pool.py -q
+"""
+
+import os
+import sys
+import asyncio
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from inference_pool import InferencePool, PoolFullError  # noqa: E402
+
+
+def test_requests_beyond_workers_plus_queue_are_rejected():
+    pool = InferencePool("admission-test", max_workers=1, max_queue=2, min_retry_after=2)
+    release = threading.Event()
+
+    async def main():
+        held = [asyncio.ensure_future(pool.submit(release.wait, 5)) for _ in range(pool.capacity)]
+        await asyncio.sleep(0.05)
+        assert pool.snapshot()["queue_depth"] == 2
+
+        with pytest.raises(PoolFullError) as rejected:
+            await pool.submit(release.wait, 5)
+        release.set()
+        await asyncio.gather(*held)
+        return rejected.value
+
+    try:
+        error = asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+    assert error.pool_name == "admission-test"
+    assert error.retry_after >= pool.min_retry_after
+    assert (pool.stats["admitted"], pool.stats["rejected"], pool.stats["completed"]) == (3, 1, 3)
+
+
+def test_slot_is_released_when_the_call_fails():
+    pool = InferencePool("failure-test", max_workers=1, max_queue=0)
+
+    def fail():
+        raise ValueError("bad input")
+
+    async def main():
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await pool.submit(fail)
+        return await pool.submit(sum, [1, 2])
+
+    try:
+        assert asyncio.run(main()) == 3
+    finally:
+        pool.shutdown()
+    assert pool.stats["failed"] == 3 and pool.stats["rejected"] == 0
+
+
+def test_slot_is_released_when_the_request_is_cancelled():
+    pool = InferencePool("cancel-test", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def main():
+        request = asyncio.ensure_future(pool.submit(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PoolFullError):
+            pool.ensure_capacity()
+
+        request.cancel()  # e.g. the client disconnected
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        pool.ensure_capacity()  # the slot is free again
+        release.set()
+
+    try:
+        asyncio.run(main())
+    finally:
+        pool.shutdown()
@@ -0,0 +1,118 @@
+"""
+Tests for the model registry: single-flight loads, refcounted residency,
+budgeted LRU eviction and idle eviction, with fake models of known size.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_model_registry.py -q
+"""
+
+import os
+import sys
+import time
+import threading
+
+import pytest
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from model_registry import ModelRegistry  # noqa: E402
+
+KB = 1024
+
+
+def fake_model(kb: int = 1) -> torch.nn.Module:
+    """A module whose parameters + buffers take exactly `kb` KiB."""
+    model = torch.nn.Module()
+    model.register_buffer("weights", torch.zeros(kb * KB // 4, dtype=torch.float32))
+    return model
+
+
+def test_concurrent_acquires_share_one_load():
+    registry = ModelRegistry()
+    loading = threading.Event()
+    loads = []
+
+    def slow_loader():
+        loads.append(1)
+        loading.set()
+        time.sleep(0.2)
+        return fake_model()
+
+    results = []
+
+    def acquire():
+        results.append(registry.acquire("tts:bcl", slow_loader))
+
+    first = threading.Thread(target=acquire)
+    first.start()
+    loading.wait(5)
+    waiters = [threading.Thread(target=acquire) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    for thread in [first, *waiters]:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len(results) == 4 and all(result is results[0] for result in results)
+    assert registry.stats["coalesced_loads"] == 3
+    assert registry.snapshot()["models"]["tts:bcl"]["refcount"] == 4
+
+
+def test_failed_load_lets_the_next_caller_retry():
+    registry = ModelRegistry()
+
+    def failing_loader():
+        raise OSError("download interrupted")
+
+    with pytest.raises(OSError):
+        registry.acquire("tts:bcl", failing_loader)
+    assert not registry.is_loaded("tts:bcl")
+
+    model = fake_model()
+    assert registry.get("tts:bcl", lambda: model) is model
+    assert registry.stats["loads"] == 1
+
+
+def test_budget_overflow_evicts_least_recently_used():
+    registry = ModelRegistry(memory_budget_bytes=3 * KB)
+    for key in ("a", "b", "c"):
+        registry.get(key, fake_model)
+    registry.get("a", fake_model)  # hit: a is now the most recently used
+
+    registry.get("d", fake_model)
+    assert registry.loaded_keys() == ["c", "a", "d"]
+    registry.get("e", fake_model)
+    assert registry.loaded_keys() == ["a", "d", "e"]
+    assert registry.stats["evictions"] == 2
+    assert registry.resident_bytes() == 3 * KB
+
+
+def test_models_in_use_are_never_evicted():
+    registry = ModelRegistry(memory_budget_bytes=2 * KB)
+    with registry.use("held", fake_model):
+        registry.get("idle", fake_model)
+        # Room for the newcomer comes from the idle model, not the older one in use
+        registry.get("new", fake_model)
+        assert set(registry.loaded_keys()) == {"held", "new"}
+
+        # Nothing left to evict: over budget rather than dropping a model in use
+        with registry.use("another", fake_model):
+            assert registry.is_loaded("held")
+        assert not registry.evict("held")
+
+
+def test_idle_eviction_skips_models_in_use():
+    registry = ModelRegistry(idle_timeout_s=0.05)
+    registry.acquire("held", fake_model)
+    registry.get("idle", fake_model)
+    time.sleep(0.1)
+
+    assert registry.evict_idle() == 1
+    assert registry.loaded_keys() == ["held"]
+
+    registry.release("held")
+    time.sleep(0.1)
+    assert registry.evict_idle() == 1
+    assert registry.loaded_keys() == []
@@ -0,0 +1,91 @@
+"""
+Tests for background model warm-up and the readiness state it reports.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_model_warmup.py -q
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from inference_pool import InferencePool  # noqa: E402
+from model_warmup import ModelWarmup, WarmupTask  # noqa: E402
+
+
+def test_models_load_concurrently_then_warm_up():
+    pools = [InferencePool(name, max_workers=1, max_queue=1) for name in ("tts", "stt")]
+    events = []
+
+    def step(name: str, what: str):
+        def run():
+            time.sleep(0.1)
+            events.append((name, what))
+        return run
+
+    warmup = ModelWarmup([
+        WarmupTask(pool.name, load=step(pool.name, "load"), warm=step(pool.name, "warm"), pool=pool) for pool in pools
+    ])
+    assert not warmup.ready
+
+    started = time.monotonic()
+    try:
+        asyncio.run(warmup.run())
+    finally:
+        for pool in pools:
+            pool.shutdown()
+
+    # Both families in parallel: two load + warm-up chains of 0.2 s each
+    assert time.monotonic() - started < 0.35
+    for name in ("tts", "stt"):
+        assert events.index((name, "load")) < events.index((name, "warm"))
+    assert warmup.ready
+    assert warmup.snapshot()["models"]["tts"]["state"] == "ready"
+
+
+def test_readiness_waits_for_required_tasks_only():
+    def fail():
+        raise OSError("download failed")
+
+    warmup = ModelWarmup([
+        WarmupTask("tts:bcl", load=lambda: None, warm=lambda: None),
+        WarmupTask("phrase_table", load=fail, required=False),
+    ])
+    asyncio.run(warmup.run())
+    assert warmup.ready and warmup.healthy
+    assert warmup.snapshot()["models"]["phrase_table"] == {
+        "state": "failed", "required": False, "load_s": None, "warm_s": None,
+        "error": "OSError: download failed", "attempts": 1,
+    }
+
+
+def test_required_task_is_retried_after_a_transient_failure():
+    failures = [OSError("hub timeout"), OSError("hub timeout")]
+
+    def flaky_load():
+        if failures:
+            raise failures.pop()
+
+    warmup = ModelWarmup([WarmupTask("tts:bcl", load=flaky_load)], max_attempts=5, backoff_s=0.01)
+    asyncio.run(warmup.run())
+
+    assert warmup.ready and warmup.healthy
+    model = warmup.snapshot()["models"]["tts:bcl"]
+    assert (model["state"], model["attempts"], model["error"]) == ("ready", 3, None)
+
+
+def test_required_task_that_keeps_failing_makes_the_service_unhealthy():
+    def fail():
+        raise OSError("unknown model")
+
+    warmup = ModelWarmup([WarmupTask("tts:xyz", load=fail)], max_attempts=3, backoff_s=0.01)
+    asyncio.run(warmup.run())
+
+    assert not warmup.ready
+    assert not warmup.healthy
+    model = warmup.snapshot()["models"]["tts:xyz"]
+    assert (model["state"], model["attempts"]) == ("failed", 3)
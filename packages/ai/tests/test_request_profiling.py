@@ -0,0 +1,140 @@
+"""
+Tests for request profiling (X-Profile through the inference pool) and the
+collapsed-stack sampler.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_request_profiling.py -q
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from inference_pool import InferencePool  # noqa: E402
+from request_profiling import (  # noqa: E402
+    ProfileStore,
+    ProfilingMiddleware,
+    SamplerBusyError,
+    StackSampler,
+    profiled_call,
+)
+
+
+def tokenize_for_test(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def call(middleware: ProfilingMiddleware, headers: dict) -> list[dict]:
+    """One POST through the middleware; returns the messages sent."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": "/tts", "method": "POST",
+             "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()]}
+    asyncio.run(middleware(scope, receive, send))
+    return sent
+
+
+def test_profiled_request_covers_its_pool_calls_only():
+    pool = InferencePool("profile-test", max_workers=1, max_queue=2, call_wrapper=profiled_call)
+    store = ProfileStore(keep=2)
+
+    async def app(scope, receive, send):
+        await pool.run(tokenize_for_test, 10_000)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = ProfilingMiddleware(app, store, api_key="secret")
+    try:
+        profiled = call(middleware, {"X-Profile": "cprofile", "X-Profile-Key": "secret"})
+        wrong_key = call(middleware, {"X-Profile": "cprofile", "X-Profile-Key": "guess"})
+        plain = call(middleware, {})
+    finally:
+        pool.shutdown()
+
+    profile_id = dict(profiled[0]["headers"])[b"x-profile-id"].decode()
+    profile = store.get(profile_id)
+    assert profile.done and profile.calls == 1
+    report = profile.report()
+    assert report.startswith(f"# cprofile profile {profile_id}: /tts")
+    assert "tokenize_for_test" in report
+
+    for sent in (wrong_key, plain):
+        assert b"x-profile-id" not in dict(sent[0]["headers"])
+
+
+def test_store_keeps_the_latest_profiles():
+    store = ProfileStore(keep=2)
+    first, second, third = (store.new("cprofile", "/tts") for _ in range(3))
+    assert store.get(first.id) is None
+    assert store.get(second.id) is second and store.get(third.id) is third
+
+
+def test_sampler_returns_collapsed_stacks():
+    stop = threading.Event()
+
+    def busy_worker():
+        while not stop.is_set():
+            tokenize_for_test(1000)
+
+    worker = threading.Thread(target=busy_worker, name="busy-worker")
+    worker.start()
+    try:
+        collapsed = StackSampler(interval_ms=1).sample(seconds=0.2)
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = collapsed.splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy and any("busy_worker (tests/test_request_profiling.py:" in line for line in busy)
+
+
+def test_one_sampling_run_at_a_time():
+    sampler = StackSampler()
+    runner = threading.Thread(target=sampler.sample, args=(0.3,))
+    runner.start()
+    time.sleep(0.05)
+    try:
+        with pytest.raises(SamplerBusyError):
+            sampler.sample(0.01)
+    finally:
+        runner.join()
+
+
+def test_concurrent_cprofile_call_runs_unprofiled():
+    store = ProfileStore(keep=2)
+    first, second = store.new("cprofile", "/tts"), store.new("cprofile", "/stt")
+    inside = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        inside.set()
+        release.wait(5)
+
+    runner = threading.Thread(target=first.run, args=(hold,))
+    runner.start()
+    inside.wait(5)
+    try:
+        assert second.run(tokenize_for_test, 100) == tokenize_for_test(100)
+    finally:
+        release.set()
+        runner.join()
+
+    assert (first.calls, first.skipped) == (1, 0)
+    assert (second.calls, second.skipped) == (0, 1)
+    assert "1 unprofiled (profiler busy)" in second.report()
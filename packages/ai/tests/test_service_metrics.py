@@ -0,0 +1,110 @@
+"""
+Tests for the Prometheus metrics: stage labels (also across inference pool
+threads and the STT scheduler), the HTTP middleware and scrape-time families.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_service_metrics.py -q
+"""
+
+import os
+import sys
+import asyncio
+from functools import partial
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from inference_pool import InferencePool  # noqa: E402
+from stt_scheduler import LanguageAffineScheduler  # noqa: E402
+from service_metrics import (  # noqa: E402
+    METRICS_REGISTRY,
+    MetricsMiddleware,
+    cache_families,
+    current_endpoint,
+    current_language,
+    metric_language,
+    observe_stage,
+    stage_timer,
+    stats_families,
+)
+
+
+def stage_count(endpoint: str, language: str, stage: str) -> float:
+    labels = {"endpoint": endpoint, "language": language, "stage": stage}
+    return METRICS_REGISTRY.get_sample_value("ai_stage_duration_seconds_count", labels) or 0.0
+
+
+def test_stage_labels_follow_work_into_pools_and_the_scheduler():
+    pool = InferencePool("metrics-test", max_workers=1, max_queue=4, on_wait=partial(observe_stage, "queue_wait"))
+
+    def work():
+        with stage_timer("forward"):
+            pass
+        with stage_timer("tokenize", "eng"):
+            pass
+
+    async def main():
+        current_endpoint.set("/test")
+        with metric_language("bcl"):
+            await pool.run(work)
+            await LanguageAffineScheduler(pool=pool).submit("bcl", work)
+
+    try:
+        asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+    assert stage_count("/test", "bcl", "forward") == 2
+    assert stage_count("/test", "bcl", "queue_wait") == 2
+    assert stage_count("/test", "eng", "tokenize") == 2
+    assert current_language.get() == "none"
+
+
+def test_middleware_labels_known_routes_and_counts_bytes():
+    routes = [type("Route", (), {"path": "/echo"})()]
+    seen = []
+
+    async def app(scope, receive, send):
+        body = (await receive())["body"]
+        seen.append(current_endpoint.get())
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": body * 2})
+
+    async def call(path: str):
+        messages = iter([{"type": "http.request", "body": b"12345", "more_body": False}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message)
+
+        await MetricsMiddleware(app, routes)({"type": "http", "path": path, "method": "POST"}, receive, send)
+        return sent
+
+    before = METRICS_REGISTRY.get_sample_value("ai_http_response_size_bytes_sum", {"endpoint": "/echo"}) or 0.0
+    asyncio.run(call("/echo"))
+    asyncio.run(call("/users/42"))
+
+    assert seen == ["/echo", "other"]
+    assert METRICS_REGISTRY.get_sample_value("ai_http_response_size_bytes_sum", {"endpoint": "/echo"}) == before + 10
+    assert METRICS_REGISTRY.get_sample_value(
+        "ai_http_request_duration_seconds_count", {"endpoint": "other", "method": "POST", "status": "200"}
+    ) >= 1
+
+
+def test_scrape_time_families():
+    hits, misses, ratio = cache_families({"tts_audio": (3, 1), "empty": (0, 0)})
+    assert [(s.name, s.labels["cache"], s.value) for s in ratio.samples] == [
+        ("ai_cache_hit_ratio", "tts_audio", 0.75),
+        ("ai_cache_hit_ratio", "empty", 0.0),
+    ]
+    assert hits.samples[0].name == "ai_cache_hits_total"
+
+    families = stats_families(
+        "ai_inference_pool", "pool", {"tts": {"completed": 5, "running": 1, "wait_time": {"count": 5}}},
+        counters=("completed",), gauges=("running", "wait_time"),
+    )
+    samples = {s.name: s.value for family in families for s in family.samples}
+    assert samples == {"ai_inference_pool_completed_total": 5, "ai_inference_pool_running": 1}
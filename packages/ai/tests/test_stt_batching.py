@@ -0,0 +1,59 @@
+"""
+Tests for batched STT: length bucketing and masked CTC argmax.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_stt_batching.py -q
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from stt_batching import batch_ctc_ids, ctc_frame_lengths, plan_buckets  # noqa: E402
+
+RATE = 16000
+
+# Wav2Vec2 / MMS feature encoder
+CONV = SimpleNamespace(conv_kernel=(10, 3, 3, 3, 3, 2, 2), conv_stride=(5, 2, 2, 2, 2, 2, 2))
+
+
+def test_buckets_respect_limits_and_cover_every_clip():
+    lengths = [int(RATE * s) for s in (1.0, 5.2, 1.1, 3.0, 1.3, 2.9, 30.0, 1.2, 3.1, 5.0)]
+    buckets = plan_buckets(lengths, max_size=3, max_samples=RATE * 12, max_pad_ratio=1.5)
+
+    assert sorted(i for bucket in buckets for i in bucket) == list(range(len(lengths)))
+    for bucket in buckets:
+        sizes = [lengths[i] for i in bucket]
+        assert len(bucket) <= 3
+        assert sizes == sorted(sizes)
+        if len(bucket) > 1:
+            assert max(sizes) * len(bucket) <= RATE * 12
+            assert max(sizes) <= min(sizes) * 1.5
+    # The 30 s clip exceeds max_samples and is alone
+    assert [6] in buckets
+
+
+def test_similar_lengths_share_a_bucket():
+    lengths = [RATE * 2, RATE * 10, RATE * 2 + 100, RATE * 10 + 100]
+    assert plan_buckets(lengths, max_size=8, max_samples=RATE * 60) == [[0, 2], [1, 3]]
+
+
+def test_frame_lengths_follow_the_conv_stack():
+    frames = ctc_frame_lengths([RATE, RATE // 2, 400], 49, CONV)
+    assert frames.tolist() == [49, 24, 1]
+
+    # Without a config: scaled by the longest clip
+    assert ctc_frame_lengths([RATE, RATE // 2], 49).tolist() == [49, 24]
+
+
+def test_padded_frames_become_blank():
+    logits = torch.zeros(2, 5, 4)
+    logits[:, :, 3] = 1.0  # every frame predicts token 3
+    ids = batch_ctc_ids(logits, torch.tensor([5, 2]), blank_id=0)
+
+    assert ids.tolist() == [[3, 3, 3, 3, 3], [3, 3, 0, 0, 0]]
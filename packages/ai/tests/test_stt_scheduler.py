@@ -0,0 +1,83 @@
+"""
+Tests for the language-affine STT scheduler.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_stt_scheduler.py -q
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from inference_pool import InferencePool  # noqa: E402
+from stt_scheduler import LanguageAffineScheduler  # noqa: E402
+
+
+def run_mixed(languages: list[str], workers: int = 2, **scheduler_args) -> tuple[list[str], dict]:
+    """Submit one request per language (in that arrival order); return the execution order and stats."""
+    order: list[str] = []
+    pool = InferencePool("test", max_workers=workers, max_queue=len(languages))
+
+    def work(language: str) -> str:
+        order.append(language)
+        time.sleep(0.005)
+        return language
+
+    async def main():
+        scheduler = LanguageAffineScheduler(pool=pool, **scheduler_args)
+        results = await asyncio.gather(*(scheduler.submit(lang, work, lang) for lang in languages))
+        assert results == languages
+        return scheduler.snapshot()
+
+    try:
+        return order, asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+
+def switches(order: list[str]) -> int:
+    return sum(a != b for a, b in zip(order, order[1:]))
+
+
+def test_groups_requests_by_language():
+    languages = ["bcl", "fil", "eng"] * 6
+    order, stats = run_mixed(languages, max_streak=8)
+
+    assert sorted(order) == sorted(languages)
+    assert switches(order) == 2
+    assert stats["language_switches"] == 2
+    assert stats["dispatched"] == len(languages)
+
+
+def test_max_streak_gives_other_languages_a_turn():
+    order, stats = run_mixed(["bcl"] * 6 + ["eng"], workers=1, max_streak=3)
+
+    assert order.index("eng") == 3
+
+
+def test_errors_reach_only_their_caller():
+    pool = InferencePool("test", max_workers=1, max_queue=4)
+
+    def work(language: str) -> str:
+        if language == "fil":
+            raise ValueError("bad audio")
+        return language
+
+    async def main():
+        scheduler = LanguageAffineScheduler(pool=pool)
+        return await asyncio.gather(
+            *(scheduler.submit(lang, work, lang) for lang in ("bcl", "fil", "eng")),
+            return_exceptions=True,
+        )
+
+    try:
+        bcl, fil, eng = asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+    assert (bcl, eng) == ("bcl", "eng")
+    assert isinstance(fil, ValueError)
@@ -0,0 +1,89 @@
+"""
+Tests for long-audio STT segmentation: energy VAD and windowed CTC stitching.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_stt_segmentation.py -q
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from stt_segmentation import detect_speech, pack_segments, plan_windows, windowed_ctc  # noqa: E402
+
+RATE = 16000
+FRAME = 320  # samples per CTC frame, as in Wav2Vec2
+
+
+def tone(seconds: float, amplitude: float = 0.3) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def noise(seconds: float, amplitude: float = 1e-3) -> np.ndarray:
+    return (np.random.default_rng(0).standard_normal(int(seconds * RATE)) * amplitude).astype(np.float32)
+
+
+def local_ctc(windows: list[np.ndarray]) -> list[np.ndarray]:
+    """Stand-in CTC model: each frame's class is the sign pattern of its own samples (no context)."""
+    out = []
+    for audio in windows:
+        frames = audio[:len(audio) // FRAME * FRAME].reshape(-1, FRAME)
+        classes = (frames.mean(axis=1) * 10).round().astype(int) % 5
+        out.append(np.eye(5, dtype=np.float32)[classes])
+    return out
+
+
+def collapse(ids: np.ndarray) -> list[int]:
+    return [int(x) for i, x in enumerate(ids) if i == 0 or x != ids[i - 1]]
+
+
+def test_vad_finds_speech_and_drops_silence():
+    audio = np.concatenate([noise(1.0), tone(1.0), noise(2.0), tone(0.5), noise(1.0)])
+    segments = detect_speech(audio, RATE)
+
+    assert len(segments) == 2
+    (s1, e1), (s2, e2) = segments
+    assert abs(s1 - 1.0 * RATE) <= 0.25 * RATE and abs(e1 - 2.0 * RATE) <= 0.25 * RATE
+    assert abs(s2 - 4.0 * RATE) <= 0.25 * RATE and abs(e2 - 4.5 * RATE) <= 0.25 * RATE
+
+    packed = pack_segments(audio, segments, gap=int(0.2 * RATE))
+    assert len(packed) < len(audio) / 2
+
+
+def test_vad_on_silence_and_continuous_speech():
+    assert detect_speech(noise(3.0), RATE) == []
+
+    speech = tone(4.0)
+    assert detect_speech(speech, RATE) == [(0, len(speech))]
+
+
+def test_windows_cover_audio_with_equal_sizes():
+    spans = plan_windows(10 * RATE, window=3 * RATE, overlap=RATE // 2)
+
+    assert spans[0][0] == 0 and spans[-1][1] == 10 * RATE
+    assert {end - start for start, end in spans} == {3 * RATE}
+    assert all(b[0] < a[1] for a, b in zip(spans, spans[1:]))
+
+
+@pytest.mark.parametrize("batch_size", [1, 3])
+def test_windowed_ctc_matches_single_pass(batch_size):
+    # Piecewise-constant levels, so each frame's class doesn't depend on where its window starts
+    levels = np.repeat([0.1, -0.2, 0.3, 0.0, -0.1, 0.2], RATE)
+    audio = levels.astype(np.float32)
+
+    whole = local_ctc([audio])[0].argmax(axis=-1)
+    stitched = windowed_ctc(audio, local_ctc, window=2 * RATE, overlap=RATE // 2, batch_size=batch_size)
+
+    assert abs(len(stitched) - len(whole)) <= 2
+    assert collapse(stitched) == collapse(whole)
+
+
+def test_windowed_ctc_rejects_overlap_over_half_window():
+    with pytest.raises(ValueError):
+        windowed_ctc(np.zeros(RATE * 5, dtype=np.float32), local_ctc, window=RATE, overlap=RATE)
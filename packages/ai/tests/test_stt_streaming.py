@@ -0,0 +1,122 @@
+"""
+Tests for streaming STT: online VAD endpointing and incremental CTC decoding.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_stt_streaming.py -q
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from stt_streaming import StreamingTranscriber  # noqa: E402
+
+RATE = 16000
+FRAME = 320  # samples per CTC frame, as in Wav2Vec2
+CHUNK = 1600  # 100 ms of audio per pushed frame
+
+
+def tone(seconds: float, levels: list[float]) -> np.ndarray:
+    """Speech stand-in: a loud carrier whose DC offset steps through `levels` (one "token" each)."""
+    n = int(seconds * RATE)
+    t = np.arange(n) / RATE
+    offset = np.repeat(levels, -(-n // len(levels)))[:n]
+    return (0.3 * np.sin(2 * np.pi * 220 * t) + offset).astype(np.float32)
+
+
+def silence(seconds: float) -> np.ndarray:
+    return (np.random.default_rng(0).standard_normal(int(seconds * RATE)) * 1e-3).astype(np.float32)
+
+
+class FakeModel:
+    """Context-free CTC model: each frame's class is its median level, so text depends only on the audio."""
+
+    def __init__(self):
+        self.window_lengths: list[int] = []
+
+    def run_logits(self, windows):
+        out = []
+        for audio in windows:
+            self.window_lengths.append(len(audio))
+            frames = audio[:len(audio) // FRAME * FRAME].reshape(-1, FRAME)
+            classes = np.clip((np.median(frames, axis=1) * 10).round().astype(int), 0, 4)
+            out.append(np.eye(5, dtype=np.float32)[classes])
+        return out
+
+    @staticmethod
+    def decode(ids):
+        return "".join("_abcd"[i] for k, i in enumerate(ids) if i and (k == 0 or i != ids[k - 1]))
+
+    @contextmanager
+    def in_use(self):
+        yield self.run_logits, self.decode
+
+
+def stream(transcriber: StreamingTranscriber, audio: np.ndarray) -> list[dict]:
+    events = []
+    for start in range(0, len(audio), CHUNK):
+        transcriber.push(audio[start:start + CHUNK])
+        events.extend(transcriber.step())
+    return events
+
+
+def test_partials_then_final_per_utterance():
+    model = FakeModel()
+    transcriber = StreamingTranscriber(model.in_use, rate=RATE)
+    audio = np.concatenate([
+        silence(1.0), tone(2.0, [0.1, 0.2, 0.3]), silence(1.5), tone(1.5, [0.4, 0.3]), silence(1.0),
+    ])
+
+    events = stream(transcriber, audio)
+    finals = [e for e in events if e["type"] == "final"]
+
+    assert [e["text"] for e in finals] == ["abc", "dc"]
+    assert [e["segment"] for e in finals] == [0, 1]
+    assert abs(finals[0]["start_s"] - 1.0) <= 0.3 and abs(finals[0]["end_s"] - 3.0) <= 0.3
+    assert abs(finals[1]["start_s"] - 4.5) <= 0.3
+
+    # Partials arrive before their final and grow towards it
+    first = [e for e in events if e["segment"] == 0]
+    assert first[0]["type"] == "partial" and first[-1]["type"] == "final"
+    assert "abc".startswith(first[0]["text"])
+
+
+def test_long_speech_keeps_passes_bounded():
+    model = FakeModel()
+    transcriber = StreamingTranscriber(model.in_use, rate=RATE, commit_s=2.0, context_s=1.0)
+    levels = [0.1, 0.2, 0.3, 0.4] * 5
+    speech = tone(20.0, levels)
+
+    events = stream(transcriber, speech) + transcriber.step(final=True)
+    final = [e for e in events if e["type"] == "final"]
+
+    assert [e["text"] for e in final] == [FakeModel.decode(model.run_logits([speech])[0].argmax(axis=-1))]
+    # Each pass covers at most left context + commit threshold + right context + one chunk
+    assert max(model.window_lengths[:-1]) <= int((1.0 + 2.0 + 1.0) * RATE) + CHUNK
+
+
+def test_silence_never_runs_the_model():
+    model = FakeModel()
+    transcriber = StreamingTranscriber(model.in_use, rate=RATE)
+
+    events = stream(transcriber, silence(5.0)) + transcriber.step(final=True)
+
+    assert events == []
+    assert model.window_lengths == []
+
+
+def test_flush_finalizes_open_segment():
+    model = FakeModel()
+    transcriber = StreamingTranscriber(model.in_use, rate=RATE)
+
+    stream(transcriber, np.concatenate([silence(0.5), tone(1.0, [0.2, 0.3])]))
+    assert transcriber.in_speech
+
+    events = transcriber.step(final=True)
+    assert [(e["type"], e["text"]) for e in events] == [("final", "bc")]
+    assert not transcriber.in_speech
@@ -0,0 +1,79 @@
+"""
+Golden tests for the TTS text normalizer.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_text_normalizer.py -q
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from text_normalizer import normalize_batch, normalize_text  # noqa: E402
+
+GOLDEN = {
+    "eng": [
+        ("I have 3 apples", "I have three apples"),
+        ("Call 911 now", "Call nine one one now"),
+        ("Hotline: (054) 472-3000", "Hotline: zero five four four seven two three zero zero zero"),
+        ("+63 917 123 4567", "plus six three nine one seven one two three four five six seven"),
+        ("On 2024-12-25 at 8:30 AM", "On December twenty fifth, twenty twenty four at eight thirty a m"),
+        ("Due 12/25/2024", "Due December twenty fifth, twenty twenty four"),
+        ("Price ₱1,250.50", "Price one thousand two hundred fifty pesos and fifty centavos"),
+        ("₱20", "twenty pesos"),
+        ("Take 500mg twice", "Take five hundred milligrams twice"),
+        ("5 ml", "five milliliters"),
+        ("3.14", "three point one four"),
+        ("1,000,000", "one million"),
+        ("21st", "twenty first"),
+        ("COVID19 cases", "COVID nineteen cases"),
+    ],
+    "fil": [
+        ("I have 3 apples", "I have tatlo apples"),
+        ("Hotline: (054) 472-3000", "Hotline: sero lima apat apat pito dalawa tatlo sero sero sero"),
+        ("Due 12/25/2024", "Due ika-dalawampu't lima ng Disyembre, dalawang libo at dalawampu't apat"),
+        ("8:30 AM", "alas walo at tatlumpu minuto ng umaga"),
+        ("Price ₱1,250.50", "Price isang libo dalawang daan at limampu piso at limampu sentimo"),
+        ("Take 500mg twice", "Take limang daan milligrams twice"),
+        ("3.14", "tatlo punto isa apat"),
+        ("1,000,000", "isang milyon"),
+        ("100", "isang daan"),
+    ],
+    "bcl": [
+        ("I have 3 apples", "I have tulo apples"),
+        ("Hotline: (054) 472-3000", "Hotline: sero lima apat apat pito duwa tulo sero sero sero"),
+        ("Due 12/25/2024", "Due ika-duwampulo may lima kan Disyembre, duwang ribo asin duwampulo may apat"),
+        ("8:30 AM", "alas walo asin tulompulo minutos sa aga"),
+        ("Bukas 8:00 AM sagkod 5:00 PM.", "Bukas alas walo sa aga sagkod alas lima sa hapon."),
+        ("Price ₱1,250.50", "Price sanribo duwang gatos asin limampulo pesos asin limampulo sentimos"),
+        ("Take 500mg twice", "Take limang gatos milligrams twice"),
+        ("3.14", "tulo punto saro apat"),
+        ("1,000,000", "sarong milyon"),
+        ("100", "sanggatos"),
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "lang,text,expected",
+    [(lang, text, expected) for lang, cases in GOLDEN.items() for text, expected in cases],
+)
+def test_golden(lang, text, expected):
+    assert normalize_text(text, lang) == expected
+
+
+def test_text_without_numbers_is_unchanged():
+    assert normalize_text("Saen an pinakaharaning ospital?", "bcl") == "Saen an pinakaharaning ospital?"
+
+
+def test_batch_matches_single():
+    texts = [text for text, _ in GOLDEN["bcl"]]
+    assert normalize_batch(texts, "bcl") == [normalize_text(text, "bcl") for text in texts]
+
+
+def test_unknown_language_falls_back_to_english():
+    assert normalize_text("5", "xyz") == "five"
@@ -0,0 +1,97 @@
+"""
+Tests for NLLB input preparation: sentence splitting, length-sorted batches,
+and stateless source-language encoding; and Google request packing.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_translation_batching.py -q
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from translation_batching import (  # noqa: E402
+    encode_batch,
+    join_segments,
+    length_sorted_batches,
+    max_new_tokens_for,
+    request_chunks,
+    split_for_translation,
+    token_ids,
+)
+
+LANGUAGES = ["eng_Latn", "tgl_Latn", "bcl_Latn"]
+
+
+def tiny_nllb_tokenizer():
+    """NllbTokenizerFast over a word-level vocab (no download needed)."""
+    from tokenizers import Tokenizer, models, pre_tokenizers
+    from transformers import NllbTokenizerFast
+
+    words = "<s> <pad> </s> <unk> where is the clinic ? i have a fever . thank you".split()
+    vocab = {word: i for i, word in enumerate(words)}
+    for code in LANGUAGES + ["<mask>"]:
+        vocab[code] = len(vocab)
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    backend.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    return NllbTokenizerFast(
+        tokenizer_object=backend, bos_token="<s>", eos_token="</s>", pad_token="<pad>", unk_token="<unk>",
+        mask_token="<mask>", additional_special_tokens=LANGUAGES, src_lang="eng_Latn",
+    )
+
+
+def test_split_keeps_paragraphs_and_abbreviations():
+    text = "Go to Brgy. Concepcion Pequeña. Ask for Dr. Santos!\n\nOpen daily? Yes."
+    segments, separators = split_for_translation(text)
+
+    assert segments == ["Go to Brgy. Concepcion Pequeña.", "Ask for Dr. Santos!", "Open daily?", "Yes."]
+    assert separators == [" ", "\n\n", " "]
+    assert join_segments(segments, separators) == text
+
+
+def test_long_sentences_are_split_not_truncated():
+    sentence = ", ".join(f"clause number {i} with a few more words" for i in range(30)) + "."
+    segments, separators = split_for_translation(sentence, max_chars=120)
+
+    assert all(len(segment) <= 120 for segment in segments)
+    assert join_segments(segments, separators).split() == sentence.split()
+
+
+def test_batches_are_length_sorted_and_bounded():
+    lengths = [5, 40, 12, 38, 6, 41, 7]
+    batches = length_sorted_batches(lengths, max_batch=3, max_tokens=100)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    flat = [lengths[i] for batch in batches for i in batch]
+    assert flat == sorted(lengths, reverse=True)
+    for batch in batches:
+        assert len(batch) <= 3
+        assert len(batch) == 1 or lengths[batch[0]] * len(batch) <= 100
+
+
+def test_generation_budget_scales_with_input():
+    assert max_new_tokens_for(10) < max_new_tokens_for(100) <= 512
+    assert max_new_tokens_for(1000) == 512
+
+
+def test_encode_matches_tokenizer_without_setting_src_lang():
+    tokenizer = tiny_nllb_tokenizer()
+    texts = ["where is the clinic ?", "thank you"]
+
+    encoded = encode_batch(tokenizer, token_ids(tokenizer, texts), "bcl_Latn")
+    assert tokenizer.src_lang == "eng_Latn"
+
+    tokenizer.src_lang = "bcl_Latn"
+    expected = tokenizer(texts, padding=True, return_tensors="pt")
+    assert encoded["input_ids"].tolist() == expected["input_ids"].tolist()
+    assert encoded["attention_mask"].tolist() == expected["attention_mask"].tolist()
+
+
+def test_request_chunks_keep_order_within_limits():
+    texts = ["a" * 40, "b" * 30, "c" * 50, "d" * 10, "e" * 200, "f", "g", "h"]
+    chunks = request_chunks(texts, max_items=3, max_chars=100)
+
+    assert chunks == [[0, 1], [2, 3], [4], [5, 6, 7]]
+    assert [i for chunk in chunks for i in chunk] == list(range(len(texts)))
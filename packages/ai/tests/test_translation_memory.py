@@ -0,0 +1,85 @@
+"""
+Tests for the persistent translation memory.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_translation_memory.py -q
+"""
+
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from translation_memory import SEEDED_ENGINE, TranslationMemory, collect_translation_pairs  # noqa: E402
+
+NLLB = "facebook/nllb-200-distilled-600M"
+
+
+def test_hit_survives_restart_and_ignores_whitespace(tmp_path):
+    path = str(tmp_path / "tm.sqlite3")
+    memory = TranslationMemory(path, memory_entries=16, ttl_s=3600)
+    memory.put("Where is the  hospital?", "eng", "bcl", NLLB, "Sain an ospital?")
+    memory.close()
+
+    reopened = TranslationMemory(path, memory_entries=16, ttl_s=3600)
+    assert reopened.get(" Where is the hospital? ", "eng", "bcl", NLLB) == "Sain an ospital?"
+    assert reopened.stats["db_hits"] == 1
+
+    # Memory tier on the second lookup
+    assert reopened.get("Where is the hospital?", "eng", "bcl", NLLB) == "Sain an ospital?"
+    assert reopened.stats["memory_hits"] == 1
+
+
+def test_key_includes_languages_and_engine(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite3"), memory_entries=16, ttl_s=3600)
+    memory.put("Good morning", "eng", "bcl", NLLB, "Maray na aga")
+
+    assert memory.get("Good morning", "eng", "fil", NLLB) is None
+    assert memory.get("Good morning", "eng", "bcl", "google") is None
+
+
+def test_entries_expire(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite3"), memory_entries=16, ttl_s=0.05)
+    memory.put("Thank you", "eng", "bcl", NLLB, "Dios mabalos")
+    memory.put("Thank you", "eng", "fil", NLLB, "Salamat", ttl_s=0)  # never expires
+    time.sleep(0.1)
+
+    assert memory.get("Thank you", "eng", "bcl", NLLB) is None
+    assert memory.get("Thank you", "eng", "fil", NLLB) == "Salamat"
+    assert memory.purge_expired() == 1
+
+
+def test_seed_from_knowledge_base(tmp_path):
+    phrases = tmp_path / "bikol-phrases"
+    phrases.mkdir()
+    (phrases / "greetings.json").write_text(json.dumps({
+        "phrases": [{"bikol": "Dios mabalos", "filipino": "Salamat", "english": "Thank you"}],
+    }))
+
+    pairs = collect_translation_pairs(str(tmp_path))
+    assert len(pairs) == 6
+    assert ("Thank you", "eng", "bcl", "Dios mabalos") in pairs
+
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite3"), memory_entries=16, ttl_s=3600)
+    assert memory.seed(pairs) == 6
+    assert memory.get("Salamat", "fil", "eng", SEEDED_ENGINE) == "Thank you"
+
+
+def test_batched_lookup_reads_the_store_once_for_memory_misses(tmp_path):
+    path = str(tmp_path / "tm.sqlite3")
+    memory = TranslationMemory(path, memory_entries=16, ttl_s=3600)
+    memory.put_many([("Good morning", "Maray na aga"), ("Thank you", "Dios mabalos")], "eng", "bcl", NLLB)
+    memory.close()
+
+    reopened = TranslationMemory(path, memory_entries=16, ttl_s=3600)
+    texts = ["Good morning", "Thank you", "Good night"]
+    # Memory tier only: nothing cached yet, and the misses are left for the store lookup
+    assert reopened.get_many(texts, "eng", "bcl", NLLB, memory_only=True) == [None, None, None]
+    assert reopened.stats["misses"] == 0
+
+    assert reopened.get_many(texts, "eng", "bcl", NLLB) == ["Maray na aga", "Dios mabalos", None]
+    assert (reopened.stats["db_hits"], reopened.stats["misses"]) == (2, 1)
+    assert reopened.get_many(texts[:2], "eng", "bcl", NLLB, memory_only=True) == ["Maray na aga", "Dios mabalos"]
@@ -0,0 +1,89 @@
+"""
+Tests for the phrase tier and per-tier translation stats.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_translation_tiers.py -q
+"""
+
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+SHIPPED_MAPPINGS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..",
+    "data", "knowledge-base", "bikol-phrases", "translation_mappings.json",
+)
+
+from translation_tiers import PhraseTable, TierStats  # noqa: E402
+
+PAIRS = [
+    ("payo", "bcl", "eng", "head"),
+    ("kulog", "bcl", "eng", "pain"),
+    ("kulog nin payo", "bcl", "eng", "headache"),
+    ("ngipon", "bcl", "eng", "teeth/tooth"),
+    ("teeth/tooth", "eng", "bcl", "ngipon"),
+    ("you (singular)", "eng", "bcl", "ika"),
+]
+
+
+def test_longest_phrase_wins_and_case_is_kept():
+    table = PhraseTable(PAIRS)
+
+    assert table.translate("kulog nin payo", "bcl", "eng") == "headache"
+    assert table.translate("Kulog nin payo!", "bcl", "eng") == "Headache!"
+    assert table.translate("Ngipon", "bcl", "eng") == "Teeth"
+
+
+def test_entry_alternatives_are_keys():
+    table = PhraseTable(PAIRS)
+
+    assert table.translate("tooth", "eng", "bcl") == "ngipon"
+    assert table.translate("teeth", "eng", "bcl") == "ngipon"
+    assert table.translate("you", "eng", "bcl") == "ika"
+
+
+def test_partial_or_fragmented_coverage_goes_to_the_model():
+    table = PhraseTable(PAIRS, min_coverage=1.0, max_pieces=2)
+
+    assert table.translate("kulog nin payo asin ngipon", "bcl", "eng") is None  # "asin" unknown
+    assert table.translate("payo kulog ngipon", "bcl", "eng") is None  # three pieces
+    assert table.translate("payo", "bcl", "fil") is None  # no table for the pair
+
+    lenient = PhraseTable(PAIRS, min_coverage=0.75, max_pieces=3)
+    assert lenient.translate("kulog nin payo asin ngipon", "bcl", "eng") == "headache asin teeth"
+
+
+def test_from_files_reads_mappings_and_corpus(tmp_path):
+    mappings = tmp_path / "translation_mappings.json"
+    mappings.write_text(json.dumps({"bikol_to_english": {"bulong": "medicine"}}))
+    corpus = tmp_path / "bikol_corpus.json"
+    corpus.write_text(json.dumps({"health_phrases": [{"bikol": "kalintura", "filipino": "lagnat", "english": "fever"}]}))
+
+    table = PhraseTable.from_files(str(mappings), str(corpus))
+    assert table.translate("bulong", "bcl", "eng") == "medicine"
+    assert table.translate("lagnat", "fil", "bcl") == "kalintura"
+
+
+def test_shipped_tables_only_answer_whole_entries():
+    table = PhraseTable.from_files(SHIPPED_MAPPINGS)
+
+    assert table.translate("Rest well", "eng", "bcl") == "Magpahuway ka nin maray"
+    assert table.translate("Good", "eng", "bcl") == "Maray"
+    # "good" + "morning" glossed entry by entry would drop the linker ("Maray aga")
+    assert table.translate("Good morning", "eng", "bcl") is None
+
+
+def test_tier_stats():
+    stats = TierStats()
+    stats.record_request(4)
+    stats.record("memory", 2, 0.002)
+    stats.record("phrase", 1, 0.001)
+    stats.record("nllb", 1, 0.5)
+
+    snapshot = stats.snapshot()
+    assert snapshot["tiers"]["memory"] == {"hits": 2, "hit_rate": 0.5, "mean_ms": 1.0}
+    assert snapshot["tiers"]["google"]["mean_ms"] is None
+    assert snapshot["estimated_model_ms_saved"] == 1500.0
@@ -0,0 +1,123 @@
+"""
+Tests for the TTS micro-batching scheduler, with a fake run_batch: window vs
+early flush, batch and token budgets, abandoned requests, per-caller results
+and batch failures.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_tts_batcher.py -q
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from tts_batcher import TTSBatcher  # noqa: E402
+
+
+class FakeSynthesizer:
+    """run_batch stand-in: records every batch and returns "<language>:<text>" per text."""
+
+    def __init__(self, error: Exception = None):
+        self.batches: list[list[str]] = []
+        self.error = error
+
+    def __call__(self, language: str, texts: list[str]) -> list[str]:
+        self.batches.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return [f"{language}:{text}" for text in texts]
+
+
+def submit_all(batcher: TTSBatcher, texts: list[str], language: str = "bcl") -> list:
+    async def main():
+        return await asyncio.gather(*(batcher.submit(text, language) for text in texts), return_exceptions=True)
+    return asyncio.run(main())
+
+
+def test_lone_request_waits_out_the_window():
+    synthesizer = FakeSynthesizer()
+    batcher = TTSBatcher(synthesizer, window_ms=100, max_batch_size=4)
+
+    started = time.monotonic()
+    assert submit_all(batcher, ["Marhay na aga"]) == ["bcl:Marhay na aga"]
+    assert time.monotonic() - started >= 0.09
+
+
+def test_full_batch_flushes_before_the_window():
+    synthesizer = FakeSynthesizer()
+    batcher = TTSBatcher(synthesizer, window_ms=2000, max_batch_size=2)
+
+    started = time.monotonic()
+    assert submit_all(batcher, ["una", "ikaduwa"]) == ["bcl:una", "bcl:ikaduwa"]
+    assert time.monotonic() - started < 1.0
+    assert synthesizer.batches == [["una", "ikaduwa"]]
+
+
+def test_each_caller_gets_its_own_result_in_order():
+    synthesizer = FakeSynthesizer()
+    batcher = TTSBatcher(synthesizer, window_ms=20, max_batch_size=3)
+
+    texts = [f"text {i}" for i in range(7)]
+    assert submit_all(batcher, texts) == [f"bcl:{text}" for text in texts]
+    assert [len(batch) for batch in synthesizer.batches] == [3, 3, 1]
+    assert batcher.stats["max_batch_size_seen"] == 3
+
+
+def test_token_budget_splits_batches_and_runs_an_oversized_text_alone():
+    synthesizer = FakeSynthesizer()
+    batcher = TTSBatcher(synthesizer, window_ms=20, max_batch_size=8, max_batch_tokens=10)
+
+    oversized = "x" * 50
+    submit_all(batcher, [oversized, "aaaa", "bbbb", "cccc"])
+    assert synthesizer.batches == [[oversized], ["aaaa", "bbbb"], ["cccc"]]
+
+
+def test_abandoned_requests_are_skipped():
+    synthesizer = FakeSynthesizer()
+    batcher = TTSBatcher(synthesizer, window_ms=50, max_batch_size=8)
+
+    async def main():
+        kept = asyncio.ensure_future(batcher.submit("kept", "bcl"))
+        gone = asyncio.ensure_future(batcher.submit("gone", "bcl"))
+        await asyncio.sleep(0.01)
+        gone.cancel()  # e.g. the client disconnected while queued
+        return await kept
+
+    assert asyncio.run(main()) == "bcl:kept"
+    assert synthesizer.batches == [["kept"]]
+
+
+def test_failing_batch_fails_every_caller_in_it():
+    synthesizer = FakeSynthesizer(error=RuntimeError("out of memory"))
+    batcher = TTSBatcher(synthesizer, window_ms=20, max_batch_size=4)
+
+    results = submit_all(batcher, ["una", "ikaduwa", "ikatulo"])
+    assert len(synthesizer.batches) == 1
+    assert all(isinstance(result, RuntimeError) and str(result) == "out of memory" for result in results)
+
+
+def test_languages_are_batched_separately():
+    synthesizer = FakeSynthesizer()
+    batcher = TTSBatcher(synthesizer, window_ms=20, max_batch_size=4)
+
+    async def main():
+        return await asyncio.gather(batcher.submit("Salamat", "fil"), batcher.submit("Dios mabalos", "bcl"))
+
+    assert asyncio.run(main()) == ["fil:Salamat", "bcl:Dios mabalos"]
+    assert sorted(synthesizer.batches) == [["Dios mabalos"], ["Salamat"]]
+
+
+@pytest.mark.parametrize("window_ms", [0, 5])
+def test_queue_drains_completely(window_ms):
+    synthesizer = FakeSynthesizer()
+    batcher = TTSBatcher(synthesizer, window_ms=window_ms, max_batch_size=2)
+
+    texts = [f"text {i}" for i in range(5)]
+    assert submit_all(batcher, texts) == [f"bcl:{text}" for text in texts]
+    assert batcher.snapshot()["queued"] == {}
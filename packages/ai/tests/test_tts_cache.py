@@ -0,0 +1,88 @@
+"""
+Tests for the two-tier TTS audio cache: byte-bounded memory LRU, disk-hit
+promotion, and the disk budget with index-based eviction.
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_tts_cache.py -q
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from tts_cache import AUDIO_FILE_SUFFIX, TTSAudioCache  # noqa: E402
+
+
+def cached_keys(directory) -> set[str]:
+    return {name[:-len(AUDIO_FILE_SUFFIX)] for name in os.listdir(directory) if name.endswith(AUDIO_FILE_SUFFIX)}
+
+
+def test_key_ignores_whitespace_but_not_variant():
+    key = TTSAudioCache.make_key("Marhay na  aga", "bcl", "facebook/mms-tts-bcl", "main", "wav@native")
+    assert key == TTSAudioCache.make_key(" Marhay na aga\n", "bcl", "facebook/mms-tts-bcl", "main", "wav@native")
+    assert key != TTSAudioCache.make_key("Marhay na aga", "bcl", "facebook/mms-tts-bcl", "main", "mp3@native")
+    assert key != TTSAudioCache.make_key("Marhay na aga", "fil", "facebook/mms-tts-bcl", "main", "wav@native")
+
+
+def test_memory_tier_is_bounded_by_bytes_in_lru_order():
+    cache = TTSAudioCache(memory_max_bytes=10, disk_dir=None, disk_max_bytes=0)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # a is now the most recently used
+    cache.put("c", b"cccc")
+    cache.put("too-big", b"x" * 11)  # larger than the tier: not kept
+
+    assert cache.get("b") is None and cache.get("too-big") is None
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    snapshot = cache.snapshot()
+    assert (snapshot["memory_bytes"], snapshot["memory_evictions"]) == (8, 1)
+
+
+def test_disk_hit_is_promoted_into_memory(tmp_path):
+    TTSAudioCache(memory_max_bytes=1024, disk_dir=str(tmp_path), disk_max_bytes=1024).put("a", b"RIFF-a")
+
+    restarted = TTSAudioCache(memory_max_bytes=1024, disk_dir=str(tmp_path), disk_max_bytes=1024)
+    assert restarted.snapshot()["disk_bytes"] == 6
+    # The event-loop check doesn't touch the disk and doesn't count the miss yet
+    assert restarted.get("a", memory_only=True) is None
+    assert restarted.stats["misses"] == 0
+
+    assert restarted.get("a") == b"RIFF-a"
+    assert restarted.get("a", memory_only=True) == b"RIFF-a"
+    assert (restarted.stats["disk_hits"], restarted.stats["memory_hits"]) == (1, 1)
+    assert restarted.get("missing") is None and restarted.stats["misses"] == 1
+
+
+def test_disk_budget_evicts_least_recently_used_down_to_low_water(tmp_path):
+    cache = TTSAudioCache(memory_max_bytes=0, disk_dir=str(tmp_path), disk_max_bytes=100)
+    for key in "abcd":
+        cache.put(key, key.encode() * 25)
+    assert cache.get("a") == b"a" * 25  # a is now the most recently used on disk
+
+    cache.put("e", b"e" * 25)  # 125 bytes > 100: evict b and c to reach 90
+    assert cached_keys(tmp_path) == {"a", "d", "e"}
+    snapshot = cache.snapshot()
+    assert (snapshot["disk_bytes"], snapshot["disk_entries"], snapshot["disk_evictions"]) == (75, 3, 2)
+
+
+def test_index_at_startup_follows_last_access_time(tmp_path):
+    cache = TTSAudioCache(memory_max_bytes=0, disk_dir=str(tmp_path), disk_max_bytes=100)
+    for i, key in enumerate("abcd"):
+        cache.put(key, key.encode() * 25)
+        os.utime(tmp_path / f"{key}{AUDIO_FILE_SUFFIX}", (1000 + i, 1000 + i))
+    os.utime(tmp_path / f"a{AUDIO_FILE_SUFFIX}", (2000, 2000))
+
+    restarted = TTSAudioCache(memory_max_bytes=0, disk_dir=str(tmp_path), disk_max_bytes=100)
+    restarted.put("e", b"e" * 25)
+    assert cached_keys(tmp_path) == {"a", "d", "e"}
+
+
+def test_file_removed_by_another_worker_is_a_miss(tmp_path):
+    cache = TTSAudioCache(memory_max_bytes=0, disk_dir=str(tmp_path), disk_max_bytes=100)
+    cache.put("a", b"RIFF-a")
+    os.remove(tmp_path / f"a{AUDIO_FILE_SUFFIX}")
+
+    assert cache.get("a") is None
+    assert cache.snapshot()["disk_bytes"] == 0
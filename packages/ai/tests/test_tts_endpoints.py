@@ -0,0 +1,171 @@
+"""
+Tests for the TTS endpoints with the model functions stubbed (no checkpoint
+download): request validation before synthesis, cache keys, and the /speak
+pipeline (stage order, cache shared with /tts, load shedding).
+
+Run with:
+    cd packages/ai
+    python -m pytest tests/test_tts_endpoints.py -q
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# Memory-only caches and no auth, before the service module reads its config
+os.environ.update({"AI_SERVICE_API_KEY": "", "TTS_CACHE_DISK_MB": "0", "TRANSLATION_MEMORY_PATH": "", "TTS_AUDIO_PACK": ""})
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import ai_service  # noqa: E402
+from inference_pool import InferencePool  # noqa: E402
+from tts_cache import TTSAudioCache  # noqa: E402
+
+RATE = ai_service.TTS_SAMPLING_RATE
+
+
+@pytest.fixture
+def synthesized(monkeypatch) -> list[str]:
+    """Stub the TTS model; returns the texts synthesized, in order."""
+    texts = []
+
+    def synthesize_waveform(text: str, language: str):
+        texts.append(text)
+        return np.zeros(RATE // 10, dtype=np.float32), RATE
+
+    runner = SimpleNamespace(config=SimpleNamespace(sampling_rate=RATE))
+    monkeypatch.setattr(ai_service, "synthesize_waveform", synthesize_waveform)
+    monkeypatch.setattr(ai_service, "load_tts_model", lambda language: (runner, None))
+    monkeypatch.setattr(ai_service, "TTS_BATCH_WINDOW_MS", 0)
+    monkeypatch.setattr(ai_service, "tts_audio_cache", TTSAudioCache(memory_max_bytes=1 << 20, disk_dir=None, disk_max_bytes=0))
+    monkeypatch.setattr(ai_service, "tts_audio_pack", None)
+    return texts
+
+
+@pytest.fixture
+def client() -> TestClient:
+    # Not entered as a context manager: no lifespan, so no background model warm-up
+    return TestClient(ai_service.app)
+
+
+def test_unsupported_sample_rate_is_rejected_before_synthesis(synthesized, client):
+    for sample_rate in (12345, -1):
+        response = client.post("/tts", json={"text": "Marhay na aga", "language": "bcl", "sample_rate": sample_rate})
+        assert response.status_code == 400
+        assert "ETag" not in response.headers
+    assert synthesized == []
+
+
+def test_rates_at_or_above_native_share_one_entry(synthesized, client):
+    etags = set()
+    for sample_rate in (None, RATE, 22050, 48000):
+        response = client.post("/tts", json={"text": "Marhay na aga", "language": "bcl", "sample_rate": sample_rate})
+        assert response.status_code == 200
+        etags.add(response.headers["ETag"])
+    assert len(etags) == 1 and len(synthesized) == 1
+
+    response = client.post("/tts", json={"text": "Marhay na aga", "language": "bcl", "sample_rate": 8000})
+    assert response.status_code == 200 and response.headers["ETag"] not in etags
+    assert len(synthesized) == 2
+
+
+def test_stream_rejects_formats_and_rates_it_cannot_send(synthesized, client):
+    for fields in ({"format": "mp3"}, {"format": "ogg"}, {"sample_rate": 8000}, {"sample_rate": 12345}):
+        response = client.post("/tts/stream", json={"text": "Marhay na aga", "language": "bcl", **fields})
+        assert response.status_code == 400, fields
+    assert synthesized == []
+
+    response = client.post("/tts/stream", json={"text": "Marhay na aga.", "language": "bcl", "format": "wav", "sample_rate": 48000})
+    assert response.status_code == 200 and response.content.startswith(b"RIFF")
+    assert synthesized == ["Marhay na aga."]
+
+
+def test_key_changes_with_backend_and_precision(monkeypatch):
+    keys = set()
+    for engine in ("eager-fp32", "eager-int8", "onnx"):
+        monkeypatch.setattr(ai_service, "TTS_ENGINE", engine)
+        keys.add(ai_service.tts_cache_key("Marhay na aga", "bcl", "wav"))
+    assert len(keys) == 3
+
+
+@pytest.fixture
+def speak_events(synthesized, monkeypatch) -> list[tuple[str, str]]:
+    """Stub translation and record (stage, text) for translate, normalize and synthesize."""
+    events = []
+
+    async def translate_texts_tiered(texts, source_lang, target_lang):
+        events.append(("translate", texts[0]))
+        return [f"(bcl) {text}" for text in texts], ["memory"] * len(texts)
+
+    normalize_text = ai_service.normalize_text
+
+    def recording_normalize(text, language):
+        events.append(("normalize", text))
+        return normalize_text(text, language)
+
+    synthesize_waveform = ai_service.synthesize_waveform
+
+    def recording_synthesize(text, language):
+        events.append(("synthesize", text))
+        return synthesize_waveform(text, language)
+
+    monkeypatch.setattr(ai_service, "translate_texts_tiered", translate_texts_tiered)
+    monkeypatch.setattr(ai_service, "normalize_text", recording_normalize)
+    monkeypatch.setattr(ai_service, "synthesize_waveform", recording_synthesize)
+    return events
+
+
+def test_speak_translates_normalizes_then_synthesizes(speak_events, client):
+    response = client.post("/speak", json={"text": "Good morning. 2 tablets.", "source_lang": "eng", "language": "bcl"})
+
+    assert response.status_code == 200 and response.content.startswith(b"RIFF")
+    assert [stage for stage, _ in speak_events] == ["translate", "normalize", "synthesize", "synthesize"]
+    assert speak_events[1] == ("normalize", "(bcl) Good morning. 2 tablets.")
+    assert [name.split(";")[0] for name in response.headers["Server-Timing"].split(", ")] == ["translate", "normalize"]
+    assert response.headers["X-Translation-Tier"] == "memory"
+
+
+def test_speak_audio_is_cached_under_the_tts_key(speak_events, client):
+    first = client.post("/speak", json={"text": "Good morning", "source_lang": "eng", "language": "bcl"})
+    assert first.status_code == 200
+
+    again = client.post("/speak", json={"text": "Good morning", "source_lang": "eng", "language": "bcl"})
+    tts = client.post("/tts", json={"text": "(bcl) Good morning", "language": "bcl", "format": "wav"})
+
+    # Same samples; the streamed copy just has the open-ended streaming WAV header
+    assert again.content == tts.content
+    assert first.content[44:] == tts.content[44:]
+    assert [text for stage, text in speak_events if stage == "synthesize"] == ["(bcl) Good morning"]
+
+
+def test_speak_is_shed_with_retry_after_when_the_tts_pool_is_full(speak_events, client, monkeypatch):
+    pool = InferencePool("tts-test", max_workers=1, max_queue=0, min_retry_after=3)
+    monkeypatch.setattr(ai_service, "tts_pool", pool)
+    try:
+        with pool.admission():
+            response = client.post("/speak", json={"text": "Good morning", "source_lang": "eng", "language": "bcl"})
+    finally:
+        pool.shutdown()
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 3
+    assert not [stage for stage, _ in speak_events if stage == "synthesize"]
+
+
+def test_tts_is_shed_with_503_and_retry_after(synthesized, client, monkeypatch):
+    pool = InferencePool("tts-test", max_workers=1, max_queue=1, min_retry_after=4)
+    monkeypatch.setattr(ai_service, "tts_pool", pool)
+    try:
+        with pool.admission(), pool.admission():
+            response = client.post("/tts", json={"text": "Marhay na aga", "language": "bcl"})
+    finally:
+        pool.shutdown()
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 4
+    assert synthesized == []